@@ -0,0 +1,52 @@
+from todoms.resources import Task, TaskList
+
+SUBTASKS = 5
+
+
+def _benchmark_traffic(benchmark, client, function):
+    """Benchmark the function, recording also requests and bytes sent per call"""
+    provider = client._provider
+    provider.requests = provider.bytes = 0
+    calls = []
+
+    def counted():
+        calls.append(None)
+        function()
+
+    benchmark.pedantic(counted, rounds=50, iterations=1)
+
+    benchmark.extra_info["requests_per_round"] = provider.requests / len(calls)
+    benchmark.extra_info["bytes_per_round"] = provider.bytes / len(calls)
+
+
+def test_create_task_with_subtasks(benchmark, emulator_client):
+    task_list = TaskList(name="Benchmark", client=emulator_client)
+    task_list.create()
+
+    def create():
+        task = Task(title="Task", client=emulator_client)
+        for number in range(SUBTASKS):
+            task.add_subtask(f"Step {number}")
+        task_list.save_task(task)
+
+    _benchmark_traffic(benchmark, emulator_client, create)
+
+    assert benchmark.extra_info["requests_per_round"] == 1 + SUBTASKS
+
+
+def test_update_task_with_subtasks(benchmark, emulator_client):
+    task_list = TaskList(name="Benchmark", client=emulator_client)
+    task_list.create()
+    task = Task(title="Task", client=emulator_client)
+    for number in range(SUBTASKS):
+        task.add_subtask(f"Step {number}")
+    task_list.save_task(task)
+
+    def update():
+        task.title = "Changed"
+        task.subtasks[0].check()
+        task.update()
+
+    _benchmark_traffic(benchmark, emulator_client, update)
+
+    assert benchmark.extra_info["requests_per_round"] == 1 + SUBTASKS
@@ -0,0 +1,63 @@
+import pytest
+
+from todoms.client import ToDoClient
+from todoms.resources import Task
+
+from .conftest import API_URL, EmulatorProvider, make_response
+
+PAGE_SIZE = 100
+
+
+class PagesProvider(EmulatorProvider):
+    """Serves prepared pages of tasks, linked with nextLink. Other requests are
+    handled by the emulator."""
+
+    def __init__(self, emulator, task_payload, pages):
+        super().__init__(emulator)
+        self._pages = []
+        for number in range(pages):
+            tasks = [
+                {**task_payload, "id": f"task-{number}-{index}"}
+                for index in range(PAGE_SIZE)
+            ]
+            page = {"value": tasks}
+            if number < pages - 1:
+                page["@odata.nextLink"] = f"{API_URL}/page/{number + 1}"
+            self._pages.append(make_response(200, page))
+
+    def get(self, url, params=None):
+        if url.startswith(f"{API_URL}/page/"):
+            return self._pages[int(url.rsplit("/", 1)[1])]
+        return self._pages[0]
+
+
+@pytest.mark.parametrize("pages", [1, 10])
+def test_list_pages(benchmark, emulator, task_payload, pages):
+    provider = PagesProvider(emulator, task_payload, pages)
+    client = ToDoClient(provider, api_url=API_URL)
+
+    def list_all():
+        return list(client.list(Task, endpoint="tasks", delta=False))
+
+    tasks = benchmark(list_all)
+
+    assert len(tasks) == pages * PAGE_SIZE
+    benchmark.extra_info["tasks"] = len(tasks)
+
+
+@pytest.mark.parametrize("pages", [1, 10])
+def test_list_raw_pages(benchmark, emulator, task_payload, pages):
+    provider = PagesProvider(emulator, task_payload, pages)
+    client = ToDoClient(provider, api_url=API_URL)
+
+    def list_all():
+        return [
+            item
+            for page in client.list(Task, endpoint="tasks", delta=False, raw=True)
+            for item in page.items
+        ]
+
+    tasks = benchmark(list_all)
+
+    assert len(tasks) == pages * PAGE_SIZE
+    benchmark.extra_info["tasks"] = len(tasks)
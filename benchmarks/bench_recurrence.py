@@ -0,0 +1,31 @@
+from datetime import date, datetime
+
+from todoms.attributes import Weekday
+from todoms.recurrence import Recurrence
+from todoms.recurrence.patterns import Daily, MonthlyRelative, Weekly
+from todoms.recurrence.ranges import NoEnd
+
+PATTERNS = [
+    lambda: Daily(interval=1),
+    lambda: Weekly(interval=1, days_of_week=[Weekday.MONDAY, Weekday.THURSDAY]),
+    lambda: MonthlyRelative(interval=1, days_of_week=[Weekday.FRIDAY]),
+]
+
+
+def test_expand_recurrences_over_year(benchmark):
+    recurrences = [
+        Recurrence(
+            PATTERNS[index % len(PATTERNS)](),
+            NoEnd(start_date=date(2023, 1, 1 + index % 28)),
+        )
+        for index in range(1000)
+    ]
+
+    def expand():
+        return sum(
+            1
+            for recurrence in recurrences
+            for _ in recurrence.occurrences(datetime(2024, 1, 1), datetime(2025, 1, 1))
+        )
+
+    assert benchmark(expand) > 1000
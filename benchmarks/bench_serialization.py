@@ -0,0 +1,22 @@
+from todoms.resources import Task
+
+
+def test_task_from_dict(benchmark, client, task_payload):
+    task = benchmark(Task.from_dict, task_payload, client)
+
+    assert len(task.subtasks) == 10
+
+
+def test_task_to_dict(benchmark, client, task_payload):
+    task = Task.from_dict(task_payload, client)
+
+    data = benchmark(task.to_dict)
+
+    assert data["recurrence"]["pattern"]["type"] == "relativeMonthly"
+
+
+def test_task_round_trip(benchmark, client, task_payload):
+    def round_trip():
+        return Task.from_dict(Task.from_dict(task_payload, client).to_dict(), client)
+
+    benchmark(round_trip)
@@ -0,0 +1,123 @@
+import json
+from copy import deepcopy
+
+import pytest
+from furl import furl
+from requests import Response
+
+from tests.utils.emulator import Emulator
+from todoms.client import ToDoClient
+from todoms.provider import AbstractProvider
+
+API_URL = "https://api.url"
+
+HTML_BODY = (
+    "<html><head><meta http-equiv='Content-Type' content='text/html'></head><body>"
+    + "<p>Paragraph with <b>bold</b> and <a href='https://example.com'>link</a></p>"
+    * 20
+    + "</body></html>"
+)
+
+TASK_PAYLOAD = {
+    "@odata.etag": 'W/"SRqIGuHKgEaeKjdSMmaZRwADcFhrVA=="',
+    "id": "AAMkADAwATM0MDAAMS1iNTcwLWI2NTEtMDACLTAwCgBGAAADa_task",
+    "importance": "high",
+    "isReminderOn": True,
+    "reminderDateTime": {"dateTime": "2022-05-03T09:00:00.0000000", "timeZone": "UTC"},
+    "status": "inProgress",
+    "title": "Prepare the quarterly report",
+    "createdDateTime": "2022-01-01T18:00:00.1234567Z",
+    "lastModifiedDateTime": "2022-04-01T18:00:00.1234567Z",
+    "dueDateTime": {"dateTime": "2022-05-02T00:00:00.0000000", "timeZone": "UTC"},
+    "startDateTime": {"dateTime": "2022-04-02T00:00:00.0000000", "timeZone": "UTC"},
+    "body": {"content": HTML_BODY, "contentType": "html"},
+    "recurrence": {
+        "pattern": {
+            "type": "relativeMonthly",
+            "interval": 1,
+            "daysOfWeek": ["monday", "wednesday"],
+            "firstDayOfWeek": "sunday",
+            "index": "first",
+        },
+        "range": {
+            "type": "endDate",
+            "startDate": "2022-05-02",
+            "endDate": "2023-05-02",
+        },
+    },
+    "categories": ["Work", "Reports", "Quarterly"],
+    "hasAttachments": False,
+    "checklistItems": [
+        {
+            "id": f"sub-{number}",
+            "displayName": f"Step {number}",
+            "createdDateTime": "2022-01-01T18:00:00.1234567Z",
+            "checkedDateTime": "2022-02-01T18:00:00.1234567Z",
+            "isChecked": number % 2 == 0,
+        }
+        for number in range(10)
+    ],
+}
+
+
+@pytest.fixture
+def task_payload():
+    return deepcopy(TASK_PAYLOAD)
+
+
+def make_response(status_code, data=None):
+    response = Response()
+    response.status_code = status_code
+    response.encoding = "utf-8"
+    response._content = json.dumps(data).encode() if data is not None else b""
+    return response
+
+
+class EmulatorProvider(AbstractProvider):
+    """Calls the emulator directly, without network, counting the traffic"""
+
+    def __init__(self, emulator):
+        self._emulator = emulator
+        self.requests = 0
+        self.bytes = 0
+
+    def _request(self, method, url, params=None, body=None):
+        if params:
+            url = furl(url).add(params).url
+        status, _, data = self._emulator.handle(method, url, body)
+        response = make_response(status, data)
+        self.requests += 1
+        self.bytes += len(json.dumps(body)) if body else 0
+        self.bytes += len(response.content)
+        return response
+
+    def get(self, url, params=None):
+        return self._request("GET", url, params=params)
+
+    def delete(self, url):
+        return self._request("DELETE", url)
+
+    def patch(self, url, json_data):
+        return self._request("PATCH", url, body=json_data)
+
+    def post(self, url, json_data):
+        return self._request("POST", url, body=json_data)
+
+
+@pytest.fixture
+def client(emulator):
+    """Client of the emulator under a fake URL, for benchmarks without requests"""
+    return ToDoClient(EmulatorProvider(emulator), api_url=API_URL)
+
+
+@pytest.fixture
+def emulator():
+    emulator = Emulator()
+    yield emulator
+    emulator.stop()
+
+
+@pytest.fixture
+def emulator_client(emulator):
+    provider = EmulatorProvider(emulator)
+    return ToDoClient(provider, api_url=emulator.url)
@@ -0,0 +1,129 @@
+import copy
+
+import pytest
+
+from todoms.attributes import Content, ContentType, Weekday
+from todoms.bulk import BulkResult, run_bulk
+from todoms.converters.interning import is_shared, read_only, shared_values, unshared
+from todoms.recurrence.patterns import Daily
+from todoms.resources import Task
+
+RECURRENCE = {
+    "pattern": {"type": "daily", "interval": 2},
+    "range": {"type": "noEnd", "startDate": "2024-01-01"},
+}
+
+
+def _task(task_id, **data):
+    return Task.from_dict(
+        {"id": task_id, "recurrence": copy.deepcopy(RECURRENCE), **data}
+    )
+
+
+def test_values_are_not_shared_by_default():
+    first, second = _task("1"), _task("2")
+
+    assert first.recurrence == second.recurrence
+    assert first.recurrence is not second.recurrence
+    assert not is_shared(first.recurrence)
+
+
+def test_equal_values_are_shared():
+    with shared_values():
+        first = _task("1", body={"content": "", "contentType": "text"})
+        second = _task("2", body={"content": "", "contentType": "text"})
+        other = _task("3", body={"content": "Body", "contentType": "text"})
+
+    assert first.recurrence is second.recurrence
+    assert first.recurrence.pattern is second.recurrence.pattern
+    assert first.body is second.body
+    assert other.body is not first.body
+    assert first.recurrence == _task("4").recurrence
+
+
+def test_category_names_are_interned():
+    name = "".join(["Work", "Home"])
+
+    first = Task.from_dict({"categories": [name]})
+    second = Task.from_dict({"categories": ["WorkHome"]})
+
+    assert first.categories[0] is second.categories[0]
+
+
+def test_shared_values_are_read_only():
+    with shared_values():
+        task = _task("1", body={"content": None, "contentType": "html"})
+
+    with pytest.raises(AttributeError):
+        task.recurrence.pattern.interval = 5
+    with pytest.raises(AttributeError):
+        task.recurrence.pattern = Daily(interval=5)
+    with pytest.raises(AttributeError):
+        task.body.value = "Body"
+
+
+def test_shared_content_is_copied_on_write():
+    with shared_values():
+        first = _task("1", body={"content": "", "contentType": "text"})
+        second = _task("2", body={"content": "", "contentType": "text"})
+
+    first.body = "Changed"
+
+    assert first.body == Content("Changed", ContentType.TEXT)
+    assert second.body == Content("", ContentType.TEXT)
+
+
+def test_unshared_copy_can_be_changed():
+    with shared_values():
+        task = _task("1")
+        other = _task("2")
+
+    task.recurrence = unshared(task.recurrence)
+    task.recurrence.pattern.interval = 5
+
+    assert other.recurrence.pattern.interval == 2
+    assert not is_shared(task.recurrence.range)
+
+
+def test_lists_of_shared_values_are_read_only():
+    recurrence = {
+        "pattern": {"type": "weekly", "interval": 1, "daysOfWeek": ["monday"]},
+        "range": {"type": "noEnd", "startDate": "2024-01-01"},
+    }
+    with shared_values():
+        task = Task.from_dict({"id": "1", "recurrence": recurrence})
+        other = Task.from_dict({"id": "2", "recurrence": recurrence})
+
+    with pytest.raises(AttributeError):
+        task.recurrence.pattern.days_of_week.append(Weekday.FRIDAY)
+    with pytest.raises(AttributeError):
+        task.recurrence.pattern.days_of_week[0] = Weekday.FRIDAY
+    copied = unshared(task.recurrence)
+    copied.pattern.days_of_week.append(Weekday.FRIDAY)
+
+    assert other.recurrence.pattern.days_of_week == [Weekday.MONDAY]
+    assert task.recurrence == Task.from_dict({"recurrence": recurrence}).recurrence
+
+
+def test_defaults_are_not_stored_in_shared_values():
+    recurrence = {
+        "pattern": {"type": "daily"},
+        "range": {"type": "noEnd", "startDate": "2024-01-01"},
+    }
+    with shared_values():
+        task = Task.from_dict({"id": "1", "recurrence": recurrence})
+
+    assert task.recurrence.pattern.interval is None
+    assert "interval" not in task.recurrence.pattern.__dict__
+    with pytest.raises(AttributeError):
+        read_only([]).append(1)
+
+
+def test_bulk_actions_share_values_of_caller():
+    with shared_values():
+        report = run_bulk(
+            [str(i) for i in range(8)], lambda i: BulkResult(_task(i)), concurrency=4
+        )
+
+    first = report.results[0].item.recurrence
+    assert all(result.item.recurrence is first for result in report)
@@ -2,6 +2,7 @@ from datetime import date
 
 import pytest
 
+from todoms.attributes import WeekIndex
 from todoms.converters.recurrence import (
     RecurrenceConverter,
     RecurrencePatternConverter,
@@ -60,6 +61,15 @@ class TestRecurrencePatternConverter:
         converter = RecurrencePatternConverter()
         assert isinstance(converter.obj_converter(data), expected_class) is True
 
+    def test_recurrence_patterns_converter_reads_index(self):
+        converter = RecurrencePatternConverter()
+
+        pattern = converter.obj_converter(
+            {"type": "relativeMonthly", "daysOfWeek": ["friday"], "index": "last"}
+        )
+
+        assert pattern.index == WeekIndex.LAST
+
     def test_recurrence_patterns_converter_when_invalid(self):
         converter = RecurrencePatternConverter()
         with pytest.raises(ValueError):
@@ -8,11 +8,28 @@ import pytest
 from todoms.client import ToDoClient
 from todoms.provider import WebBrowserProvider
 
+from ..utils.emulator import Emulator
+from ..utils.requests_provider import RequestsProvider
+
 logger = logging.getLogger(__name__)
 
+USE_EMULATOR = os.environ.get("USE_EMULATOR", "0") == "1"
+
+
+@pytest.fixture(scope="session")
+def emulator():
+    if not USE_EMULATOR:
+        yield None
+        return
+    with Emulator() as emulator:
+        yield emulator
+
 
 @pytest.fixture(scope="session")
-def provider():
+def provider(emulator):
+    if emulator:
+        return RequestsProvider()
+
     APP_ID = os.environ.get("APP_ID")
     APP_SECRET = os.environ.get("APP_SECRET")
     TEST_USER_EMAIL = os.environ.get("TEST_USER_EMAIL")
@@ -30,7 +47,9 @@ def provider():
 
 
 @pytest.fixture(scope="session")
-def client(provider):
+def client(provider, emulator):
+    if emulator:
+        return ToDoClient(provider, api_url=emulator.url)
     client = ToDoClient(provider)
     return client
 
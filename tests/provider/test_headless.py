@@ -0,0 +1,135 @@
+import os
+import stat
+import threading
+import time
+from urllib.parse import parse_qs
+
+import pytest
+
+from todoms.provider import FileTokenCache, HeadlessProvider, MemoryTokenCache
+from todoms.provider.headless import TokenNotAvailableError
+
+TOKEN_URL = "https://login.microsoftonline.com/common/oauth2/v2.0/token"
+API_URL = "https://api.url/item"
+
+
+def _token(access_token, expires_in=3600, refresh_token="refresh"):
+    token = {
+        "access_token": access_token,
+        "token_type": "Bearer",
+        "expires_in": expires_in,
+    }
+    if refresh_token:
+        token["refresh_token"] = refresh_token
+    return token
+
+
+def _grant(request):
+    return parse_qs(request.text)["grant_type"][0]
+
+
+@pytest.fixture
+def api(requests_mock):
+    requests_mock.get(API_URL, json={"id": "item"})
+    return requests_mock
+
+
+def test_token_loaded_from_cache(api):
+    cache = MemoryTokenCache(_token("cached"))
+    provider = HeadlessProvider("app", "secret", token_cache=cache)
+    provider.authorize()
+
+    provider.get(API_URL)
+
+    assert api.call_count == 1
+    assert api.last_request.headers["Authorization"] == "Bearer cached"
+    provider.close()
+
+
+def test_refresh_token_bootstrap_saved_to_file(api, tmp_path):
+    path = str(tmp_path / "token.json")
+    api.post(TOKEN_URL, json=_token("from-refresh"))
+    provider = HeadlessProvider(
+        "app", "secret", token_cache=FileTokenCache(path), refresh_token="initial"
+    )
+    provider.authorize()
+    provider.close()
+
+    assert _grant(api.request_history[0]) == "refresh_token"
+    assert parse_qs(api.request_history[0].text)["refresh_token"] == ["initial"]
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert FileTokenCache(path).load()["access_token"] == "from-refresh"
+
+    provider = HeadlessProvider("app", "secret", token_cache=FileTokenCache(path))
+    provider.authorize()
+    provider.get(API_URL)
+    provider.close()
+
+    assert api.call_count == 2
+    assert api.last_request.headers["Authorization"] == "Bearer from-refresh"
+
+
+def test_client_credentials_bootstrap(api):
+    api.post(TOKEN_URL, json=_token("app-token", refresh_token=None))
+    provider = HeadlessProvider("app", "secret", client_credentials=True)
+    provider.authorize()
+
+    provider.get(API_URL)
+    provider.close()
+
+    token_request = api.request_history[0]
+    assert _grant(token_request) == "client_credentials"
+    assert parse_qs(token_request.text)["scope"] == [
+        "https://graph.microsoft.com/.default"
+    ]
+    assert api.last_request.headers["Authorization"] == "Bearer app-token"
+
+
+def test_client_credentials_token_fetched_again_when_rejected(requests_mock):
+    requests_mock.post(
+        TOKEN_URL,
+        [
+            {"json": _token("first", refresh_token=None)},
+            {"json": _token("second", refresh_token=None)},
+        ],
+    )
+    requests_mock.get(
+        API_URL,
+        [{"status_code": 401}, {"json": {"id": "item"}}],
+    )
+    provider = HeadlessProvider(
+        "app", "secret", client_credentials=True, background_refresh=False
+    )
+    provider.authorize()
+
+    assert provider.get(API_URL).status_code == 200
+    assert requests_mock.last_request.headers["Authorization"] == "Bearer second"
+
+
+def test_token_refreshed_before_expiration(api):
+    refreshed = threading.Event()
+    cache = MemoryTokenCache(_token("old", expires_in=3600))
+    cache._token["expires_at"] = time.time() + 1
+
+    def token_callback(request, context):
+        refreshed.set()
+        return _token("new")
+
+    api.post(TOKEN_URL, json=token_callback)
+    provider = HeadlessProvider("app", "secret", token_cache=cache, refresh_margin=0.9)
+    provider.authorize()
+
+    assert refreshed.wait(5)
+    provider.close()
+
+    assert _grant(api.last_request) == "refresh_token"
+    assert cache.load()["access_token"] == "new"
+    provider.get(API_URL)
+    assert api.last_request.headers["Authorization"] == "Bearer new"
+
+
+def test_authorize_without_token_source_raises():
+    provider = HeadlessProvider("app", "secret")
+
+    with pytest.raises(TokenNotAvailableError):
+        provider.authorize()
@@ -0,0 +1,154 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from todoms.client import ResponseError, ToDoClient
+from todoms.provider import WebBrowserProvider
+from todoms.provider.browser_provider import RequestBeforeAuthenticatedError
+from todoms.resources import TaskList
+
+THREADS = 32
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Accepts only the last token issued by the token endpoint"""
+
+    def _reply(self, code, data):
+        body = json.dumps(data).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with self.server.lock:
+            time.sleep(0.05)  # Give other threads time to notice expired token
+            self.server.token_requests += 1
+            self.server.valid_token = f"token-{self.server.token_requests}"
+            token = {
+                "access_token": self.server.valid_token,
+                "refresh_token": "refresh",
+                "token_type": "Bearer",
+                "expires_in": 3600,
+            }
+        self._reply(200, token)
+
+    def do_GET(self):
+        if self.headers.get("Authorization") != f"Bearer {self.server.valid_token}":
+            self._reply(401, {"error": "InvalidAuthenticationToken"})
+            return
+        self._reply(200, {"id": self.path.rsplit("/", 1)[-1]})
+
+    def log_message(self, *_):
+        pass
+
+
+class _StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = THREADS * 2
+
+
+@pytest.fixture
+def stub_server(monkeypatch):
+    monkeypatch.setenv("OAUTHLIB_INSECURE_TRANSPORT", "1")
+    server = _StubServer(("127.0.0.1", 0), _StubHandler)
+    server.lock = threading.Lock()
+    server.token_requests = 0
+    server.valid_token = "initial"
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def base_url(stub_server):
+    return f"http://127.0.0.1:{stub_server.server_port}"
+
+
+@pytest.fixture
+def provider(base_url):
+    return WebBrowserProvider("app-id", "secret", authority=f"{base_url}/")
+
+
+def _hammer(client, requests_per_thread=5):
+    barrier = threading.Barrier(THREADS)
+
+    def _work(thread_no):
+        barrier.wait()
+        return [
+            client.get(TaskList, f"list-{thread_no}-{i}").id
+            for i in range(requests_per_thread)
+        ]
+
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        return list(executor.map(_work, range(THREADS)))
+
+
+def test_token_rejected_by_server_refreshed_once(stub_server, base_url, provider):
+    provider._save_token(
+        {"access_token": "revoked", "refresh_token": "refresh", "token_type": "Bearer"}
+    )
+    client = ToDoClient(provider, api_url=base_url)
+
+    results = _hammer(client)
+
+    assert stub_server.token_requests == 1
+    assert results[3] == [f"list-3-{i}" for i in range(5)]
+
+
+def test_expired_token_refreshed_once(stub_server, base_url, provider):
+    provider._save_token(
+        {
+            "access_token": "initial",
+            "refresh_token": "refresh",
+            "token_type": "Bearer",
+            "expires_at": time.time() - 10,
+        }
+    )
+    client = ToDoClient(provider, api_url=base_url)
+
+    _hammer(client)
+
+    assert stub_server.token_requests == 1
+
+
+def test_every_thread_uses_own_session(provider):
+    provider._save_token({"access_token": "initial", "token_type": "Bearer"})
+
+    barrier = threading.Barrier(4)
+
+    def _session(_):
+        barrier.wait()
+        return provider._thread_session()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        sessions = list(executor.map(_session, range(4)))
+
+    assert len({id(session) for session in sessions}) == 4
+    assert provider._thread_session() is provider._thread_session()
+
+
+def test_rejected_token_without_refresh_token_returns_response(
+    stub_server, base_url, provider
+):
+    provider._save_token({"access_token": "revoked", "token_type": "Bearer"})
+    client = ToDoClient(provider, api_url=base_url)
+
+    with pytest.raises(ResponseError):
+        client.get(TaskList, "list-1")
+    assert stub_server.token_requests == 0
+
+
+def test_request_before_authorization_raises(provider):
+    with pytest.raises(RequestBeforeAuthenticatedError):
+        provider.get("http://127.0.0.1/")
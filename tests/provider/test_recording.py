@@ -0,0 +1,106 @@
+import pytest
+
+from todoms.attributes import Status
+from todoms.client import ResourceNotFoundError, ToDoClient
+from todoms.provider import RecordingProvider, ReplayProvider, recording
+from todoms.provider.recording import ReplayMismatchError
+from todoms.resources import Task, TaskList
+
+from ..utils.constants import API_BASE, API_PREFIX, API_URL
+from ..utils.requests_provider import RequestsProvider
+
+LISTS_URL = f"{API_BASE}/todo/lists"
+
+
+@pytest.fixture(params=["traffic.ndjson", "traffic.ndjson.gz"])
+def path(request, tmp_path):
+    return str(tmp_path / request.param)
+
+
+def _client(provider):
+    return ToDoClient(provider, api_url=API_URL, api_prefix=API_PREFIX)
+
+
+@pytest.fixture
+def recorded(path, requests_mock):
+    requests_mock.get(
+        f"{LISTS_URL}/delta",
+        json={
+            "value": [{"id": "list-1", "displayName": "First"}],
+            "@odata.nextLink": "https://next/page",
+        },
+    )
+    requests_mock.get(
+        "https://next/page", json={"value": [{"id": "list-2", "displayName": "Second"}]}
+    )
+    requests_mock.patch(
+        f"{LISTS_URL}/list-1/tasks/task-1", json={"id": "task-1", "status": "completed"}
+    )
+    requests_mock.get(
+        f"{LISTS_URL}/missing",
+        status_code=404,
+        reason="Not Found",
+        headers={"Retry-After": "3", "ETag": 'W/"1"'},
+    )
+
+    with RecordingProvider(RequestsProvider(), path) as provider:
+        client = _client(provider)
+        list(client.task_lists)
+        task_list = TaskList.from_dict({"id": "list-1"}, client=client)
+        task = Task.from_dict({"id": "task-1", "status": "notStarted"}, client=client)
+        task.task_list = task_list
+        task.status = Status.COMPLETED
+        client.patch(task)
+        with pytest.raises(ResourceNotFoundError):
+            client.raw_get("todo/lists/missing")
+
+    requests_mock.reset_mock()
+    return path
+
+
+def test_replay_serves_recorded_responses(recorded, requests_mock):
+    client = _client(ReplayProvider(recorded))
+
+    assert [task_list.name for task_list in client.task_lists] == ["First", "Second"]
+    task_list = TaskList.from_dict({"id": "list-1"}, client=client)
+    task = Task.from_dict({"id": "task-1", "status": "notStarted"}, client=client)
+    task.task_list = task_list
+    task.status = Status.COMPLETED
+    assert client.patch(task)["status"] == "completed"
+    with pytest.raises(ResourceNotFoundError):
+        client.raw_get("todo/lists/missing")
+    assert requests_mock.call_count == 0
+
+
+def test_replay_serves_recorded_headers(recorded):
+    response = ReplayProvider(recorded).get(f"{LISTS_URL}/missing")
+
+    assert response.headers["retry-after"] == "3"
+    assert response.headers["ETag"] == 'W/"1"'
+
+
+def test_replay_matches_bodies_with_matcher(recorded):
+    provider = ReplayProvider(recorded, body_matcher=lambda body: None)
+
+    response = provider.patch(f"{LISTS_URL}/list-1/tasks/task-1", {"title": "Other"})
+
+    assert response.json()["status"] == "completed"
+
+
+def test_replay_rejects_not_recorded_request(recorded):
+    provider = ReplayProvider(recorded)
+
+    with pytest.raises(ReplayMismatchError):
+        provider.get(f"{LISTS_URL}/other")
+    with pytest.raises(ReplayMismatchError):
+        provider.patch(f"{LISTS_URL}/list-1/tasks/task-1", {"status": "notStarted"})
+
+
+def test_replay_simulates_latency_and_bandwidth(recorded, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(recording.time, "sleep", sleeps.append)
+    provider = ReplayProvider(recorded, latency=0.1, bandwidth=1000)
+
+    response = provider.get(f"{LISTS_URL}/missing")
+
+    assert sleeps == [pytest.approx(0.1 + len(response.content) / 1000)]
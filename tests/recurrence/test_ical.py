@@ -0,0 +1,134 @@
+from datetime import date, datetime, timezone
+
+import pytest
+
+from todoms.attributes import Weekday, WeekIndex
+from todoms.recurrence import Recurrence
+from todoms.recurrence.patterns import (
+    Daily,
+    MonthlyAbsolute,
+    MonthlyRelative,
+    Weekly,
+    YearlyAbsolute,
+    YearlyRelative,
+)
+from todoms.recurrence.ranges import EndDate, NoEnd, Numbered
+
+
+@pytest.mark.parametrize(
+    "recurrence, expected",
+    [
+        (Recurrence(Daily(interval=2), NoEnd()), "FREQ=DAILY;INTERVAL=2"),
+        (
+            Recurrence(
+                Weekly(interval=1, days_of_week=[Weekday.MONDAY, Weekday.FRIDAY]),
+                Numbered(occurrences=10),
+            ),
+            "FREQ=WEEKLY;INTERVAL=1;BYDAY=MO,FR;WKST=SU;COUNT=10",
+        ),
+        (
+            Recurrence(
+                MonthlyAbsolute(interval=3, day_of_month=15),
+                EndDate(end_date=date(2024, 12, 31)),
+            ),
+            "FREQ=MONTHLY;INTERVAL=3;BYMONTHDAY=15;UNTIL=20241231T235959",
+        ),
+        (
+            Recurrence(
+                MonthlyRelative(interval=1, days_of_week=[Weekday.FRIDAY]), NoEnd()
+            ),
+            "FREQ=MONTHLY;INTERVAL=1;BYDAY=FR;BYSETPOS=1",
+        ),
+        (
+            Recurrence(YearlyAbsolute(interval=1, day_of_month=2, month=5), NoEnd()),
+            "FREQ=YEARLY;INTERVAL=1;BYMONTH=5;BYMONTHDAY=2",
+        ),
+        (
+            Recurrence(
+                YearlyRelative(interval=1, days_of_week=[Weekday.SUNDAY], month=3),
+                NoEnd(),
+            ),
+            "FREQ=YEARLY;INTERVAL=1;BYMONTH=3;BYDAY=SU;BYSETPOS=1",
+        ),
+    ],
+)
+def test_recurrence_to_and_from_rrule(recurrence, expected):
+    assert recurrence.to_rrule() == expected
+    assert Recurrence.from_rrule(expected).to_dict() == recurrence.to_dict()
+
+
+@pytest.mark.parametrize(
+    "value, index",
+    [
+        ("FREQ=MONTHLY;BYDAY=FR;BYSETPOS=-1", WeekIndex.LAST),
+        ("FREQ=MONTHLY;BYDAY=-1FR", WeekIndex.LAST),
+        ("FREQ=MONTHLY;BYDAY=+2FR", WeekIndex.SECOND),
+        ("FREQ=MONTHLY;BYDAY=SA,SU;BYSETPOS=4", WeekIndex.FOURTH),
+    ],
+)
+def test_recurrence_from_rrule_with_index(value, index):
+    recurrence = Recurrence.from_rrule(value)
+
+    assert recurrence.pattern.index == index
+    assert Recurrence.from_rrule(recurrence.to_rrule()) == recurrence
+
+
+def test_recurrence_from_rrule_with_start_date():
+    recurrence = Recurrence.from_rrule(
+        "RRULE:FREQ=MONTHLY;BYDAY=1MO", start_date=date(2024, 1, 1)
+    )
+
+    assert isinstance(recurrence.pattern, MonthlyRelative)
+    assert recurrence.pattern.interval == 1
+    assert recurrence.range.start_date == date(2024, 1, 1)
+    assert isinstance(recurrence.range, NoEnd)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "FREQ=HOURLY",
+        "FREQ=MONTHLY;BYDAY=MO",
+        "FREQ=MONTHLY;BYDAY=-2FR",
+        "FREQ=MONTHLY;BYDAY=MO;BYSETPOS=5",
+        "FREQ=MONTHLY;BYDAY=1MO,2TU",
+        "FREQ=DAILY;BYMONTH=1",
+        "FREQ=DAILY;BYDAY=MO,TU",
+        "FREQ=WEEKLY;BYMONTHDAY=5",
+        "FREQ=WEEKLY;BYDAY=1MO",
+        "FREQ=MONTHLY;BYMONTH=3;BYMONTHDAY=2",
+        "FREQ=MONTHLY;BYMONTHDAY=2;BYSETPOS=1",
+        "FREQ=MONTHLY;BYDAY=MO;BYSETPOS=1;BYMONTHDAY=2",
+        "FREQ=MONTHLY;WKST=MO;BYMONTHDAY=2",
+        "FREQ=DAILY;COUNT=2;UNTIL=20240101",
+        "FREQ=DAILY;BYHOUR=8",
+        "FREQ",
+    ],
+)
+def test_recurrence_from_unsupported_rrule(value):
+    with pytest.raises(ValueError):
+        Recurrence.from_rrule(value)
+
+
+def test_same_recurrences_share_rule():
+    first, second = (
+        Recurrence(Daily(interval=2), NoEnd(start_date=date(2024, 1, 1)))
+        for _ in range(2)
+    )
+
+    assert first.rule() is second.rule()
+    assert first.rule() is not first.rule(datetime(2024, 1, 1, tzinfo=timezone.utc))
+
+
+def test_rule_with_end_date_and_timezone():
+    recurrence = Recurrence(
+        Daily(interval=1),
+        EndDate(start_date=date(2024, 1, 1), end_date=date(2024, 1, 2)),
+    )
+
+    occurrences = recurrence.occurrences(datetime(2024, 1, 1, tzinfo=timezone.utc))
+
+    assert list(occurrences) == [
+        datetime(2024, 1, 1, tzinfo=timezone.utc),
+        datetime(2024, 1, 2, tzinfo=timezone.utc),
+    ]
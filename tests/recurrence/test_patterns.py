@@ -1,4 +1,4 @@
-from todoms.attributes import RecurrencePatternType, Weekday
+from todoms.attributes import RecurrencePatternType, Weekday, WeekIndex
 from todoms.recurrence.patterns import (
     BaseRecurrencePattern,
     Daily,
@@ -69,6 +69,7 @@ def test_monthly_relative_recurrence_pattern_to_dict():
         "type": "relativeMonthly",
         "interval": 3,
         "daysOfWeek": ["friday", "saturday"],
+        "index": "first",
     }
 
 
@@ -93,4 +94,18 @@ def test_yearly_relative_recurrence_pattern_to_dict():
         "interval": 2,
         "daysOfWeek": ["monday", "thursday"],
         "month": 3,
+        "index": "first",
+    }
+
+
+def test_relative_recurrence_pattern_with_index_to_dict():
+    pattern = MonthlyRelative(
+        interval=1, days_of_week=[Weekday.FRIDAY], index=WeekIndex.LAST
+    )
+
+    assert pattern.to_dict() == {
+        "type": "relativeMonthly",
+        "interval": 1,
+        "daysOfWeek": ["friday"],
+        "index": "last",
     }
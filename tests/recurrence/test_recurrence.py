@@ -1,4 +1,18 @@
+from datetime import date, datetime, timezone
+
+import pytest
+
+from todoms.attributes import Weekday, WeekIndex
 from todoms.recurrence import Recurrence
+from todoms.recurrence.patterns import (
+    Daily,
+    MonthlyAbsolute,
+    MonthlyRelative,
+    Weekly,
+    YearlyAbsolute,
+    YearlyRelative,
+)
+from todoms.recurrence.ranges import EndDate, NoEnd, Numbered
 
 
 class TestRecurrence:
@@ -13,3 +27,108 @@ class TestRecurrence:
 
         recurrence = Recurrence(ToDict1(), ToDict2())
         assert recurrence.to_dict() == {"pattern": "dict1", "range": "dict2"}
+
+
+def _dates(*days):
+    return [datetime(2024, month, day) for month, day in days]
+
+
+@pytest.mark.parametrize(
+    "pattern, expected",
+    [
+        (Daily(interval=3), _dates((1, 1), (1, 4), (1, 7), (1, 10))),
+        (
+            Weekly(interval=2, days_of_week=[Weekday.MONDAY, Weekday.FRIDAY]),
+            _dates((1, 1), (1, 5), (1, 15), (1, 19)),
+        ),
+        (MonthlyAbsolute(interval=1, day_of_month=31), _dates((1, 31), (3, 31))),
+        (
+            MonthlyRelative(interval=1, days_of_week=[Weekday.FRIDAY]),
+            _dates((1, 5), (2, 2), (3, 1), (4, 5)),
+        ),
+        (
+            MonthlyRelative(
+                interval=1, days_of_week=[Weekday.FRIDAY], index=WeekIndex.LAST
+            ),
+            _dates((1, 26), (2, 23), (3, 29)),
+        ),
+        (
+            MonthlyRelative(
+                interval=1, days_of_week=[Weekday.MONDAY], index=WeekIndex.SECOND
+            ),
+            _dates((1, 8), (2, 12)),
+        ),
+        (YearlyAbsolute(interval=1, day_of_month=29, month=2), _dates((2, 29))),
+        (
+            YearlyRelative(interval=1, days_of_week=[Weekday.MONDAY], month=2),
+            _dates((2, 5)),
+        ),
+        (
+            YearlyRelative(
+                interval=1,
+                days_of_week=[Weekday.MONDAY],
+                month=2,
+                index=WeekIndex.LAST,
+            ),
+            _dates((2, 26)),
+        ),
+    ],
+)
+def test_occurrences_follow_pattern(pattern, expected):
+    recurrence = Recurrence(pattern, NoEnd(start_date=date(2024, 1, 1)))
+
+    occurrences = recurrence.occurrences(datetime(2024, 1, 1), expected[-1])
+
+    assert list(occurrences) == expected
+
+
+def test_occurrences_count_from_range_start():
+    recurrence = Recurrence(
+        Daily(interval=1), Numbered(start_date=date(2024, 1, 1), occurrences=5)
+    )
+
+    occurrences = recurrence.occurrences(datetime(2024, 1, 3), datetime(2025, 1, 1))
+
+    assert list(occurrences) == _dates((1, 3), (1, 4), (1, 5))
+
+
+def test_occurrences_stop_at_end_date():
+    recurrence = Recurrence(
+        Daily(interval=1),
+        EndDate(start_date=date(2024, 1, 1), end_date=date(2024, 1, 3)),
+    )
+
+    assert list(recurrence.occurrences(datetime(2024, 1, 1))) == _dates(
+        (1, 1), (1, 2), (1, 3)
+    )
+
+
+def test_occurrences_stop_at_end_date_with_timezone():
+    recurrence = Recurrence(
+        Daily(interval=1),
+        EndDate(start_date=date(2024, 1, 1), end_date=date(2024, 1, 2)),
+    )
+
+    occurrences = recurrence.occurrences(datetime(2024, 1, 1, tzinfo=timezone.utc))
+
+    assert list(occurrences) == [
+        datetime(2024, 1, 1, tzinfo=timezone.utc),
+        datetime(2024, 1, 2, tzinfo=timezone.utc),
+    ]
+
+
+def test_occurrences_are_lazy():
+    recurrence = Recurrence(Daily(interval=1), NoEnd(start_date=date(2024, 1, 1)))
+
+    occurrences = recurrence.occurrences(datetime(2024, 1, 1))
+
+    assert next(occurrences) == datetime(2024, 1, 1)
+    assert next(occurrences) == datetime(2024, 1, 2)
+
+
+def test_occurrences_start_at_given_date_without_range_start():
+    recurrence = Recurrence(Weekly(interval=1), NoEnd())
+
+    occurrences = recurrence.occurrences(datetime(2024, 1, 3), datetime(2024, 1, 17))
+
+    assert list(occurrences) == _dates((1, 3), (1, 10), (1, 17))
@@ -0,0 +1,85 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from todoms.recurrence import Recurrence
+from todoms.recurrence.patterns import Daily
+from todoms.recurrence.ranges import Numbered
+from todoms.recurrence.schedule import DueIndex
+from todoms.resources import Task
+
+NOW = datetime(2024, 1, 1, 12)
+
+
+def _recurring(task_id, interval, start=date(2024, 1, 1), occurrences=None):
+    range_ = Numbered(start_date=start, occurrences=occurrences)
+    return Task(
+        _id=task_id,
+        recurrence=Recurrence(Daily(interval=interval), range_),
+    )
+
+
+def test_due_index_orders_tasks_by_next_occurrence():
+    index = DueIndex(
+        NOW,
+        [
+            _recurring("every-3-days", 3),
+            _recurring("daily", 1),
+            Task(_id="once", due_datetime=datetime(2024, 1, 1, 18)),
+            Task(_id="past", due_datetime=datetime(2023, 12, 1)),
+            Task(_id="no-due-date"),
+        ],
+    )
+
+    assert len(index) == 3
+    assert index.next_due()[1].id == "once"
+    assert [(due, task.id) for due, task in index.due_within(timedelta(days=2))] == [
+        (datetime(2024, 1, 1, 18), "once"),
+        (datetime(2024, 1, 2), "daily"),
+    ]
+
+
+def test_due_index_advances_incrementally():
+    index = DueIndex(NOW, [_recurring("daily", 1), _recurring("every-3-days", 3)])
+
+    due = index.advance(datetime(2024, 1, 4))
+
+    assert [(due, task.id) for due, task in due] == [
+        (datetime(2024, 1, 2), "daily"),
+        (datetime(2024, 1, 3), "daily"),
+        (datetime(2024, 1, 4), "every-3-days"),
+        (datetime(2024, 1, 4), "daily"),
+    ]
+    assert index.now == datetime(2024, 1, 4)
+    assert index.advance(datetime(2024, 1, 4, 23)) == []
+    assert index.next_due()[0] == datetime(2024, 1, 5)
+
+
+def test_due_index_drops_finished_recurrences():
+    index = DueIndex(NOW, [_recurring("twice", 1, occurrences=3)])
+
+    assert len(index.advance(datetime(2024, 2, 1))) == 2
+    assert len(index) == 0
+    assert index.next_due() is None
+
+
+def test_due_index_removes_and_replaces_tasks():
+    index = DueIndex(NOW, [_recurring("daily", 1), _recurring("other", 1)])
+
+    index.remove("other")
+    index.add(_recurring("daily", 5))
+
+    assert "other" not in index
+    assert [task.id for _, task in index.advance(datetime(2024, 1, 10))] == ["daily"]
+
+
+def test_due_index_uses_timezone_of_now():
+    now = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+    index = DueIndex(now, [_recurring("daily", 1)])
+
+    assert index.next_due()[0] == datetime(2024, 1, 2, tzinfo=timezone.utc)
+
+
+def test_due_index_requires_task_id():
+    with pytest.raises(ValueError):
+        DueIndex(NOW, [Task(due_datetime=NOW)])
@@ -0,0 +1,203 @@
+import threading
+import time
+
+import pytest
+
+from todoms.attributes import Importance, Status
+from todoms.bulk import BulkResult, run_bulk
+from todoms.client import ResourceNotFoundError, ResponseError
+from todoms.filters import and_, eq
+from todoms.resources import Subtask, Task, TaskList
+from todoms.store import TaskStore
+
+from .utils.constants import API_BASE
+
+TASKS_URL = f"{API_BASE}/todo/lists/list-1/tasks"
+
+
+@pytest.fixture
+def task_list(client):
+    return TaskList.from_dict({"id": "list-1"}, client=client)
+
+
+def test_bulk_create_creates_tasks_with_subtasks(task_list, requests_mock):
+    requests_mock.post(
+        TASKS_URL,
+        [
+            {"json": {"id": "task-1", "title": "first"}, "status_code": 201},
+            {"json": {"id": "task-2", "title": "second"}, "status_code": 201},
+        ],
+    )
+    subtasks_mock = requests_mock.post(
+        f"{TASKS_URL}/task-1/checklistItems",
+        [
+            {"json": {"id": "sub-1", "displayName": "a"}, "status_code": 201},
+            {"json": {"id": "sub-2", "displayName": "b"}, "status_code": 201},
+        ],
+    )
+    first = Task(title="first")
+    first.subtasks = [Subtask(name="a"), Subtask(name="b")]
+    second = Task(title="second")
+    progress = []
+
+    report = task_list.bulk_create(
+        [first, second], concurrency=1, progress=progress.append
+    )
+
+    assert report.ok
+    assert [result.item for result in report] == [first, second]
+    assert (first.id, second.id) == ("task-1", "task-2")
+    assert [subtask.id for subtask in first.subtasks] == ["sub-1", "sub-2"]
+    names = [request.json()["displayName"] for request in subtasks_mock.request_history]
+    assert names == ["a", "b"]
+    assert first.task_list is task_list
+    assert len(progress) == 2
+
+
+def test_bulk_create_reports_failures(task_list, requests_mock):
+    requests_mock.post(
+        TASKS_URL,
+        [
+            {"json": {"id": "task-1"}, "status_code": 201},
+            {"status_code": 500},
+        ],
+    )
+    requests_mock.post(
+        f"{TASKS_URL}/task-1/checklistItems",
+        [
+            {"status_code": 500},
+            {"json": {"id": "sub-2"}, "status_code": 201},
+        ],
+    )
+    first = Task(title="first")
+    broken, working = Subtask(name="broken"), Subtask(name="working")
+    first.subtasks = [broken, working]
+    second = Task(title="second")
+
+    report = task_list.bulk_create([first, second], concurrency=1)
+
+    assert not report.ok
+    assert report.succeeded == []
+    first_result, second_result = report.failed
+    assert first_result.error is None
+    assert first_result.subtask_errors[0][0] is broken
+    assert working.id == "sub-2"
+    assert isinstance(second_result.error, ResponseError)
+    assert second.id is None
+
+
+def test_run_bulk_reads_items_lazily():
+    lock = threading.Lock()
+    state = {"running": 0, "peak": 0, "pulled": 0, "done": 0, "ahead": 0}
+
+    def action(item):
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        time.sleep(0.001)
+        with lock:
+            state["running"] -= 1
+            state["done"] += 1
+        return BulkResult(item)
+
+    def items():
+        for item in range(50):
+            with lock:
+                state["pulled"] += 1
+                state["ahead"] = max(state["ahead"], state["pulled"] - state["done"])
+            yield item
+
+    report = run_bulk(items(), action, concurrency=3)
+
+    assert [result.item for result in report] == list(range(50))
+    assert state["peak"] <= 3
+    assert state["ahead"] <= 7
+
+
+def test_run_bulk_rejects_no_concurrency():
+    with pytest.raises(ValueError):
+        run_bulk([], BulkResult, concurrency=0)
+
+
+def test_update_where_patches_only_changes(task_list, requests_mock):
+    requests_mock.get(
+        f"{TASKS_URL}?$filter=importance eq 'high'&$select=id",
+        json={"value": [{"id": "task-1"}, {"id": "task-2"}]},
+    )
+    patches = [
+        requests_mock.patch(f"{TASKS_URL}/{task_id}", json={"id": task_id})
+        for task_id in ("task-1", "task-2")
+    ]
+
+    report = task_list.update_where(
+        and_(importance=eq(Importance.HIGH)), status=Status.COMPLETED
+    )
+
+    assert report.ok
+    assert [result.item for result in report] == ["task-1", "task-2"]
+    assert all(
+        patch.last_request.json() == {"status": "completed"} for patch in patches
+    )
+
+
+def test_update_where_rejects_unknown_attributes(task_list):
+    with pytest.raises(ValueError):
+        task_list.update_where("status eq 'completed'", colour="red")
+
+
+def test_delete_where(task_list, requests_mock):
+    requests_mock.get(
+        f"{TASKS_URL}?$filter=status eq 'completed'&$select=id",
+        json={"value": [{"id": "task-1"}, {"id": "task-2"}]},
+    )
+    requests_mock.delete(f"{TASKS_URL}/task-1", status_code=204)
+    requests_mock.delete(f"{TASKS_URL}/task-2", status_code=404)
+
+    report = task_list.delete_where(and_(status=eq(Status.COMPLETED)))
+
+    assert [result.item for result in report.succeeded] == ["task-1"]
+    assert isinstance(report.failed[0].error, ResourceNotFoundError)
+
+
+def test_bulk_changes_are_followed_by_store(task_list, requests_mock):
+    store = TaskStore(
+        Task.from_dict({"id": task_id, "status": "notStarted"})
+        for task_id in ("task-1", "task-2", "task-3")
+    )
+    store.attach(task_list.client)
+    requests_mock.get(
+        f"{TASKS_URL}?$filter=importance eq 'high'&$select=id",
+        json={"value": [{"id": "task-1"}, {"id": "task-2"}]},
+    )
+    requests_mock.patch(
+        f"{TASKS_URL}/task-1", json={"id": "task-1", "status": "completed"}
+    )
+    requests_mock.patch(f"{TASKS_URL}/task-2", status_code=500)
+    requests_mock.get(
+        f"{TASKS_URL}?$filter=status eq 'completed'&$select=id",
+        json={"value": [{"id": "task-1"}]},
+    )
+    requests_mock.delete(f"{TASKS_URL}/task-1", status_code=204)
+
+    task_list.update_where(
+        and_(importance=eq(Importance.HIGH)), status=Status.COMPLETED
+    )
+
+    assert store.get("task-1").status == Status.COMPLETED
+    assert store.get("task-2").status == Status.NOT_STARTED
+
+    task_list.delete_where(and_(status=eq(Status.COMPLETED)))
+
+    assert store.get("task-1") is None
+    assert store.get("task-3") is not None
+
+
+def test_run_bulk_without_results_reports_progress():
+    progress = []
+
+    report = run_bulk(
+        range(5), BulkResult, progress=progress.append, keep_results=False
+    )
+
+    assert len(report) == 0
+    assert sorted(result.item for result in progress) == list(range(5))
@@ -1,13 +1,18 @@
 from pytest import fixture, mark, raises
 
-from todoms.client import ResourceNotFoundError, ResponseError
+from todoms.client import ResourceNotFoundError, ResponseError, TooManyRequestsError
 from todoms.fields.basic import Attribute
 from todoms.resources import Resource, TaskList
 
 from .utils.constants import API_BASE
 from .utils.helpers import match_body
+from .utils.requests_provider import RequestsProvider
 
-EXPECTED_ERRORS = [(404, ResourceNotFoundError), (500, ResponseError)]
+EXPECTED_ERRORS = [
+    (404, ResourceNotFoundError),
+    (429, TooManyRequestsError),
+    (500, ResponseError),
+]
 
 
 @fixture
@@ -62,6 +67,66 @@ def test_list_resource_returns_all_when_parted(client, resource_class, requests_
     assert list(filter(lambda e: e.name == "res-3", results)) is not []
 
 
+def test_raw_pages_returns_pages_with_links(client, requests_mock):
+    requests_mock.get(
+        f"{API_BASE}/my-endpoint/delta",
+        json={"value": [{"name": "res-1"}], "@odata.nextLink": "http://next/part/1"},
+    )
+    requests_mock.get(
+        "http://next/part/1",
+        json={"value": [{"name": "res-2"}], "@odata.deltaLink": "http://delta/1"},
+    )
+
+    pages = list(client.raw_pages("my-endpoint/delta"))
+
+    assert [page.items for page in pages] == [
+        [{"name": "res-1"}],
+        [{"name": "res-2"}],
+    ]
+    assert pages[-1].delta_link == "http://delta/1"
+
+
+def test_raw_pages_accepts_full_url(client, requests_mock):
+    requests_mock.get("http://delta/1", json={"value": [{"name": "res-1"}]})
+
+    pages = list(client.raw_pages("http://delta/1"))
+
+    assert [page.data for page in pages] == [{"value": [{"name": "res-1"}]}]
+
+
+def test_list_raw_returns_pages_as_received(client, resource_class, requests_mock):
+    first_page = (
+        b'{"value": [{"name": "res-1", "extra": 1}],'
+        b' "@odata.nextLink": "http://next/part/1"}'
+    )
+    requests_mock.get(
+        f"{API_BASE}/{resource_class.ENDPOINT}?filter=test-parsed", content=first_page
+    )
+    requests_mock.get(
+        "http://next/part/1",
+        json={"value": [{"name": "res-2"}], "@odata.deltaLink": "http://delta"},
+    )
+
+    pages = list(client.list(resource_class, filter="test", raw=True))
+
+    assert pages[0].content == first_page
+    assert pages[0].items == [{"name": "res-1", "extra": 1}]
+    assert pages[0].next_link == "http://next/part/1"
+    assert pages[1].url == "http://next/part/1"
+    assert pages[1].items == [{"name": "res-2"}]
+    assert (pages[1].next_link, pages[1].delta_link) == (None, "http://delta")
+
+
+def test_get_raw_returns_response_as_received(client, resource_class, requests_mock):
+    content = b'{"id": "res-1", "name": "Name"}'
+    requests_mock.get(f"{API_BASE}/{resource_class.ENDPOINT}/res-1", content=content)
+
+    response = client.get(resource_class, "res-1", raw=True)
+
+    assert response.content == content
+    assert response.data == {"id": "res-1", "name": "Name"}
+
+
 def test_list_use_custom_endpoint(client, resource_class, requests_mock):
     requests_mock.get(
         f"{API_BASE}/my-endpoint/all/delta",
@@ -240,3 +305,24 @@ def test_raw_post_raises_on_error(client, requests_mock, error_code, exception):
 
     with raises(exception):
         client.raw_post("my-endpoint/sending", data={})
+
+
+def test_too_many_requests_error_has_retry_after(client, requests_mock):
+    requests_mock.get(
+        f"{API_BASE}/todo/lists/list-1", status_code=429, headers={"Retry-After": "7"}
+    )
+
+    with raises(TooManyRequestsError) as error:
+        client.raw_get("todo/lists/list-1")
+
+    assert error.value.retry_after == 7
+
+
+def test_with_provider_copies_client(client):
+    provider = RequestsProvider()
+
+    copied = client.with_provider(provider)
+
+    assert copied.provider is provider
+    assert client.provider is not provider
+    assert copied._url == client._url
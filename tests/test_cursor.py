@@ -0,0 +1,91 @@
+import json
+from itertools import islice
+
+import pytest
+
+from todoms.cursor import ListCursor
+from todoms.filters import eq
+from todoms.resources import TaskList
+
+from .utils.constants import API_BASE
+
+LISTS_URL = f"{API_BASE}/todo/lists"
+DELTA_URL = f"{LISTS_URL}/delta"
+DELTA_LINK = f"{DELTA_URL}?$deltatoken=final"
+
+
+@pytest.fixture
+def pages(requests_mock):
+    second_url = f"{DELTA_URL}?$skiptoken=2"
+    third_url = f"{DELTA_URL}?$skiptoken=3"
+    return [
+        requests_mock.get(
+            DELTA_URL,
+            json={
+                "value": [{"id": "list-1"}, {"id": "list-2"}],
+                "@odata.nextLink": second_url,
+            },
+        ),
+        requests_mock.get(
+            second_url,
+            json={
+                "value": [{"id": "list-3"}, {"id": "list-4"}],
+                "@odata.nextLink": third_url,
+            },
+        ),
+        requests_mock.get(
+            third_url,
+            json={"value": [{"id": "list-5"}], "@odata.deltaLink": DELTA_LINK},
+        ),
+    ]
+
+
+def test_iterate_returns_all_resources(client, pages):
+    iterator = client.iterate(TaskList)
+
+    assert [task_list.id for task_list in iterator] == [
+        "list-1",
+        "list-2",
+        "list-3",
+        "list-4",
+        "list-5",
+    ]
+    assert iterator.cursor.finished
+    assert iterator.cursor.delta_link == DELTA_LINK
+
+
+def test_iterate_resumes_from_saved_cursor(client, pages):
+    iterator = client.iterate(TaskList)
+    assert [task_list.id for task_list in islice(iterator, 3)] == [
+        "list-1",
+        "list-2",
+        "list-3",
+    ]
+    saved = json.dumps(iterator.cursor.to_dict())
+
+    cursor = ListCursor.from_dict(json.loads(saved))
+    resumed = client.iterate(TaskList, cursor=cursor)
+
+    assert [task_list.id for task_list in resumed] == ["list-4", "list-5"]
+    assert [page.call_count for page in pages] == [1, 2, 1]
+
+
+def test_cursor_moves_to_next_page_after_last_item(client, pages):
+    iterator = client.iterate(TaskList)
+    list(islice(iterator, 2))
+
+    assert iterator.cursor == ListCursor(f"{DELTA_URL}?$skiptoken=2")
+    assert pages[1].call_count == 0
+
+
+def test_iterate_stores_filters_in_cursor(client, requests_mock):
+    requests_mock.get(
+        f"{LISTS_URL}?$filter=displayName eq 'name'",
+        json={"value": [{"id": "list-1"}]},
+    )
+
+    iterator = client.iterate(TaskList, displayName=eq("name"))
+
+    assert iterator.cursor.params == {"$filter": "displayName eq 'name'"}
+    assert [task_list.id for task_list in iterator] == ["list-1"]
+    assert iterator.cursor.finished
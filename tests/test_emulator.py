@@ -0,0 +1,110 @@
+import pytest
+import requests
+
+from todoms.attributes import Status
+from todoms.client import ResponseError, ToDoClient
+from todoms.filters import contains, eq
+from todoms.resources import TaskList
+
+from .utils.emulator import Emulator
+from .utils.requests_provider import RequestsProvider
+
+
+@pytest.fixture
+def emulator():
+    with Emulator(page_size=10) as emulator:
+        yield emulator
+
+
+@pytest.fixture
+def client(emulator):
+    return ToDoClient(RequestsProvider(), api_url=emulator.url)
+
+
+@pytest.fixture
+def task_list(emulator, client):
+    list_id = emulator.populate(lists=1, tasks_per_list=25)[0]
+    return client.get(TaskList, list_id)
+
+
+def test_emulator_pages_collections(task_list, emulator):
+    tasks = list(task_list.tasks)
+
+    assert len(tasks) == 25
+    assert len({task.id for task in tasks}) == 25
+    assert emulator.request_count == 1 + 3
+
+
+def test_emulator_filters_tasks(task_list):
+    completed = list(task_list.get_tasks(status=eq(Status.COMPLETED)))
+    assert len(completed) == 8
+    assert all(task.status == Status.COMPLETED for task in completed)
+
+    assert len(list(task_list.open_tasks)) == 17
+    titles = [task.title for task in task_list.get_tasks(title=contains("Task 2"))]
+    assert titles == ["Task 21", "Task 22", "Task 24"]  # Completed are skipped
+
+
+def test_emulator_rejects_malformed_filter(task_list, client):
+    with pytest.raises(ResponseError) as error:
+        list(client.raw_pages(f"todo/lists/{task_list.id}/tasks", {"$filter": "x"}))
+    assert error.value.response.status_code == 400
+
+
+def test_emulator_serves_delta_changes(task_list, client, emulator):
+    endpoint = f"todo/lists/{task_list.id}/tasks/delta"
+    pages = list(client.raw_pages(endpoint))
+    assert sum(len(page.items) for page in pages) == 25
+
+    first, second = list(task_list.tasks)[:2]
+    first.title = "Changed"
+    first.update()
+    second.delete()
+
+    changes = list(client.raw_pages(pages[-1].delta_link))
+    assert changes[0].items == [
+        {**changes[0].items[0], "id": first.id, "title": "Changed"},
+        {"id": second.id, "@removed": {"reason": "deleted"}},
+    ]
+
+
+def test_emulator_checks_etags(task_list, client, emulator):
+    task = next(iter(task_list.tasks))
+    url = f"{emulator.url}/me/{task.managing_endpoint}"
+    etag = requests.get(url).headers["ETag"]
+
+    assert requests.patch(url, json={"title": "A"}, headers={"If-Match": etag}).ok
+    response = requests.patch(url, json={"title": "B"}, headers={"If-Match": etag})
+    assert response.status_code == 412
+
+
+def test_emulator_handles_batch(task_list, emulator):
+    requests_data = {
+        "requests": [
+            {"id": "1", "method": "GET", "url": f"/me/todo/lists/{task_list.id}"},
+            {
+                "id": "2",
+                "method": "POST",
+                "url": f"/me/todo/lists/{task_list.id}/tasks",
+                "body": {"title": "From batch"},
+            },
+            {"id": "3", "method": "GET", "url": "/me/todo/lists/missing"},
+        ]
+    }
+    response = requests.post(f"{emulator.url}/$batch", json=requests_data).json()
+
+    statuses = {item["id"]: item["status"] for item in response["responses"]}
+    assert statuses == {"1": 200, "2": 201, "3": 404}
+    assert response["responses"][1]["body"]["title"] == "From batch"
+
+
+def test_emulator_throttles_requests(task_list, client, emulator):
+    emulator.throttle(1)
+
+    with pytest.raises(ResponseError) as error:
+        client.get(TaskList, task_list.id)
+
+    assert error.value.response.status_code == 429
+    assert error.value.response.headers["Retry-After"] == "1"
+    assert client.get(TaskList, task_list.id).id == task_list.id
+    assert emulator.throttled_count == 1
@@ -0,0 +1,107 @@
+import pytest
+
+from todoms.client import ToDoClient
+from todoms.export import (
+    SUBTASK,
+    TASK,
+    TASK_LIST,
+    ColumnarWriter,
+    ExportCheckpointError,
+    Exporter,
+    NDJSONWriter,
+    read_columnar,
+    read_ndjson,
+)
+
+from .utils.emulator import Emulator
+from .utils.requests_provider import RequestsProvider
+
+
+@pytest.fixture
+def emulator():
+    with Emulator(page_size=10) as emulator:
+        list_ids = emulator.populate(lists=2, tasks_per_list=25)
+        task = emulator.add_task(list_ids[0], "With subtasks")
+        emulator.add_subtask(task["id"], "first")
+        emulator.add_subtask(task["id"], "second")
+        yield emulator
+
+
+@pytest.fixture
+def client(emulator):
+    return ToDoClient(RequestsProvider(), api_url=emulator.url)
+
+
+class CrashingWriter(NDJSONWriter):
+    def __init__(self, path, crash_after, append=False):
+        super().__init__(path, append=append)
+        self.flushes = 0
+        self.crash_after = crash_after
+
+    def flush(self):
+        super().flush()
+        self.flushes += 1
+        if self.flushes == self.crash_after:
+            raise KeyboardInterrupt
+
+
+def test_export_to_ndjson(client, tmp_path):
+    path = str(tmp_path / "export.ndjson.gz")
+    writer = NDJSONWriter(path)
+
+    stats = Exporter(client, writer).run()
+    writer.close()
+
+    records = list(read_ndjson(path))
+    assert [record["type"] for record in records].count(TASK_LIST) == 2
+    assert (stats.task_lists, stats.tasks, stats.subtasks) == (2, 51, 2)
+    subtasks = [record for record in records if record["type"] == SUBTASK]
+    task = next(r for r in records if r["data"].get("title") == "With subtasks")
+    assert {record["parentId"] for record in subtasks} == {task["data"]["id"]}
+    assert "checklistItems" not in task["data"]
+
+
+def test_export_to_columnar_files(client, tmp_path):
+    directory = str(tmp_path / "export")
+    writer = ColumnarWriter(directory, row_group_size=7)
+
+    Exporter(client, writer).run()
+    writer.close()
+
+    tasks = list(read_columnar(directory, TASK))
+    assert len(tasks) == 51
+    assert set(tasks[0]) >= {"parentId", "id", "title", "status", "dueDateTime"}
+    assert "checklistItems" not in tasks[0]
+    assert len(list(read_columnar(directory, SUBTASK))) == 2
+    assert len(list(read_columnar(directory, TASK_LIST))) == 2
+
+
+def test_export_resumes_from_checkpoint(client, emulator, tmp_path):
+    path = str(tmp_path / "export.ndjson")
+    checkpoint = str(tmp_path / "export.checkpoint")
+
+    writer = CrashingWriter(path, crash_after=4)
+    with pytest.raises(KeyboardInterrupt):
+        Exporter(client, writer, checkpoint=checkpoint).run()
+    writer.close()
+    requests_before = emulator.request_count
+
+    writer = NDJSONWriter(path, append=True)
+    Exporter(client, writer, checkpoint=checkpoint).run()
+    writer.close()
+
+    task_ids = [r["data"]["id"] for r in read_ndjson(path) if r["type"] == TASK]
+    assert len(set(task_ids)) == 51
+    # Only the page being written during the crash is exported again
+    assert len(task_ids) <= 51 + 10
+    # Lists, the page being written during the crash and pages of the other list
+    assert emulator.request_count - requests_before == 1 + 1 + 3
+    assert not (tmp_path / "export.checkpoint").exists()
+
+
+def test_export_fails_if_checkpoint_list_is_removed(client, tmp_path):
+    checkpoint = tmp_path / "export.checkpoint"
+    checkpoint.write_text('{"lists": true, "list_id": "removed", "next_link": null}')
+
+    with pytest.raises(ExportCheckpointError):
+        Exporter(client, NDJSONWriter(str(tmp_path / "out")), str(checkpoint)).run()
@@ -1,10 +1,31 @@
+import time
 from datetime import datetime
 
 import pytest
 from dateutil import tz
 
 from todoms.attributes import Importance, Status
-from todoms.filters import and_, eq, ge, gt, le, lt, ne, or_
+from todoms.filters import (
+    FilterError,
+    _build_predicate,
+    and_,
+    compile_filter,
+    contains,
+    eq,
+    ge,
+    gt,
+    in_,
+    le,
+    lt,
+    matches,
+    ne,
+    not_,
+    or_,
+    parse,
+    select,
+    startswith,
+)
+from todoms.resources import Task
 
 comparable_example_values = [
     ("value", "'value'"),
@@ -13,15 +34,18 @@ comparable_example_values = [
     (datetime(2020, 1, 1, 18, tzinfo=tz.UTC), "2020-01-01T18:00:00Z"),
     (True, "true"),
     (False, "false"),
+    ("it's", "'it''s'"),
+    (None, "null"),
+    (5, "5"),
 ]
 
 
 def test_and_args():
-    assert and_("test_1", "test_2") == "(test_1 and test_2)"
+    assert str(and_("test_1", "test_2")) == "(test_1 and test_2)"
 
 
 def test_and_kwargs():
-    assert and_(a="b", c="d") == "(a b and c d)"
+    assert str(and_(a="b", c="d")) == "(a b and c d)"
 
 
 @pytest.mark.parametrize(
@@ -39,7 +63,7 @@ def test_and_kwargs():
     ],
 )
 def test_and_(args, kwargs, expected):
-    assert and_(*args, **kwargs) == expected
+    assert str(and_(*args, **kwargs)) == expected
 
 
 @pytest.mark.parametrize(
@@ -57,34 +81,257 @@ def test_and_(args, kwargs, expected):
     ],
 )
 def test_or_(args, kwargs, expected):
-    assert or_(*args, **kwargs) == expected
+    assert str(or_(*args, **kwargs)) == expected
 
 
 @pytest.mark.parametrize("value,expected_text", comparable_example_values)
 def test_eq(value, expected_text):
-    assert eq(value) == f"eq {expected_text}"
+    assert str(eq(value)) == f"eq {expected_text}"
 
 
 @pytest.mark.parametrize("value,expected_text", comparable_example_values)
 def test_ne(value, expected_text):
-    assert ne(value) == f"ne {expected_text}"
+    assert str(ne(value)) == f"ne {expected_text}"
 
 
 @pytest.mark.parametrize("value,expected_text", comparable_example_values)
 def test_gt(value, expected_text):
-    assert gt(value) == f"gt {expected_text}"
+    assert str(gt(value)) == f"gt {expected_text}"
 
 
 @pytest.mark.parametrize("value,expected_text", comparable_example_values)
 def test_ge(value, expected_text):
-    assert ge(value) == f"ge {expected_text}"
+    assert str(ge(value)) == f"ge {expected_text}"
 
 
 @pytest.mark.parametrize("value,expected_text", comparable_example_values)
 def test_le(value, expected_text):
-    assert le(value) == f"le {expected_text}"
+    assert str(le(value)) == f"le {expected_text}"
 
 
 @pytest.mark.parametrize("value,expected_text", comparable_example_values)
 def test_lt(value, expected_text):
-    assert lt(value) == f"lt {expected_text}"
+    assert str(lt(value)) == f"lt {expected_text}"
+
+
+def test_filters_compile_to_strings():
+    expression = and_(status=eq(Status.COMPLETED), title=contains("abc"))
+    assert (
+        compile_filter(expression)
+        == "(status eq 'completed' and contains(title, 'abc'))"
+    )
+    assert str(expression) == compile_filter(expression)
+
+
+def test_equal_filters_share_compiled_string():
+    first = and_(status=ne(Status.COMPLETED), importance=eq(Importance.HIGH))
+    second = and_(status=ne(Status.COMPLETED), importance=eq(Importance.HIGH))
+
+    assert first == second
+    assert hash(first) == hash(second)
+    assert first.compile() is second.compile()
+
+
+def test_filters_are_not_equal_to_strings():
+    expression = and_(status=eq(Status.COMPLETED), title=contains("abc"))
+    compiled = "(status eq 'completed' and contains(title, 'abc'))"
+
+    assert expression != compiled
+    assert len({expression, compiled}) == 2
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [eq("x"), contains("x"), startswith("x"), in_(["x", "y"]), not_(eq("x"))],
+)
+def test_conditions_without_field_are_hashable(expression):
+    assert {expression: True}[expression]
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        lambda: and_(eq("x")),
+        lambda: or_("a eq 'b'", not_(eq("x"))),
+        lambda: compile_filter(ne(Status.COMPLETED)),
+        lambda: compile_filter(contains("x")),
+    ],
+)
+def test_conditions_without_field_are_rejected(expression):
+    with pytest.raises(FilterError):
+        expression()
+
+
+def test_filters_with_different_values_are_different():
+    assert and_(status=eq(True)) != and_(status=eq(1))
+
+
+@pytest.mark.parametrize(
+    "expression,expected",
+    [
+        (and_(title=startswith("a'b")), "startswith(title, 'a''b')"),
+        (and_(title=not_(contains("x"))), "not (contains(title, 'x'))"),
+        (not_(or_(a=eq(1), b=eq(2))), "not ((a eq 1 or b eq 2))"),
+        (
+            and_(status=in_([Status.COMPLETED, Status.DEFERRED])),
+            "status in ('completed', 'deferred')",
+        ),
+        (and_(parent=eq("x"), child="eq 'y'"), "(parent eq 'x' and child eq 'y')"),
+    ],
+)
+def test_extended_operators(expression, expected):
+    assert compile_filter(expression) == expected
+
+
+@pytest.mark.parametrize(
+    "build",
+    [
+        lambda: and_(),
+        lambda: or_(),
+        lambda: in_([]),
+        lambda: eq(1.5),
+        lambda: and_(**{"bad name": eq(1)}),
+        lambda: and_(field=and_(other=eq(1))),
+        lambda: and_(field=1),
+        lambda: compile_filter(contains("x")),
+    ],
+)
+def test_malformed_filters_raise(build):
+    with pytest.raises(FilterError):
+        build()
+
+
+@pytest.fixture
+def tasks():
+    return [
+        Task.from_dict(
+            {
+                "id": "task-1",
+                "title": "Write report",
+                "status": "completed",
+                "importance": "high",
+                "body": {"content": "text", "contentType": "text"},
+                "dueDateTime": {
+                    "dateTime": "2020-05-02T00:00:00.000000",
+                    "timeZone": "UTC",
+                },
+            }
+        ),
+        Task.from_dict(
+            {"id": "task-2", "title": "Read report", "status": "notStarted"}
+        ),
+        Task.from_dict(
+            {
+                "id": "task-3",
+                "title": "Call",
+                "importance": "low",
+                "dueDateTime": {
+                    "dateTime": "2020-06-02T00:00:00.000000",
+                    "timeZone": "UTC",
+                },
+            }
+        ),
+    ]
+
+
+@pytest.mark.parametrize(
+    "expression,expected_ids",
+    [
+        (and_(status=ne(Status.COMPLETED)), ["task-2", "task-3"]),
+        (and_(status=eq("completed")), ["task-1"]),
+        (and_(importance=in_([Importance.HIGH, Importance.LOW])), ["task-1", "task-3"]),
+        (and_(title=contains("report"), importance=eq(Importance.NORMAL)), ["task-2"]),
+        (or_(title=startswith("Call"), id=eq("task-1")), ["task-1", "task-3"]),
+        (not_(and_(title=contains("report"))), ["task-3"]),
+        (
+            and_(dueDateTime=lt(datetime(2020, 6, 1, tzinfo=tz.UTC))),
+            ["task-1"],
+        ),
+        (and_(**{"dueDateTime/dateTime": ge(datetime(2020, 6, 1))}), ["task-3"]),
+        (and_(**{"body/contentType": eq("text")}), ["task-1"]),
+        (and_(dueDateTime=eq(None)), ["task-2"]),
+    ],
+)
+def test_filters_evaluated_locally(tasks, expression, expected_ids):
+    assert [task.id for task in select(expression, tasks)] == expected_ids
+    assert [task.id for task in tasks if matches(expression, task)] == expected_ids
+
+
+def test_select_on_empty_collection():
+    assert select(and_(status=eq(Status.COMPLETED)), []) == []
+
+
+def test_datetimes_compared_locally_in_seconds_as_in_the_api(tasks):
+    _build_predicate.cache_clear()
+    later = and_(dueDateTime=le(datetime(2020, 5, 2, 0, 0, 0, 500000, tz.UTC)))
+    earlier = and_(dueDateTime=le(datetime(2020, 5, 2, 0, 0, 0, 100000, tz.UTC)))
+
+    assert later == earlier
+    assert matches(later, tasks[0]) and matches(earlier, tasks[0])
+    _build_predicate.cache_clear()
+    assert matches(earlier, tasks[0])
+    assert not matches(
+        and_(dueDateTime=lt(datetime(2020, 5, 2, 0, 0, 0, 500000))), tasks[0]
+    )
+
+
+@pytest.fixture
+def new_york_time(monkeypatch):
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_naive_datetimes_are_utc_in_api_and_locally(new_york_time, tasks):
+    expression = and_(dueDateTime=lt(datetime(2020, 5, 2, 1)))
+
+    assert compile_filter(expression) == "dueDateTime lt 2020-05-02T01:00:00Z"
+    assert matches(expression, tasks[0])
+
+
+def test_predicate_is_cached():
+    expression = and_(status=eq(Status.COMPLETED))
+    assert expression.predicate(Task) is expression.predicate(Task)
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [and_("status eq 'completed'"), and_(unknownField=eq(1)), eq(1)],
+)
+def test_filters_not_evaluable_locally_raise(tasks, expression):
+    with pytest.raises(FilterError):
+        select(expression, tasks)
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        and_(status=eq(Status.COMPLETED)),
+        and_(title=contains("it's"), importance=in_([Importance.HIGH, 1, None])),
+        or_(
+            and_(status=ne("completed"), isReminderOn=eq(True)),
+            not_(and_(title=startswith("a"))),
+        ),
+        and_(lastModifiedDateTime=ge(datetime(2022, 1, 1, tzinfo=tz.UTC))),
+    ],
+)
+def test_parse_compiled_filters(expression):
+    text = expression.compile()
+    assert parse(text).compile() == text
+
+
+def test_parsed_filter_evaluated_locally(tasks):
+    expression = parse("status eq 'completed' or contains(title, 'task-2')")
+    assert matches(expression, Task(title="task-2"))
+    assert not matches(expression, Task(title="task-1"))
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["", "status eq", "status like 'a'", "(status eq 'a'", "status eq 'a' )", "eq 1"],
+)
+def test_parse_malformed_filters_raise(text):
+    with pytest.raises(FilterError):
+        parse(text)
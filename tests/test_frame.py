@@ -0,0 +1,132 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from todoms.attributes import Importance, Status
+from todoms.frame import TaskFrame
+from todoms.resources import Task, TaskList
+
+from .utils.constants import API_BASE
+
+TASKS_URL = f"{API_BASE}/todo/lists/list-1/tasks"
+
+
+def _task(task_id, status, importance, due_day=None):
+    data = {
+        "id": task_id,
+        "title": f"Task {task_id[-1]}",
+        "status": status,
+        "importance": importance,
+        "createdDateTime": "2024-01-01T10:00:00.1234567Z",
+    }
+    if due_day:
+        data["dueDateTime"] = {
+            "dateTime": f"2024-02-{due_day:02}T00:00:00.0000000",
+            "timeZone": "UTC",
+        }
+    return data
+
+
+@pytest.fixture
+def task_list(client):
+    return TaskList.from_dict({"id": "list-1"}, client=client)
+
+
+@pytest.fixture
+def frame(task_list, requests_mock):
+    requests_mock.get(
+        f"{TASKS_URL}/delta",
+        json={
+            "value": [
+                _task("task-1", "notStarted", "high", due_day=1),
+                _task("task-2", "completed", "normal", due_day=10),
+            ],
+            "@odata.nextLink": f"{TASKS_URL}/delta?$skiptoken=2",
+        },
+    )
+    requests_mock.get(
+        f"{TASKS_URL}/delta?$skiptoken=2",
+        json={"value": [_task("task-3", "notStarted", "high")]},
+    )
+    return task_list.get_task_frame(status=None)
+
+
+def test_task_frame_is_filled_from_pages(frame):
+    assert len(frame) == 3
+    assert frame.id == ["task-1", "task-2", "task-3"]
+    assert frame.title[0] == "Task 1"
+    assert frame.status.typecode == "b"
+    assert (
+        frame.due_datetime[0] == datetime(2024, 2, 1, tzinfo=timezone.utc).timestamp()
+    )
+
+
+def test_task_frame_filters_rows(frame):
+    assert frame.where(status=Status.NOT_STARTED).id == ["task-1", "task-3"]
+    assert frame.where(
+        importance=Importance.HIGH, due_before=datetime(2024, 2, 5, tzinfo=timezone.utc)
+    ).id == ["task-1"]
+    assert frame.where(due_after=datetime(2024, 2, 1, tzinfo=timezone.utc)).id == [
+        "task-1",
+        "task-2",
+    ]
+
+
+def test_task_frame_counts_and_groups(frame):
+    assert frame.count_by("status") == {Status.NOT_STARTED: 2, Status.COMPLETED: 1}
+    groups = frame.group_by("importance")
+    assert groups[Importance.HIGH].id == ["task-1", "task-3"]
+    assert groups[Importance.NORMAL].id == ["task-2"]
+
+
+def test_task_frame_converts_rows_to_tasks(frame):
+    task = frame.where(status=Status.COMPLETED).task(0)
+
+    assert isinstance(task, Task)
+    assert task.id == "task-2"
+    assert task.status == Status.COMPLETED
+    assert task.due_datetime == datetime(2024, 2, 10, tzinfo=timezone.utc)
+    assert task.created_datetime == datetime(2024, 1, 1, 10, tzinfo=timezone.utc)
+    assert [task.id for task in frame.tasks()] == ["task-1", "task-2", "task-3"]
+
+
+def test_task_frame_rows_cant_be_saved(frame):
+    task = frame.task(0)
+    task.title = "Changed"
+
+    with pytest.raises(ValueError):
+        task.update()
+
+
+def test_task_frame_update_of_fetched_row_keeps_fields(frame, task_list, requests_mock):
+    full_task = {
+        **_task("task-1", "notStarted", "high", due_day=1),
+        "body": {"content": "Body", "contentType": "text"},
+        "categories": ["Work"],
+        "isReminderOn": True,
+        "reminderDateTime": {
+            "dateTime": "2024-01-31T09:00:00.0000000",
+            "timeZone": "UTC",
+        },
+    }
+    requests_mock.get(f"{TASKS_URL}/task-1", json=full_task)
+    patch = requests_mock.patch(f"{TASKS_URL}/task-1", json=full_task)
+
+    task = frame.fetch(0)
+    task.title = "Changed"
+    task.update()
+
+    sent = patch.last_request.json()
+    assert task.task_list is task_list
+    assert sent["title"] == "Changed"
+    assert sent["body"] == {"content": "Body", "contentType": "text"}
+    assert sent["categories"] == ["Work"]
+    assert sent["isReminderOn"] is True
+    assert sent["reminderDateTime"]["dateTime"].startswith("2024-01-31T09:00:00")
+
+
+def test_task_frame_from_dict_pages():
+    frame = TaskFrame.from_pages([{"value": [_task("task-1", "deferred", "low")]}])
+
+    assert frame.count_by("importance") == {Importance.LOW: 1}
+    assert frame.task(0).title == "Task 1"
@@ -0,0 +1,139 @@
+import sqlite3
+from contextlib import closing
+
+import pytest
+
+from todoms.client import ToDoClient
+from todoms.export import Exporter, NDJSONWriter
+from todoms.importer import AdaptiveLimiter, Importer, read_task_records
+from todoms.resources import TaskList
+
+from .test_instrumentation import RecordingHook
+from .utils.emulator import Emulator
+from .utils.requests_provider import RequestsProvider
+
+
+@pytest.fixture
+def emulator():
+    with Emulator(page_size=10, retry_after=0) as emulator:
+        yield emulator
+
+
+@pytest.fixture
+def client(emulator):
+    return ToDoClient(RequestsProvider(), api_url=emulator.url)
+
+
+@pytest.fixture
+def target(emulator, client):
+    return client.get(TaskList, emulator.add_list("Imported")["id"])
+
+
+def records(count):
+    return [{"id": f"source-{i}", "title": f"Task {i}"} for i in range(count)]
+
+
+def test_import_exported_tasks(emulator, client, target, tmp_path):
+    source = emulator.add_list("Source")
+    original = emulator.add_task(source["id"], "With subtasks", importance="high")
+    emulator.add_subtask(original["id"], "first")
+    emulator.add_subtask(original["id"], "second")
+    emulator.add_task(source["id"], "Without subtasks")
+    path = str(tmp_path / "export.ndjson")
+    writer = NDJSONWriter(path)
+    Exporter(client, writer).run()
+    writer.close()
+
+    stats = Importer(target).run(read_task_records(path))
+
+    assert (stats.created, stats.failed) == (2, 0)
+    imported = {task.title: task for task in target.tasks}
+    assert set(imported) == {"With subtasks", "Without subtasks"}
+    copied = client.get(TaskList, target.id)
+    task = next(t for t in copied.tasks if t.title == "With subtasks")
+    task.refresh()
+    assert task.id != original["id"]
+    assert task.importance.value == "high"
+    assert [subtask.name for subtask in task.subtasks] == ["first", "second"]
+
+
+def test_import_retries_throttled_requests(emulator, target):
+    emulator.throttle_every = 3
+
+    stats = Importer(target, concurrency=4, max_retries=20).run(records(20))
+
+    emulator.throttle_every = None
+    assert (stats.created, stats.failed) == (20, 0)
+    assert stats.throttled == emulator.throttled_count > 0
+    assert len(list(target.tasks)) == 20
+
+
+def test_import_retries_are_reported_to_hooks(emulator, client, target):
+    hook = RecordingHook()
+    client.add_hook(hook)
+    emulator.throttle(2)
+
+    stats = Importer(target, concurrency=1).run(records(1))
+
+    assert (stats.created, stats.throttled) == (1, 2)
+    assert [(info.retry, info.status) for info in hook.after] == [
+        (0, 429),
+        (1, 429),
+        (2, 201),
+    ]
+
+
+def test_import_skips_journaled_records(target, tmp_path):
+    journal = str(tmp_path / "import.journal")
+    importer = Importer(target, journal=journal)
+    importer.run(records(5))
+    importer.close()
+
+    importer = Importer(target, journal=journal)
+    stats = importer.run(records(8))
+    importer.close()
+
+    assert (stats.created, stats.skipped) == (3, 5)
+    assert len(list(target.tasks)) == 8
+    with closing(sqlite3.connect(journal)) as db:
+        assert db.execute("SELECT COUNT(*) FROM imported").fetchone() == (8,)
+
+
+def test_import_counts_throttling_which_exhausted_retries(emulator, target):
+    emulator.throttle(2)
+
+    stats = Importer(target, concurrency=1, max_retries=1).run(records(1))
+
+    assert (stats.created, stats.failed, stats.throttled) == (0, 1, 2)
+    assert stats.throttled == emulator.throttled_count
+
+
+def test_import_keeps_limited_number_of_errors(emulator, target):
+    emulator.throttle(10)
+
+    stats = Importer(target, concurrency=1, max_retries=0, max_errors=3).run(
+        records(10)
+    )
+
+    assert stats.failed == 10
+    assert len(stats.errors) == 3
+
+
+def test_read_task_records_accepts_plain_tasks(tmp_path):
+    path = tmp_path / "tasks.ndjson"
+    path.write_text('{"title": "first"}\n\n{"title": "second"}\n')
+
+    assert [r["title"] for r in read_task_records(str(path))] == ["first", "second"]
+
+
+def test_adaptive_limiter_decreases_and_recovers():
+    limiter = AdaptiveLimiter(8)
+
+    limiter.acquire()
+    limiter.release(throttled_for=0)
+    assert limiter.limit == 4
+
+    for _ in range(10):
+        limiter.acquire()
+        limiter.release()
+    assert 4 < limiter.limit <= 8
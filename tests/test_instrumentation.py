@@ -0,0 +1,163 @@
+import json
+
+import pytest
+import requests
+
+from todoms.instrumentation import (
+    Histogram,
+    MetricsHook,
+    RequestHook,
+    RequestInfo,
+    endpoint_template,
+)
+from todoms.resources import Task, TaskList
+
+from .utils.constants import API_BASE
+
+LISTS_URL = f"{API_BASE}/todo/lists"
+
+
+class RecordingHook(RequestHook):
+    def __init__(self):
+        self.before = []
+        self.after = []
+
+    def before_request(self, info):
+        self.before.append((info.method, info.endpoint, info.status))
+
+    def after_request(self, info):
+        self.after.append(info)
+
+
+@pytest.fixture
+def hook(client):
+    hook = RecordingHook()
+    client.add_hook(hook)
+    return hook
+
+
+@pytest.mark.parametrize(
+    "path, template",
+    [
+        ("todo/lists", "todo/lists"),
+        ("todo/lists/delta", "todo/lists/delta"),
+        ("todo/lists/AAM-1=/tasks/delta", "todo/lists/{id}/tasks/delta"),
+        (
+            "/todo/lists/a/tasks/b/checklistItems/c",
+            "todo/lists/{id}/tasks/{id}/checklistItems/{id}",
+        ),
+    ],
+)
+def test_endpoint_template(path, template):
+    assert endpoint_template(path) == template
+
+
+def test_hooks_get_request_details(client, hook, requests_mock):
+    next_link = f"{LISTS_URL}/list-1/tasks/delta?$skiptoken=2"
+    first_page = {"value": [{"id": "task-1"}], "@odata.nextLink": next_link}
+    requests_mock.get(f"{LISTS_URL}/list-1/tasks/delta", json=first_page)
+    requests_mock.get(next_link, json={"value": []})
+    requests_mock.patch(f"{LISTS_URL}/list-1/tasks/task-1", json={"id": "task-1"})
+
+    task_list = TaskList.from_dict({"id": "list-1"}, client=client)
+    task = list(task_list.tasks)[0]
+    task.update()
+
+    assert hook.before == [
+        ("GET", "todo/lists/{id}/tasks/delta", None),
+        ("GET", "todo/lists/{id}/tasks/delta", None),
+        ("PATCH", "todo/lists/{id}/tasks/{id}", None),
+    ]
+    first, second, patch = hook.after
+    assert (first.page, second.page, patch.page) == (1, 2, None)
+    assert first.status == 200
+    assert first.bytes_in == len(json.dumps(first_page))
+    assert patch.bytes_out == len(requests_mock.last_request.body)
+    assert all(info.latency >= 0 for info in hook.after)
+
+
+def test_hooks_get_errors(client, hook, requests_mock):
+    requests_mock.get(f"{LISTS_URL}/list-1", exc=requests.ConnectionError)
+
+    with pytest.raises(requests.ConnectionError):
+        client.get(TaskList, "list-1")
+
+    assert isinstance(hook.after[0].error, requests.ConnectionError)
+    assert hook.after[0].status is None
+
+
+def test_hooks_get_retries_of_throttled_requests(client, requests_mock):
+    requests_mock.get(
+        f"{LISTS_URL}/list-1",
+        [{"status_code": 429}, {"status_code": 429}, {"json": {"id": "list-1"}}],
+    )
+    hook = RecordingHook()
+    retrying = client.with_provider(client.provider, max_retries=2)
+    retrying.add_hook(hook)
+
+    retrying.get(TaskList, "list-1")
+
+    assert [(info.retry, info.status) for info in hook.after] == [
+        (0, 429),
+        (1, 429),
+        (2, 200),
+    ]
+
+
+def test_removed_hook_not_called(client, hook, requests_mock):
+    requests_mock.get(f"{LISTS_URL}/list-1", json={"id": "list-1"})
+    client.remove_hook(hook)
+
+    client.get(TaskList, "list-1")
+
+    assert hook.after == []
+
+
+def test_histogram_quantile():
+    histogram = Histogram(buckets=(0.1, 0.2, 0.4))
+    for value in (0.05, 0.15, 0.15, 0.3, 1.0):
+        histogram.observe(value)
+
+    assert histogram.counts == [1, 2, 1, 1]
+    assert histogram.quantile(0.5) == pytest.approx(0.175)
+    assert histogram.quantile(0.99) == 0.4
+    assert Histogram().quantile(0.5) is None
+
+
+def test_metrics_hook_collects_and_exports(client, requests_mock):
+    metrics = MetricsHook(buckets=(0.5, 1.0))
+    client.add_hook(metrics)
+    requests_mock.get(f"{LISTS_URL}/list-1", json={"id": "list-1"})
+    requests_mock.get(f"{LISTS_URL}/list-2", status_code=404)
+    requests_mock.delete(f"{LISTS_URL}/list-1/tasks/task-1", status_code=204)
+
+    client.get(TaskList, "list-1")
+    with pytest.raises(Exception):
+        client.get(TaskList, "list-2")
+    task = Task.from_dict({"id": "task-1"}, client=client)
+    task.task_list = TaskList.from_dict({"id": "list-1"}, client=client)
+    task.delete()
+
+    assert metrics.requests == {
+        ("GET", "todo/lists/{id}", "200"): 1,
+        ("GET", "todo/lists/{id}", "404"): 1,
+        ("DELETE", "todo/lists/{id}/tasks/{id}", "204"): 1,
+    }
+    assert metrics.quantile("GET", "todo/lists/{id}", 0.5) <= 0.5
+    exported = metrics.to_prometheus()
+    assert (
+        'todoms_requests_total{method="GET",endpoint="todo/lists/{id}",status="404"} 1'
+        in exported
+    )
+    assert (
+        'todoms_request_duration_seconds_bucket{method="GET",'
+        'endpoint="todo/lists/{id}",le="+Inf"} 2' in exported
+    )
+    assert (
+        'todoms_bytes_in_total{method="GET",endpoint="todo/lists/{id}"} 16' in exported
+    )
+
+
+def test_request_info_defaults():
+    info = RequestInfo("GET", "https://api.url", "todo/lists")
+    assert (info.page, info.retry, info.bytes_out, info.status) == (None, 0, 0, None)
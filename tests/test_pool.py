@@ -0,0 +1,168 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pytest
+from requests_mock import ANY
+
+from todoms import pool
+from todoms.pool import ClientPool, ProviderPool, RateLimiter
+from todoms.resources import TaskList
+
+from .utils.constants import API_URL
+from .utils.requests_provider import RequestsProvider
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    clock = {"now": 100.0}
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        clock["now"] += seconds
+
+    monkeypatch.setattr(pool.time, "monotonic", lambda: clock["now"])
+    monkeypatch.setattr(pool.time, "sleep", sleep)
+    return sleeps
+
+
+def test_rate_limiter_allows_burst_then_waits(sleeps):
+    limiter = RateLimiter(rate=2, burst=3)
+
+    for _ in range(5):
+        limiter.acquire()
+
+    assert sleeps == [0.5, 0.5]
+
+
+def test_rate_limiter_rejects_wrong_rate():
+    with pytest.raises(ValueError):
+        RateLimiter(rate=0)
+
+
+def test_provider_pool_evicts_least_recently_used():
+    providers = {}
+
+    def factory(tenant):
+        providers[tenant] = MagicMock()
+        return providers[tenant]
+
+    provider_pool = ProviderPool(factory, max_size=2)
+    provider_pool.get("a")
+    provider_pool.get("b")
+    assert provider_pool.get("a") is providers["a"]
+    provider_pool.get("c")
+
+    assert "b" not in provider_pool
+    assert len(provider_pool) == 2
+    providers["b"].close.assert_called_once_with()
+    providers["a"].close.assert_not_called()
+
+
+def test_client_pool_uses_user_prefix_and_shared_provider(requests_mock):
+    provider = RequestsProvider()
+    client_pool = ClientPool(provider, api_url=API_URL)
+    requests_mock.get(
+        f"{API_URL}/users/user-1/todo/lists/list-1", json={"id": "list-1"}
+    )
+
+    client = client_pool.client("user-1")
+
+    assert client._provider is provider
+    assert client.get(TaskList, "list-1").id == "list-1"
+
+
+def test_client_pool_uses_provider_of_user():
+    provider_pool = ProviderPool(lambda tenant: MagicMock(name=tenant))
+    client_pool = ClientPool(provider_pool)
+
+    assert client_pool.client("a")._provider is provider_pool.get("a")
+    assert client_pool.client("b")._provider is not provider_pool.get("a")
+
+
+def test_client_pool_limits_rate_per_user(sleeps, requests_mock):
+    requests_mock.get(f"{API_URL}/users/a/todo/lists/1", json={"id": "1"})
+    requests_mock.get(f"{API_URL}/users/b/todo/lists/1", json={"id": "1"})
+    client_pool = ClientPool(RequestsProvider(), api_url=API_URL, rate=1)
+
+    client_pool.client("a").get(TaskList, "1")
+    client_pool.client("b").get(TaskList, "1")
+    assert sleeps == []
+
+    client_pool.client("a").get(TaskList, "1")
+    assert sleeps == [1.0]
+
+
+def test_provider_pool_creates_providers_outside_the_lock():
+    started, release = threading.Event(), threading.Event()
+
+    def factory(tenant):
+        if tenant == "slow":
+            started.set()
+            release.wait(timeout=5)
+        return MagicMock(name=tenant)
+
+    provider_pool = ProviderPool(factory)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        slow = executor.submit(provider_pool.get, "slow")
+        assert started.wait(timeout=5)
+        same = executor.submit(provider_pool.get, "slow")
+        fast = executor.submit(provider_pool.get, "fast")
+
+        assert fast.result(timeout=1)
+        release.set()
+
+    assert slow.result() is same.result()
+    assert len(provider_pool) == 2
+
+
+def test_provider_pool_creates_provider_once_also_after_failure():
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def factory(tenant):
+        calls.append(tenant)
+        started.set()
+        release.wait(timeout=5)
+        if len(calls) == 1:
+            raise ConnectionError("Token not granted")
+        return MagicMock(name=tenant)
+
+    provider_pool = ProviderPool(factory)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        first = executor.submit(provider_pool.get, "tenant")
+        assert started.wait(timeout=5)
+        waiting = [executor.submit(provider_pool.get, "tenant") for _ in range(3)]
+        while not all(future.running() for future in waiting):
+            time.sleep(0.001)
+        time.sleep(0.05)  # Let them reach the creation in progress
+        release.set()
+
+        for future in [first, *waiting]:
+            with pytest.raises(ConnectionError):
+                future.result(timeout=5)
+        assert calls == ["tenant"]
+
+        providers = [executor.submit(provider_pool.get, "tenant") for _ in range(4)]
+        results = {id(future.result(timeout=5)) for future in providers}
+
+    assert calls == ["tenant", "tenant"]
+    assert len(results) == 1
+    assert len(provider_pool) == 1
+
+
+def test_client_pool_keeps_limiters_of_limited_users(sleeps, requests_mock):
+    requests_mock.get(ANY, json={"id": "1"})
+    client_pool = ClientPool(RequestsProvider(), api_url=API_URL, rate=1, max_users=1)
+
+    client_pool.client("a").get(TaskList, "1")
+    client_pool.client("b").get(TaskList, "1")
+    client_pool.client("a").get(TaskList, "1")
+    assert sleeps == [1.0]
+
+    sleeps.clear()
+    client_pool.client("c").get(TaskList, "1")
+    client_pool.client("a").get(TaskList, "1")
+    assert sleeps == [1.0]
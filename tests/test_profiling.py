@@ -0,0 +1,67 @@
+import pytest
+
+from todoms.convertable import BaseConvertableFieldsObject
+from todoms.fields import Field
+from todoms.profiling import DECODE, ENCODE, ConversionProfiler
+from todoms.resources import Task
+
+from .test_resource import TASK_EXAMPLE_DATA
+
+
+def _entry(profiler, resource, field, direction):
+    return next(
+        entry
+        for entry in profiler.report(direction)
+        if entry.resource == resource and entry.field == field
+    )
+
+
+def test_profiler_measures_fields_and_resources(client):
+    with ConversionProfiler() as profiler:
+        task = Task.from_dict(TASK_EXAMPLE_DATA, client=client)
+        task.to_dict()
+        task.to_dict()
+
+    due = _entry(profiler, "Task", "due_datetime", DECODE)
+    assert due.calls == 1
+    assert due.converter == "DatetimeConverter"
+    assert due.total_time > 0
+    assert _entry(profiler, "Task", "due_datetime", ENCODE).calls == 2
+    assert _entry(profiler, "Task", None, DECODE).calls == 1
+    assert _entry(profiler, "Subtask", "name", DECODE).calls == 1
+
+    subtasks = _entry(profiler, "Task", "subtasks", DECODE)
+    subtask = _entry(profiler, "Subtask", None, DECODE)
+    assert subtasks.total_time >= subtask.total_time
+    assert "due_datetime" in profiler.format_report(limit=None)
+
+
+def test_profiler_restores_methods_when_disabled():
+    originals = (Field.from_dict, Field.to_dict, BaseConvertableFieldsObject.to_dict)
+    profiler = ConversionProfiler()
+
+    profiler.enable()
+    assert Field.from_dict is not originals[0]
+    profiler.disable()
+
+    assert (
+        Field.from_dict,
+        Field.to_dict,
+        BaseConvertableFieldsObject.to_dict,
+    ) == originals
+    Task.from_dict({"title": "Task"})
+    assert profiler.report() == []
+
+
+def test_only_one_profiler_enabled():
+    with ConversionProfiler():
+        with pytest.raises(RuntimeError):
+            ConversionProfiler().enable()
+
+
+def test_profiler_reset(client):
+    with ConversionProfiler() as profiler:
+        Task.from_dict({"title": "Task"}, client=client)
+        profiler.reset()
+
+    assert profiler.report() == []
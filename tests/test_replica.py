@@ -0,0 +1,184 @@
+from datetime import datetime
+
+import pytest
+from dateutil import tz
+
+from todoms.attributes import Status
+from todoms.replica import Replica, ReplicaSyncError
+from todoms.resources import Task
+
+from .utils.constants import API_BASE
+
+LISTS_URL = f"{API_BASE}/todo/lists"
+TASKS_URL = f"{LISTS_URL}/list-1/tasks"
+
+
+def _task_data(task_id, status="notStarted", due=None):
+    data = {"id": task_id, "title": f"Title {task_id}", "status": status}
+    if due:
+        data["dueDateTime"] = {"dateTime": due, "timeZone": "UTC"}
+    return data
+
+
+@pytest.fixture
+def synced_replica(client, requests_mock, tmp_path):
+    requests_mock.get(
+        f"{LISTS_URL}/delta",
+        json={
+            "value": [{"id": "list-1", "displayName": "List"}],
+            "@odata.deltaLink": "https://delta/lists/1",
+        },
+    )
+    requests_mock.get(
+        f"{TASKS_URL}/delta",
+        json={
+            "value": [
+                _task_data("task-1", due="2022-01-02T00:00:00.000000"),
+                _task_data("task-2", status="completed"),
+            ],
+            "@odata.nextLink": "https://next/tasks/2",
+        },
+    )
+    requests_mock.get(
+        "https://next/tasks/2",
+        json={
+            "value": [_task_data("task-3", due="2022-01-01T00:00:00.000000")],
+            "@odata.deltaLink": "https://delta/tasks/1",
+        },
+    )
+    for task_id in ("task-1", "task-2", "task-3"):
+        subtasks = [{"id": f"sub-{task_id}", "displayName": "Sub"}]
+        requests_mock.get(
+            f"{TASKS_URL}/{task_id}/checklistItems", json={"value": subtasks}
+        )
+
+    replica = Replica(client, str(tmp_path / "replica.db"))
+    replica.sync()
+    return replica
+
+
+def _ids(resources):
+    return [resource.id for resource in resources]
+
+
+def test_replica_serves_synced_resources(synced_replica):
+    assert _ids(synced_replica.task_lists()) == ["list-1"]
+    assert synced_replica.get_task_list("list-1").name == "List"
+    assert _ids(synced_replica.tasks()) == ["task-3", "task-1", "task-2"]
+
+    task = synced_replica.get_task("task-1")
+    assert task.title == "Title task-1"
+    assert task.task_list.id == "list-1"
+    assert _ids(task.subtasks) == ["sub-task-1"]
+    assert synced_replica.subtasks(task)[0].task.id == "task-1"
+
+
+def test_replica_filters_by_indexed_columns(synced_replica):
+    assert _ids(synced_replica.tasks(status=Status.COMPLETED)) == ["task-2"]
+    assert _ids(
+        synced_replica.tasks(
+            task_list="list-1", due_before=datetime(2022, 1, 2, tzinfo=tz.UTC)
+        )
+    ) == ["task-3"]
+    assert _ids(synced_replica.tasks(due_after=datetime(2022, 1, 2))) == ["task-1"]
+    assert synced_replica.tasks(task_list="other") == []
+
+
+def test_replica_is_persistent(synced_replica, client, tmp_path):
+    synced_replica.close()
+    replica = Replica(client, str(tmp_path / "replica.db"))
+    assert _ids(replica.tasks(status=Status.COMPLETED)) == ["task-2"]
+
+
+def test_replica_sync_uses_delta_links(synced_replica, requests_mock):
+    requests_mock.get(
+        "https://delta/lists/1",
+        json={"value": [], "@odata.deltaLink": "https://delta/lists/2"},
+    )
+    requests_mock.get(
+        "https://delta/tasks/1",
+        json={
+            "value": [
+                {"id": "task-2", "@removed": {"reason": "deleted"}},
+                _task_data("task-1", status="completed"),
+            ],
+            "@odata.deltaLink": "https://delta/tasks/2",
+        },
+    )
+    requests_mock.reset_mock()
+
+    synced_replica.sync()
+
+    assert _ids(synced_replica.tasks(status=Status.COMPLETED)) == ["task-1"]
+    assert synced_replica.get_task("task-2") is None
+    assert synced_replica.subtasks("task-2") == []
+    requested = [request.url for request in requests_mock.request_history]
+    assert requested == [
+        "https://delta/lists/1",
+        "https://delta/tasks/1",
+        f"{TASKS_URL}/task-1/checklistItems",
+    ]
+
+
+def test_replica_removes_deleted_list_with_tasks(synced_replica, requests_mock):
+    requests_mock.get(
+        "https://delta/lists/1",
+        json={
+            "value": [{"id": "list-1", "@removed": {"reason": "deleted"}}],
+            "@odata.deltaLink": "https://delta/lists/2",
+        },
+    )
+
+    synced_replica.sync()
+
+    assert synced_replica.task_lists() == []
+    assert synced_replica.tasks() == []
+    assert synced_replica.subtasks("task-1") == []
+
+
+def test_replica_queues_changes_until_push(synced_replica, requests_mock):
+    task = synced_replica.get_task("task-1")
+    task.status = Status.COMPLETED
+    synced_replica.save(task)
+
+    assert "task-1" in _ids(synced_replica.tasks(status=Status.COMPLETED))
+    assert synced_replica.pending == 1
+
+    requests_mock.patch(
+        f"{TASKS_URL}/task-1",
+        json=_task_data("task-1", status="completed"),
+        additional_matcher=lambda request: request.json()["status"] == "completed",
+    )
+    synced_replica.push()
+
+    assert synced_replica.pending == 0
+
+
+def test_replica_pushes_created_and_deleted(synced_replica, requests_mock):
+    task_list = synced_replica.get_task_list("list-1")
+    synced_replica.save(Task(title="New", task_list=task_list))
+    synced_replica.delete(synced_replica.get_task("task-2"))
+    assert synced_replica.get_task("task-2") is None
+
+    requests_mock.post(
+        TASKS_URL,
+        json=_task_data("task-new"),
+        status_code=201,
+        additional_matcher=lambda request: request.json()["title"] == "New",
+    )
+    requests_mock.delete(f"{TASKS_URL}/task-2", status_code=204)
+    synced_replica.push()
+
+    assert synced_replica.pending == 0
+    assert synced_replica.get_task("task-new").title == "Title task-new"
+
+
+def test_replica_keeps_failed_changes(synced_replica, requests_mock):
+    synced_replica.delete(synced_replica.get_task("task-2"))
+    synced_replica.delete(synced_replica.get_task("task-3"))
+    requests_mock.delete(f"{TASKS_URL}/task-2", status_code=500)
+
+    with pytest.raises(ReplicaSyncError):
+        synced_replica.push()
+
+    assert synced_replica.pending == 2
@@ -0,0 +1,152 @@
+from datetime import datetime, timedelta
+
+import pytest
+from dateutil import tz
+
+from todoms.attributes import Importance, Status
+from todoms.filters import and_, contains
+from todoms.resources import Subtask, Task, TaskList
+from todoms.store import TaskStore
+
+from .utils.constants import API_BASE
+
+NOW = datetime(2022, 12, 1, 12, tzinfo=tz.UTC)
+
+
+def _task(task_id, task_list, due_in_days=None, **kwargs):
+    task = Task(_id=task_id, task_list=task_list, client=task_list._client, **kwargs)
+    if due_in_days is not None:
+        task.due_datetime = NOW + timedelta(days=due_in_days)
+    return task
+
+
+@pytest.fixture
+def task_lists(client):
+    return [
+        TaskList.from_dict({"id": "list-1", "displayName": "List 1"}, client=client),
+        TaskList.from_dict({"id": "list-2", "displayName": "List 2"}, client=client),
+    ]
+
+
+@pytest.fixture
+def store(task_lists):
+    list_1, list_2 = task_lists
+    return TaskStore(
+        [
+            list_1,
+            list_2,
+            _task("task-1", list_1, -2, importance=Importance.HIGH, title="Report"),
+            _task("task-2", list_1, -1, status=Status.COMPLETED),
+            _task("task-3", list_2, -3, importance=Importance.HIGH, title="Call"),
+            _task("task-4", list_2, 2, importance=Importance.HIGH),
+            _task("task-5", list_2, categories=["work", "home"]),
+        ]
+    )
+
+
+def _ids(resources):
+    return [resource.id for resource in resources]
+
+
+def test_store_finds_by_hash_indexes(store, task_lists):
+    assert sorted(_ids(store.find(importance=Importance.HIGH))) == [
+        "task-1",
+        "task-3",
+        "task-4",
+    ]
+    assert _ids(store.find(status=Status.COMPLETED)) == ["task-2"]
+    assert _ids(store.find(category="home")) == ["task-5"]
+    assert sorted(_ids(store.find(task_list=task_lists[0]))) == ["task-1", "task-2"]
+    assert _ids(store.find(importance=Importance.HIGH, task_list="list-1")) == [
+        "task-1"
+    ]
+    assert len(store.find()) == 5
+
+
+def test_store_find_evaluates_expression(store):
+    found = store.find(and_(title=contains("Rep")), importance=Importance.HIGH)
+    assert _ids(found) == ["task-1"]
+
+
+def test_store_overdue_sorted_by_due_date(store, task_lists):
+    assert _ids(store.overdue(NOW)) == ["task-3", "task-1"]
+    assert _ids(store.overdue(NOW, task_list="list-2")) == ["task-3"]
+    assert _ids(store.overdue(NOW, task_list=task_lists[1])) == ["task-3"]
+
+
+def test_store_between_dates(store, task_lists):
+    found = store.between("due_datetime", NOW - timedelta(days=2), NOW + timedelta(3))
+    assert _ids(found) == ["task-1", "task-2", "task-4"]
+    found = store.between("due_datetime", task_list=task_lists[0])
+    assert _ids(found) == ["task-1", "task-2"]
+
+
+def test_store_between_raises_on_not_indexed_attribute(store):
+    with pytest.raises(ValueError):
+        store.between("title")
+
+
+def test_store_reindexes_updated_task(store):
+    task = store.get("task-1")
+    task.importance = Importance.LOW
+    task.due_datetime = NOW + timedelta(days=10)
+    store.add(task)
+
+    assert "task-1" not in _ids(store.find(importance=Importance.HIGH))
+    assert _ids(store.overdue(NOW)) == ["task-3"]
+
+
+def test_store_removing_list_removes_its_tasks(store):
+    store.remove("list-2")
+
+    assert "list-2" not in store
+    assert sorted(_ids(store.tasks)) == ["task-1", "task-2"]
+    assert store.find(category="work") == []
+
+
+def test_store_keeps_subtasks(store, task_lists):
+    task = _task("task-6", task_lists[0])
+    task.add_subtask(Subtask(_id="sub-1", name="Sub"))
+    store.add(task)
+    assert "sub-1" in store
+
+    store.remove(task)
+    assert "sub-1" not in store
+
+
+def test_store_requires_id():
+    with pytest.raises(ValueError):
+        TaskStore([Task(title="no id")])
+
+
+def test_store_follows_client_changes(store, client, task_lists, requests_mock):
+    store.attach(client)
+    requests_mock.post(
+        f"{API_BASE}/todo/lists/list-1/tasks",
+        json={"id": "task-new", "importance": "high"},
+        status_code=201,
+    )
+    requests_mock.patch(
+        f"{API_BASE}/todo/lists/list-1/tasks/task-1",
+        json={"id": "task-1", "importance": "low"},
+    )
+    requests_mock.delete(f"{API_BASE}/todo/lists/list-2/tasks/task-3", status_code=204)
+
+    task_lists[0].save_task(Task(title="New", client=client))
+    store.get("task-1").update()
+    store.get("task-3").delete()
+
+    assert sorted(_ids(store.find(importance=Importance.HIGH))) == [
+        "task-4",
+        "task-new",
+    ]
+
+
+def test_store_detached_from_client(store, client, requests_mock):
+    requests_mock.delete(f"{API_BASE}/todo/lists/list-2/tasks/task-4", status_code=204)
+    store.attach(client)
+    store.detach(client)
+
+    store.get("task-4").delete()
+
+    assert "task-4" in store
@@ -0,0 +1,166 @@
+from contextlib import contextmanager
+
+import pytest
+
+from todoms.client import ResourceNotFoundError, ToDoClient
+from todoms.resources import Subtask, Task, TaskList
+from todoms.tracing import NOOP_TRACER, OpenTelemetryTracer, Span, Tracer
+
+from .utils.constants import API_BASE, API_PREFIX, API_URL
+from .utils.requests_provider import RequestsProvider
+
+LISTS_URL = f"{API_BASE}/todo/lists"
+TASKS_URL = f"{LISTS_URL}/list-1/tasks"
+
+
+class RecordedSpan(Span):
+    def __init__(self, name, attributes, parent):
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.parent = parent
+        self.exceptions = []
+        self.ended = False
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def record_exception(self, exception):
+        self.exceptions.append(exception)
+
+    def end(self):
+        self.ended = True
+
+
+class RecordingTracer(Tracer):
+    enabled = True
+
+    def __init__(self):
+        self.spans = []
+        self._active = [None]
+
+    def start_span(self, name, attributes=None):
+        span = RecordedSpan(name, attributes, self._active[-1])
+        self.spans.append(span)
+        return span
+
+    @contextmanager
+    def activate(self, span):
+        self._active.append(span)
+        try:
+            yield
+        finally:
+            self._active.pop()
+
+    def tree(self, span=None):
+        return [
+            (child.name, self.tree(child))
+            for child in self.spans
+            if child.parent is span
+        ]
+
+
+@pytest.fixture
+def tracer():
+    return RecordingTracer()
+
+
+@pytest.fixture
+def traced_client(tracer):
+    return ToDoClient(
+        RequestsProvider(), api_url=API_URL, api_prefix=API_PREFIX, tracer=tracer
+    )
+
+
+def test_client_uses_noop_tracer_by_default(client):
+    assert client.tracer is NOOP_TRACER
+    assert client.tracer.enabled is False
+
+
+def test_task_create_groups_subtask_requests(traced_client, tracer, requests_mock):
+    requests_mock.post(TASKS_URL, json={"id": "task-1"}, status_code=201)
+    requests_mock.post(
+        f"{TASKS_URL}/task-1/checklistItems",
+        json={"id": "subtask-1"},
+        status_code=201,
+    )
+    task_list = TaskList.from_dict({"id": "list-1"}, client=traced_client)
+    task = Task(title="Task", task_list=task_list, client=traced_client)
+    task.subtasks = [Subtask(name="Subtask")]
+
+    task.create()
+
+    assert tracer.tree() == [
+        (
+            "todoms.Task.create",
+            [
+                ("HTTP POST", []),
+                ("todoms.Subtask.create", [("HTTP POST", [])]),
+            ],
+        )
+    ]
+    parent = tracer.spans[0]
+    assert parent.attributes == {
+        "todoms.operation": "create",
+        "todoms.resource.id": "task-1",
+        "todoms.task_list.id": "list-1",
+        "todoms.subtasks": 1,
+    }
+    request = tracer.spans[1]
+    assert request.attributes["todoms.endpoint"] == "todo/lists/{id}/tasks"
+    assert request.attributes["http.status_code"] == 201
+    assert tracer.spans[2].attributes["todoms.resource.id"] == "subtask-1"
+    assert all(span.ended for span in tracer.spans)
+
+
+def test_list_has_span_per_page(traced_client, tracer, requests_mock):
+    next_link = f"{TASKS_URL}/delta?$skiptoken=2"
+    requests_mock.get(
+        f"{TASKS_URL}/delta",
+        json={"value": [{"id": "task-1"}], "@odata.nextLink": next_link},
+    )
+    requests_mock.get(next_link, json={"value": [{"id": "task-2"}]})
+    task_list = TaskList.from_dict({"id": "list-1"}, client=traced_client)
+
+    tasks = task_list.tasks
+    assert next(iter(tasks)).id == "task-1"
+    assert tracer._active == [None]
+    list(tasks)
+
+    assert tracer.tree() == [
+        ("todoms.Task.list", [("HTTP GET", []), ("HTTP GET", [])]),
+    ]
+    list_span, first, second = tracer.spans
+    assert list_span.attributes["todoms.pages"] == 2
+    assert list_span.attributes["todoms.items"] == 2
+    assert (first.attributes["todoms.page"], second.attributes["todoms.page"]) == (
+        1,
+        2,
+    )
+    assert list_span.ended
+
+
+def test_failed_operation_records_exception(traced_client, tracer, requests_mock):
+    requests_mock.get(f"{LISTS_URL}/list-1", status_code=404)
+    task_list = TaskList.from_dict({"id": "list-1"}, client=traced_client)
+
+    with pytest.raises(ResourceNotFoundError):
+        task_list.refresh()
+
+    assert tracer.tree() == [("todoms.TaskList.refresh", [("HTTP GET", [])])]
+    assert isinstance(tracer.spans[0].exceptions[0], ResourceNotFoundError)
+    assert tracer.spans[1].attributes["http.status_code"] == 404
+
+
+def test_noop_tracer_span():
+    with NOOP_TRACER.span("name", {"key": "value"}) as span:
+        span.set_attribute("other", 1)
+
+
+def test_opentelemetry_tracer_requires_package():
+    try:
+        import opentelemetry  # noqa: F401
+    except ImportError:
+        with pytest.raises(ImportError, match="opentelemetry-api"):
+            OpenTelemetryTracer()
+    else:
+        assert OpenTelemetryTracer().enabled
@@ -0,0 +1,229 @@
+import json
+import threading
+
+import pytest
+
+from todoms.attributes import Status
+from todoms.client import ResponseError
+from todoms.converters.interning import shared_values
+from todoms.resources import Task, TaskList
+from todoms.writebehind import WriteBehindClosedError, WriteBehindQueue
+
+from .utils.constants import API_BASE
+
+TASKS_URL = f"{API_BASE}/todo/lists/list-1/tasks"
+
+
+@pytest.fixture
+def task_list(client):
+    return TaskList.from_dict({"id": "list-1"}, client=client)
+
+
+def _task(task_list, task_id):
+    return Task.from_dict({"id": task_id, "title": task_id}, client=task_list.client)
+
+
+@pytest.fixture
+def task(task_list):
+    task = _task(task_list, "task-1")
+    task.task_list = task_list
+    return task
+
+
+def test_updates_of_same_resource_are_coalesced(client, task, requests_mock):
+    requests_mock.patch(
+        f"{TASKS_URL}/task-1",
+        json={"id": "task-1", "title": "from-server", "status": "completed"},
+    )
+
+    with WriteBehindQueue(client, flush_interval=60) as queue:
+        futures = []
+        for status in (Status.IN_PROGRESS, Status.WAITING_ON_OTHERS, Status.COMPLETED):
+            task.status = status
+            futures.append(queue.update(task))
+        assert queue.pending == 1
+
+    assert requests_mock.call_count == 1
+    assert requests_mock.last_request.json()["status"] == "completed"
+    assert all(future.done() and future.exception() is None for future in futures)
+    assert task.title == "from-server"
+
+
+def test_queue_flushed_when_size_reached(client, task_list, requests_mock):
+    requests_mock.patch(f"{TASKS_URL}/task-1", json={"id": "task-1"})
+    requests_mock.patch(f"{TASKS_URL}/task-2", json={"id": "task-2"})
+    tasks = [_task(task_list, "task-1"), _task(task_list, "task-2")]
+    for task in tasks:
+        task.task_list = task_list
+
+    queue = WriteBehindQueue(client, flush_interval=60, max_pending=2)
+    futures = [queue.update(task) for task in tasks]
+
+    for future in futures:
+        future.result(timeout=5)
+    assert requests_mock.call_count == 2
+    queue.close()
+
+
+def test_queue_flushed_by_timer(client, task, requests_mock):
+    requests_mock.patch(f"{TASKS_URL}/task-1", json={"id": "task-1"})
+
+    queue = WriteBehindQueue(client, flush_interval=0.01)
+    queue.update(task).result(timeout=5)
+
+    assert requests_mock.call_count == 1
+    queue.close()
+
+
+def test_closed_queue_rejects_updates(client, task):
+    queue = WriteBehindQueue(client)
+    queue.close()
+
+    with pytest.raises(WriteBehindClosedError):
+        queue.update(task)
+
+
+def test_failed_update_is_reported_and_kept_in_journal(
+    client, task, requests_mock, tmp_path
+):
+    journal = str(tmp_path / "journal")
+    requests_mock.patch(f"{TASKS_URL}/task-1", status_code=500)
+
+    with WriteBehindQueue(client, flush_interval=60, journal=journal) as queue:
+        future = queue.update(task)
+
+    assert isinstance(future.exception(), ResponseError)
+
+    requests_mock.patch(f"{TASKS_URL}/task-1", json={"id": "task-1"})
+    WriteBehindQueue(client, flush_interval=60, journal=journal).close()
+
+    assert requests_mock.call_count == 2
+    assert requests_mock.last_request.json()["title"] == "task-1"
+    with open(journal) as file:
+        assert file.read() == ""
+
+
+def test_not_sent_updates_recovered_from_journal(client, task, requests_mock, tmp_path):
+    journal = tmp_path / "journal"
+    requests_mock.patch(f"{TASKS_URL}/task-1", json={"id": "task-1"})
+
+    queue = WriteBehindQueue(client, flush_interval=60, journal=str(journal))
+    task.title = "first"
+    queue.update(task)
+    task.title = "second"
+    queue.update(task)
+    queue.close(wait=False)  # Simulate a crash before sending
+
+    assert requests_mock.call_count == 0
+    entries = [json.loads(line) for line in journal.read_text().splitlines()]
+    assert [entry["data"]["title"] for entry in entries] == ["first", "second"]
+
+    recovered = WriteBehindQueue(client, flush_interval=60, journal=str(journal))
+    assert recovered.pending == 1
+    recovered.close()
+
+    assert requests_mock.call_count == 1
+    assert requests_mock.last_request.json()["title"] == "second"
+
+
+def test_close_without_waiting_cancels_pending_updates(
+    client, task_list, requests_mock, tmp_path
+):
+    journal = tmp_path / "journal"
+    sending, release = threading.Event(), threading.Event()
+
+    def slow_patch(request, context):
+        sending.set()
+        release.wait(timeout=5)
+        return {"id": "task-1"}
+
+    requests_mock.patch(f"{TASKS_URL}/task-1", json=slow_patch)
+    requests_mock.patch(f"{TASKS_URL}/task-2", json={"id": "task-2"})
+    tasks = [_task(task_list, "task-1"), _task(task_list, "task-2")]
+    for task in tasks:
+        task.task_list = task_list
+
+    queue = WriteBehindQueue(client, flush_interval=60, workers=1, journal=str(journal))
+    in_progress = queue.update(tasks[0])
+    queue.flush()
+    assert sending.wait(timeout=5)
+    queued = queue.update(tasks[1])
+    queue.flush()
+    pending = queue.update(tasks[0])
+
+    queue.close(wait=False)
+    release.set()
+
+    assert in_progress.result(timeout=5) is None
+    assert queued.cancelled()
+    assert pending.cancelled()
+    assert requests_mock.call_count == 1
+    recovered = WriteBehindQueue(client, flush_interval=60, journal=str(journal))
+    assert recovered.pending == 2
+    recovered.close(wait=False)
+
+
+def test_response_does_not_overwrite_changes_made_after_queueing(
+    client, task, requests_mock
+):
+    requests_mock.patch(
+        f"{TASKS_URL}/task-1", json={"id": "task-1", "title": "from-server"}
+    )
+    updated = []
+    client.add_listener(lambda event, resource: updated.append(event))
+
+    with WriteBehindQueue(client, flush_interval=60) as queue:
+        task.title = "sent"
+        queue.update(task)
+        task.title = "edited"
+
+    assert requests_mock.last_request.json()["title"] == "sent"
+    assert task.title == "edited"
+    assert updated == []
+
+
+def test_response_not_applied_when_newer_update_is_queued(client, task, requests_mock):
+    sending, release = threading.Event(), threading.Event()
+    titles = []
+
+    def patch(request, context):
+        titles.append(request.json()["title"])
+        if len(titles) == 1:
+            sending.set()
+            release.wait(timeout=5)
+        return {"id": "task-1", "title": f"from-server-{len(titles)}"}
+
+    requests_mock.patch(f"{TASKS_URL}/task-1", json=patch)
+
+    with WriteBehindQueue(client, flush_interval=60) as queue:
+        task.title = "first"
+        first = queue.update(task)
+        queue.flush()
+        assert sending.wait(timeout=5)
+        task.title = "second"
+        queue.update(task)
+        release.set()
+        first.result(timeout=5)
+        assert task.title == "second"
+
+    assert titles == ["first", "second"]
+    assert task.title == "from-server-2"
+
+
+def test_responses_are_applied_in_context_of_update(client, task_list, requests_mock):
+    tasks = [_task(task_list, f"task-{i}") for i in (1, 2)]
+    for task in tasks:
+        task.task_list = task_list
+        requests_mock.patch(
+            f"{TASKS_URL}/{task.id}",
+            json={"id": task.id, "body": {"content": "", "contentType": "text"}},
+        )
+
+    with WriteBehindQueue(client, flush_interval=60) as queue:
+        with shared_values():
+            futures = [queue.update(task) for task in tasks]
+        queue.flush()
+        for future in futures:
+            future.result(timeout=5)
+
+    assert tasks[0].body is tasks[1].body
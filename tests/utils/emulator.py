@@ -0,0 +1,480 @@
+"""Local emulator of the MS To Do API, for tests and benchmarks without an account.
+
+Emulates task lists, tasks and checklist items of one mailbox (any `me` or
+`users/<id>` prefix is accepted), with delta queries, `$batch`, paging, `$filter`,
+`$select`, ETags and injected throttling. Data is kept in memory."""
+
+import json
+import re
+import threading
+import uuid
+from datetime import date, datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from todoms.filters import FilterError, parse
+from todoms.resources import Subtask, Task, TaskList
+
+_PATH_RE = re.compile(r"^(?:/beta|/v1\.0)?(?:/me|/users/[^/]+)?/(?P<path>.*?)/?$")
+_ROUTES = [
+    (re.compile(r"^todo/lists(?P<delta>/delta)?$"), "lists"),
+    (re.compile(r"^todo/lists/(?P<list>[^/]+)$"), "list"),
+    (re.compile(r"^todo/lists/(?P<list>[^/]+)/tasks(?P<delta>/delta)?$"), "tasks"),
+    (re.compile(r"^todo/lists/(?P<list>[^/]+)/tasks/(?P<task>[^/]+)$"), "task"),
+    (
+        re.compile(
+            r"^todo/lists/(?P<list>[^/]+)/tasks/(?P<task>[^/]+)/checklistItems$"
+        ),
+        "subtasks",
+    ),
+    (
+        re.compile(
+            r"^todo/lists/(?P<list>[^/]+)/tasks/(?P<task>[^/]+)"
+            r"/checklistItems/(?P<subtask>[^/]+)$"
+        ),
+        "subtask",
+    ),
+]
+_RESOURCE_CLASSES = {"lists": TaskList, "tasks": Task, "subtasks": Subtask}
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _error(status: int, code: str, message: str = "") -> tuple[int, dict, dict]:
+    return status, {}, {"error": {"code": code, "message": message}}
+
+
+class _NotFound(Exception):
+    pass
+
+
+class _Collection:
+    """Items of one collection with the log of changes for delta queries"""
+
+    def __init__(self, resource_class: type) -> None:
+        self.resource_class = resource_class
+        self.items: dict[str, dict] = {}
+        self.changed: dict[str, int] = {}
+        self.removed: dict[str, int] = {}
+        self._resources: dict[str, object] = {}
+        # Results of the last filters, valid until the collection is changed,
+        # so following pages don't evaluate the filter again
+        self._selected: dict[str, list[dict]] = {}
+
+    def put(self, item: dict, sequence: int) -> None:
+        self._selected.clear()
+        self.items[item["id"]] = item
+        self.changed[item["id"]] = sequence
+        self._resources.pop(item["id"], None)
+
+    def remove(self, item_id: str, sequence: int) -> dict:
+        self._selected.clear()
+        item = self.items.pop(item_id)
+        self.changed.pop(item_id, None)
+        self._resources.pop(item_id, None)
+        self.removed[item_id] = sequence
+        return item
+
+    def select(self, expression: Optional[str]) -> list[dict]:
+        if not expression:
+            return list(self.items.values())
+        if expression in self._selected:
+            return self._selected[expression]
+        predicate = parse(expression).predicate(self.resource_class)
+        selected = []
+        for item_id, item in self.items.items():
+            resource = self._resources.get(item_id)
+            if resource is None:
+                resource = self._resources[item_id] = self.resource_class.from_dict(
+                    item
+                )
+            if predicate(resource):
+                selected.append(item)
+        self._selected[expression] = selected
+        return selected
+
+    def delta(self, token: Optional[int]) -> list[dict]:
+        if token is None:
+            return list(self.items.values())
+        changes: list[tuple[int, dict]] = [
+            (sequence, self.items[item_id])
+            for item_id, sequence in self.changed.items()
+            if sequence > token
+        ]
+        changes.extend(
+            (sequence, {"id": item_id, "@removed": {"reason": "deleted"}})
+            for item_id, sequence in self.removed.items()
+            if sequence > token
+        )
+        return [item for _, item in sorted(changes, key=lambda change: change[0])]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _handle(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+        status, headers, data = self.server.emulator.handle(  # type: ignore
+            self.command, self.path, body, dict(self.headers)
+        )
+        content = json.dumps(data).encode() if data is not None else b""
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if data is not None:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = do_PATCH = do_DELETE = _handle
+
+    def log_message(self, *_) -> None:
+        pass
+
+
+class Emulator:
+    """The API served on localhost by a thread in the background.
+
+    'page_size' is the default number of items on a page of collections. When
+    'throttle_every' is given, every n-th request gets the 429 response with
+    'retry_after' seconds in the Retry-After header."""
+
+    def __init__(
+        self,
+        page_size: int = 100,
+        throttle_every: Optional[int] = None,
+        retry_after: int = 1,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.page_size = page_size
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.request_count = 0
+        self.throttled_count = 0
+        self._throttle_next = 0
+
+        self._lock = threading.RLock()
+        self._sequence = 0
+        self._lists = _Collection(TaskList)
+        self._tasks: dict[str, _Collection] = {}
+        self._subtasks: dict[str, _Collection] = {}
+
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.emulator = self  # type: ignore
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """The API URL to pass to the client"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/beta"
+
+    def start(self) -> "Emulator":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": 0.01},
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread:
+            self._server.shutdown()
+            self._thread.join()
+        self._server.server_close()
+
+    def throttle(self, count: int = 1) -> None:
+        """Respond with 429 to the next 'count' requests"""
+        with self._lock:
+            self._throttle_next += count
+
+    # Direct access to the data, e.g. to prepare it quickly at scale
+
+    def _next_sequence(self) -> int:
+        self._sequence += 1
+        return self._sequence
+
+    def _stamp(self, item: dict, sequence: int) -> dict:
+        item["@odata.etag"] = f'W/"{sequence}"'
+        if "lastModifiedDateTime" in item:
+            item["lastModifiedDateTime"] = _now()
+        return item
+
+    def add_list(self, name: str, **data) -> dict:
+        with self._lock:
+            sequence = self._next_sequence()
+            item = {
+                "id": uuid.uuid4().hex,
+                "displayName": name,
+                "isOwner": True,
+                "isShared": False,
+                "wellknownListName": "none",
+                **data,
+            }
+            self._lists.put(self._stamp(item, sequence), sequence)
+            self._tasks[item["id"]] = _Collection(Task)
+            return item
+
+    def _apply_task_rules(self, item: dict) -> None:
+        """Fields set by the server in reaction to changes"""
+        if item.get("status") == "completed" and not item.get("completedDateTime"):
+            item["completedDateTime"] = {
+                "dateTime": _now().rstrip("Z"),
+                "timeZone": "UTC",
+            }
+        elif item.get("status") != "completed":
+            item.pop("completedDateTime", None)
+        recurrence = item.get("recurrence")
+        if recurrence and not item.get("dueDateTime"):
+            start = recurrence.get("range", {}).get("startDate") or str(date.today())
+            item["dueDateTime"] = {
+                "dateTime": f"{start}T00:00:00.0000000",
+                "timeZone": "UTC",
+            }
+
+    def add_task(self, list_id: str, title: str, **data) -> dict:
+        with self._lock:
+            sequence = self._next_sequence()
+            item = {
+                "id": uuid.uuid4().hex,
+                "title": title,
+                "status": "notStarted",
+                "importance": "normal",
+                "isReminderOn": False,
+                "hasAttachments": False,
+                "categories": [],
+                "body": {"content": "", "contentType": "text"},
+                "createdDateTime": _now(),
+                "lastModifiedDateTime": _now(),
+                **data,
+            }
+            self._apply_task_rules(item)
+            self._tasks[list_id].put(self._stamp(item, sequence), sequence)
+            self._subtasks[item["id"]] = _Collection(Subtask)
+            return item
+
+    def add_subtask(self, task_id: str, name: str, **data) -> dict:
+        with self._lock:
+            sequence = self._next_sequence()
+            item = {
+                "id": uuid.uuid4().hex,
+                "displayName": name,
+                "isChecked": False,
+                "createdDateTime": _now(),
+                **data,
+            }
+            self._subtasks[task_id].put(self._stamp(item, sequence), sequence)
+            return item
+
+    def populate(self, lists: int = 1, tasks_per_list: int = 100) -> list[str]:
+        """Add lists with generated tasks. Return identifiers of the lists"""
+        statuses = ["notStarted", "inProgress", "completed"]
+        importances = ["low", "normal", "high"]
+        list_ids = []
+        for list_number in range(lists):
+            list_id = self.add_list(f"List {list_number}")["id"]
+            list_ids.append(list_id)
+            for number in range(tasks_per_list):
+                self.add_task(
+                    list_id,
+                    f"Task {number}",
+                    status=statuses[number % len(statuses)],
+                    importance=importances[number % len(importances)],
+                    dueDateTime={
+                        "dateTime": f"2023-01-{number % 28 + 1:02}T00:00:00.0000000",
+                        "timeZone": "UTC",
+                    },
+                )
+        return list_ids
+
+    def _task(self, params: dict) -> dict:
+        tasks = self._tasks.get(params["list"])
+        if not tasks or params["task"] not in tasks.items:
+            raise _NotFound
+        return tasks.items[params["task"]]
+
+    # Handling requests
+
+    def _collection(self, route: str, params: dict) -> _Collection:
+        if route == "lists":
+            return self._lists
+        if route == "tasks":
+            if params["list"] not in self._tasks:
+                raise _NotFound
+            return self._tasks[params["list"]]
+        self._task(params)
+        return self._subtasks[params["task"]]
+
+    def _with_subtasks(self, task: dict) -> dict:
+        subtasks = list(self._subtasks[task["id"]].items.values())
+        return {**task, "checklistItems": subtasks}
+
+    def _page(
+        self, path: str, query: dict, items: list[dict], delta_token: Optional[int]
+    ) -> dict:
+        top = int(query.get("$top", self.page_size))
+        offset = int(query.get("$skiptoken", 0))
+        page = items[offset : offset + top]
+        if "$select" in query:
+            selected = {"id", "@odata.etag", "@removed"}
+            selected.update(query["$select"].split(","))
+            page = [{k: v for k, v in item.items() if k in selected} for item in page]
+        elif "$expand" in query and path.endswith("/tasks"):
+            page = [self._with_subtasks(item) for item in page]
+
+        result: dict = {"value": page}
+        base = f"{self.url}/me/{path}"
+        if offset + top < len(items):
+            next_query = {**query, "$skiptoken": offset + top}
+            result["@odata.nextLink"] = f"{base}?{urlencode(next_query)}"
+        elif delta_token is not None:
+            result["@odata.deltaLink"] = f"{base}?$deltatoken={self._sequence}"
+        return result
+
+    def _list(self, route: str, path: str, params: dict, query: dict) -> dict:
+        collection = self._collection(route, params)
+        if params.get("delta"):
+            if "$filter" in query:
+                raise FilterError("Delta queries don't support $filter")
+            token = query.get("$deltatoken")
+            items = collection.delta(int(token) if token else None)
+            return self._page(path, query, items, self._sequence)
+        items = collection.select(query.get("$filter"))
+        return self._page(path, query, items, None)
+
+    def _create(self, route: str, params: dict, body: dict) -> dict:
+        body = {k: v for k, v in body.items() if not k.startswith("@")}
+        body.pop("id", None)
+        if route == "lists":
+            return self.add_list(body.pop("displayName", ""), **body)
+        if route == "tasks":
+            self._collection(route, params)
+            body.pop("checklistItems", None)
+            return self.add_task(params["list"], body.pop("title", ""), **body)
+        self._task(params)
+        return self.add_subtask(params["task"], body.pop("displayName", ""), **body)
+
+    def _item(self, route: str, params: dict) -> tuple[_Collection, dict]:
+        if route == "list":
+            collection, item_id = self._lists, params["list"]
+        elif route == "task":
+            collection, item_id = self._collection("tasks", params), params["task"]
+        else:
+            collection = self._collection("subtasks", params)
+            item_id = params["subtask"]
+        if item_id not in collection.items:
+            raise _NotFound
+        return collection, collection.items[item_id]
+
+    def _patch(self, route: str, collection: _Collection, item: dict, body: dict):
+        sequence = self._next_sequence()
+        changes = {
+            k: v
+            for k, v in body.items()
+            if not k.startswith("@") and k not in ("id", "checklistItems")
+        }
+        item = {**item, **changes}
+        if route == "task":
+            self._apply_task_rules(item)
+        collection.put(self._stamp(item, sequence), sequence)
+        return item
+
+    def _delete(self, route: str, collection: _Collection, item: dict) -> None:
+        collection.remove(item["id"], self._next_sequence())
+        if route == "list":
+            for task_id in self._tasks.pop(item["id"]).items:
+                del self._subtasks[task_id]
+        elif route == "task":
+            del self._subtasks[item["id"]]
+
+    def _dispatch(self, method, route, path, params, query, body, headers):
+        if route in _RESOURCE_CLASSES:
+            if method == "GET":
+                return 200, {}, self._list(route, path, params, query)
+            if method == "POST":
+                return 201, {}, self._create(route, params, body or {})
+            return _error(405, "MethodNotAllowed")
+
+        collection, item = self._item(route, params)
+        etag = item["@odata.etag"]
+        if_match = headers.get("if-match")
+        if if_match and if_match not in ("*", etag):
+            return _error(412, "PreconditionFailed", "The ETag doesn't match")
+
+        if method == "GET":
+            data = self._with_subtasks(item) if route == "task" else item
+            return 200, {"ETag": etag}, data
+        if method == "PATCH":
+            item = self._patch(route, collection, item, body or {})
+            return 200, {"ETag": item["@odata.etag"]}, item
+        if method == "DELETE":
+            self._delete(route, collection, item)
+            return 204, {}, None
+        return _error(405, "MethodNotAllowed")
+
+    def _batch(self, body: dict) -> dict:
+        responses = []
+        for request in body.get("requests", []):
+            status, headers, data = self.handle(
+                request["method"],
+                request["url"],
+                request.get("body"),
+                request.get("headers"),
+            )
+            response = {"id": request["id"], "status": status, "headers": headers}
+            if data is not None:
+                response["body"] = data
+            responses.append(response)
+        return {"responses": responses}
+
+    def handle(
+        self, method: str, url: str, body: Optional[dict] = None, headers=None
+    ) -> tuple[int, dict, Optional[dict]]:
+        """Handle one request, return the status, headers and the response body"""
+        headers = {name.lower(): value for name, value in (headers or {}).items()}
+        split = urlsplit(url)
+        match = _PATH_RE.match(split.path)
+        path = match.group("path") if match else ""
+        query = dict(parse_qsl(split.query))
+
+        if method == "POST" and path == "$batch":
+            return 200, {}, self._batch(body or {})
+
+        with self._lock:
+            self.request_count += 1
+            if self._throttle_next or (
+                self.throttle_every and self.request_count % self.throttle_every == 0
+            ):
+                self._throttle_next = max(self._throttle_next - 1, 0)
+                self.throttled_count += 1
+                status, _, error = _error(429, "TooManyRequests", "Throttled")
+                return status, {"Retry-After": str(self.retry_after)}, error
+
+            for pattern, route in _ROUTES:
+                route_match = pattern.match(path)
+                if route_match:
+                    params = route_match.groupdict()
+                    break
+            else:
+                return _error(400, "BadRequest", f"Unsupported path {path}")
+
+            try:
+                return self._dispatch(method, route, path, params, query, body, headers)
+            except _NotFound:
+                return _error(404, "ErrorItemNotFound", "The item was not found")
+            except (FilterError, ValueError, TypeError, KeyError) as exc:
+                return _error(400, "BadRequest", str(exc))
+
+    def __enter__(self) -> "Emulator":
+        return self.start()
+
+    def __exit__(self, *_) -> None:
+        self.stop()
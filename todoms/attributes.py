@@ -2,6 +2,8 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import Optional
 
+from .converters.interning import Shareable
+
 
 class Importance(Enum):
     LOW = "low"
@@ -42,13 +44,21 @@ class Weekday(Enum):
     SATURDAY = "saturday"
 
 
+class WeekIndex(Enum):
+    FIRST = "first"
+    SECOND = "second"
+    THIRD = "third"
+    FOURTH = "fourth"
+    LAST = "last"
+
+
 class ContentType(Enum):
     TEXT = "text"
     HTML = "html"
 
 
 @dataclass
-class Content:
+class Content(Shareable):
     value: Optional[str] = None
     type: ContentType = ContentType.HTML
 
@@ -0,0 +1,216 @@
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Iterator, Optional, TypeVar
+
+from furl import furl  # type: ignore
+
+from .filters import FilterLike, compile_filter
+from .resources import Resource, ResourceEvent, Subtask, Task, TaskList
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class BulkResult:
+    """Outcome of one item of a bulk operation.
+
+    'error' is set if the item itself failed. A created task can still have
+    some subtasks not created, they are listed in 'subtask_errors'."""
+
+    item: Any
+    error: Optional[BaseException] = None
+    subtask_errors: list[tuple[Subtask, BaseException]] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.subtask_errors
+
+
+ProgressCallback = Callable[[BulkResult], None]
+
+
+@dataclass
+class BulkReport:
+    """Results of a bulk operation, in the order of given items"""
+
+    results: list[BulkResult]
+
+    @property
+    def ok(self) -> bool:
+        return all(result.ok for result in self.results)
+
+    @property
+    def succeeded(self) -> list[BulkResult]:
+        return [result for result in self.results if result.ok]
+
+    @property
+    def failed(self) -> list[BulkResult]:
+        return [result for result in self.results if not result.ok]
+
+    def __iter__(self) -> Iterator[BulkResult]:
+        return iter(self.results)
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+
+def run_bulk(
+    items: Iterable[T],
+    action: Callable[[T], BulkResult],
+    concurrency: int = 4,
+    progress: Optional[ProgressCallback] = None,
+    keep_results: bool = True,
+) -> BulkReport:
+    """Run 'action' on every item using 'concurrency' threads.
+
+    Items are consumed lazily, only a few more than the number of threads are
+    waiting at a time, so a generator of many items is not read into memory
+    at once. 'progress' is called with every result, from the worker threads,
+    but never concurrently. Without 'keep_results', the returned report is
+    empty and results are only passed to 'progress', so memory use doesn't
+    grow with the number of items. Actions run in a copy of the caller's
+    context, so e.g. values are shared as in the calling 'shared_values' block."""
+    if concurrency < 1:
+        raise ValueError("Concurrency must be at least 1")
+
+    slots = threading.BoundedSemaphore(concurrency * 2)
+    progress_lock = threading.Lock()
+
+    def run(item: T) -> BulkResult:
+        try:
+            result = action(item)
+        except Exception as exc:
+            logger.warning("Bulk operation on %r failed", item, exc_info=True)
+            result = BulkResult(item, exc)
+        finally:
+            slots.release()
+        if progress:
+            with progress_lock:
+                progress(result)
+        return result
+
+    futures: list["Future[BulkResult]"] = []
+    with ThreadPoolExecutor(
+        max_workers=concurrency, thread_name_prefix="todoms-bulk"
+    ) as executor:
+        for item in items:
+            slots.acquire()
+            future = executor.submit(copy_context().run, run, item)
+            if keep_results:
+                futures.append(future)
+    return BulkReport([future.result() for future in futures])
+
+
+def _create_subtasks(task: Task, subtasks: list[Subtask], result: BulkResult) -> None:
+    for subtask in subtasks:
+        subtask.task = task
+        subtask.client = task.client
+        try:
+            subtask.create()
+        except Exception as exc:
+            logger.warning("Creating subtask of %s failed", task.id, exc_info=True)
+            result.subtask_errors.append((subtask, exc))
+
+
+def create_task(task_list: TaskList, task: Task) -> BulkResult:
+    """Create the task and then its subtasks, in their order, reporting failures
+    instead of raising them"""
+    task.task_list = task_list
+    task.client = task_list.client
+    subtasks = list(task.subtasks or [])
+    try:
+        # Only the task, subtasks are created here to collect their errors
+        Resource.create(task)
+    except Exception as exc:
+        logger.warning("Creating task %r failed", task.title, exc_info=True)
+        return BulkResult(task, exc)
+
+    result = BulkResult(task)
+    _create_subtasks(task, subtasks, result)
+    task.subtasks = subtasks
+    return result
+
+
+def tasks_endpoint(task_list: TaskList) -> str:
+    return str((furl(task_list.managing_endpoint) / Task.ENDPOINT).url)
+
+
+def select_task_ids(task_list: TaskList, expression: FilterLike) -> list[str]:
+    """Ids of tasks in the list matching the filter, without fetching tasks"""
+    params = {"$filter": compile_filter(expression), "$select": "id"}
+    pages = task_list.client.raw_pages(tasks_endpoint(task_list), params)
+    return [element["id"] for page in pages for element in page.items]
+
+
+def task_changes(**changes: Any) -> dict:
+    """Partial dict of a task with given attributes, e.g. 'status'"""
+    task = Task(**changes)
+    fields = {field.name: field for field in task._fields}
+    data: dict = {}
+    for name in changes:
+        if name not in fields:
+            raise ValueError(f"Task has no attribute {name!r}")
+        data.update(fields[name].to_dict(task))
+    return data
+
+
+def _task(task_list: TaskList, data: dict) -> Task:
+    task = Task.from_dict(data, client=task_list.client)
+    task.task_list = task_list
+    return task
+
+
+def _patch_task(task_list: TaskList, task_id: str, data: dict) -> BulkResult:
+    client = task_list.client
+    try:
+        response = client.raw_patch(f"{tasks_endpoint(task_list)}/{task_id}", data)
+    except Exception as exc:
+        logger.warning("Updating task %s failed", task_id, exc_info=True)
+        return BulkResult(task_id, exc)
+    client.notify(ResourceEvent.UPDATED, _task(task_list, response))
+    return BulkResult(task_id)
+
+
+def _delete_task(task_list: TaskList, task_id: str) -> BulkResult:
+    client = task_list.client
+    try:
+        client.raw_delete(f"{tasks_endpoint(task_list)}/{task_id}")
+    except Exception as exc:
+        logger.warning("Deleting task %s failed", task_id, exc_info=True)
+        return BulkResult(task_id, exc)
+    client.notify(ResourceEvent.DELETED, _task(task_list, {"id": task_id}))
+    return BulkResult(task_id)
+
+
+def update_where(
+    task_list: TaskList,
+    expression: FilterLike,
+    changes: dict,
+    concurrency: int = 4,
+    progress: Optional[ProgressCallback] = None,
+) -> BulkReport:
+    data = task_changes(**changes)
+    ids = select_task_ids(task_list, expression)
+    return run_bulk(
+        ids,
+        lambda task_id: _patch_task(task_list, task_id, data),
+        concurrency,
+        progress,
+    )
+
+
+def delete_where(
+    task_list: TaskList,
+    expression: FilterLike,
+    concurrency: int = 4,
+    progress: Optional[ProgressCallback] = None,
+) -> BulkReport:
+    ids = select_task_ids(task_list, expression)
+    return run_bulk(
+        ids, lambda task_id: _delete_task(task_list, task_id), concurrency, progress
+    )
@@ -1,11 +1,30 @@
+import copy
+import json
 import logging
-from typing import Any, Iterable, Optional, Type, TypeVar
+import time
+from dataclasses import dataclass
+from functools import cached_property
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    Literal,
+    Optional,
+    Type,
+    TypeVar,
+    Union,
+    overload,
+)
 
 from furl import furl  # type: ignore
 from requests import Response, codes
 
+from .cursor import ListCursor, ListIterator
+from .instrumentation import RequestHook, RequestInfo, endpoint_template
 from .provider import AbstractProvider
-from .resources import Resource, TaskList
+from .resources import Resource, ResourceEvent, TaskList
+from .tracing import NOOP_TRACER, Tracer
 
 logger = logging.getLogger(__name__)
 
@@ -32,7 +51,54 @@ class ResourceNotFoundError(ResponseError):
     MESSAGE = "404 Resource not found"
 
 
+def retry_after(response: Response) -> Optional[float]:
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
+
+
+@dataclass
+class RawResponse:
+    """Response of the API as it was received, without converting it to resources.
+
+    'content' are the untouched bytes of the body, so they can be passed on
+    as they are. The body is parsed only when its data are used."""
+
+    content: bytes
+    url: str
+
+    @cached_property
+    def data(self) -> dict:
+        return json.loads(self.content) if self.content else {}
+
+    @property
+    def items(self) -> list[dict]:
+        """Elements of a listed page"""
+        return self.data.get("value", [])  # type: ignore
+
+    @property
+    def next_link(self) -> Optional[str]:
+        return self.data.get("@odata.nextLink")
+
+    @property
+    def delta_link(self) -> Optional[str]:
+        return self.data.get("@odata.deltaLink")
+
+
+class TooManyRequestsError(ResponseError):
+    """Requests are throttled by the API"""
+
+    MESSAGE = "429 Too many requests"
+
+    @property
+    def retry_after(self) -> Optional[float]:
+        """Seconds to wait before the next request, as requested by the API"""
+        return retry_after(self.response)
+
+
 ResourceType = TypeVar("ResourceType", bound=Resource)
+ResourceListener = Callable[[ResourceEvent, Resource], None]
 
 
 class ToDoClient:
@@ -41,86 +107,339 @@ class ToDoClient:
         provider: AbstractProvider,
         api_url: str = "https://graph.microsoft.com/beta",
         api_prefix: str = "me",
+        tracer: Optional[Tracer] = None,
     ):
         self._provider = provider
+        self._tracer = tracer or NOOP_TRACER
         self._url = furl(api_url) / api_prefix
+        self._listeners: list[ResourceListener] = []
+        self._hooks: list[RequestHook] = []
+        self._max_retries = 0
+
+    def _endpoint(self, url: str) -> str:
+        base = self._url.url
+        if url.startswith(base):
+            return endpoint_template(url[len(base) :])
+        return endpoint_template(str(furl(url).path))
+
+    def _call_provider(
+        self,
+        method: str,
+        url: str,
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+    ) -> Response:
+        if method == "GET":
+            return self._provider.get(url, params=params)
+        if method == "DELETE":
+            return self._provider.delete(url)
+        if method == "PATCH":
+            return self._provider.patch(url, json_data=data)  # type: ignore
+        return self._provider.post(url, json_data=data)  # type: ignore
+
+    def _hooked_request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+        page: Optional[int] = None,
+        retry: int = 0,
+    ) -> Response:
+        if not self._hooks:
+            return self._call_provider(method, url, params, data)
+
+        info = RequestInfo(method, url, self._endpoint(url), page=page, retry=retry)
+        if data is not None:
+            info.bytes_out = len(json.dumps(data))
+        for hook in self._hooks:
+            hook.before_request(info)
+
+        start = time.perf_counter()
+        try:
+            response = self._call_provider(method, url, params, data)
+        except Exception as exc:
+            info.error = exc
+            raise
+        else:
+            info.status = response.status_code
+            info.bytes_in = len(response.content)
+        finally:
+            info.latency = time.perf_counter() - start
+            for hook in self._hooks:
+                hook.after_request(info)
+        return response
+
+    def _retried_request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+        page: Optional[int] = None,
+    ) -> Response:
+        response = self._hooked_request(method, url, params, data, page)
+        retry = 0
+        while (
+            response.status_code == codes.too_many_requests
+            and retry < self._max_retries
+        ):
+            retry += 1
+            response = self._hooked_request(method, url, params, data, page, retry)
+        return response
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+        page: Optional[int] = None,
+    ) -> Response:
+        if self._tracer.enabled:
+            attributes = {
+                "http.method": method,
+                "http.url": url,
+                "todoms.endpoint": self._endpoint(url),
+                "todoms.page": page,
+            }
+            with self._tracer.span(f"HTTP {method}", attributes) as span:
+                response = self._retried_request(method, url, params, data, page)
+                span.set_attribute("http.status_code", response.status_code)
+                return response
+        return self._retried_request(method, url, params, data, page)
 
     def _map_http_errors(self, response: Response, expected: int) -> None:
-        logger.debug(
-            "Got response with code %s: %s",
-            response.status_code,
-            response.text,
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Got response with code %s: %s",
+                response.status_code,
+                response.text,
+            )
 
         if response.status_code == codes.not_found:
             raise ResourceNotFoundError(response)
 
+        if response.status_code == codes.too_many_requests:
+            raise TooManyRequestsError(response)
+
         if response.status_code != expected:
             logger.warning(
                 "Unexpected response %s: %s", response.status_code, response.text
             )
             raise ResponseError(response)
 
-    def list(
+    def _get_page_response(
+        self, url: str, params: Optional[dict], page: int
+    ) -> Response:
+        logger.debug("Listing %s", url)
+        response = self._request("GET", url, params=params, page=page)
+        self._map_http_errors(response, codes.ok)
+        return response
+
+    def _get_page(self, url: str, params: Optional[dict], page: int) -> dict:
+        return self._get_page_response(url, params, page).json()  # type: ignore
+
+    def _raw_pages(
+        self, url: str, params: Optional[dict] = None
+    ) -> Iterator[RawResponse]:
+        page = 0
+        next_url: Optional[str] = url
+        while next_url:
+            page += 1
+            response = self._get_page_response(next_url, params, page)
+            raw = RawResponse(response.content, next_url)
+            if not raw.data:
+                return
+            yield raw
+            next_url = raw.next_link
+            params = {}
+
+    def _traced_list(
+        self, resource_class: Type[ResourceType], url: str, params: dict
+    ) -> Iterator[ResourceType]:
+        # The span can't be simply active around the generator, as the context
+        # would leak to the caller between items. It's active only while a page
+        # is fetched, so requests of the page are its children.
+        span = self._tracer.start_span(
+            f"todoms.{resource_class.__name__}.list",
+            {"todoms.operation": "list", "todoms.endpoint": self._endpoint(url)},
+        )
+        pages = self._raw_pages(url, params)
+        page_count = item_count = 0
+        try:
+            while True:
+                with self._tracer.activate(span):
+                    page = next(pages, None)
+                if page is None:
+                    break
+                page_count += 1
+                for element in page.items:
+                    item_count += 1
+                    yield resource_class.from_dict(element, client=self)
+        except Exception as exc:
+            span.record_exception(exc)
+            raise
+        finally:
+            span.set_attribute("todoms.pages", page_count)
+            span.set_attribute("todoms.items", item_count)
+            span.end()
+
+    def _list_url(
         self,
         resource_class: Type[ResourceType],
-        endpoint: Optional[str] = None,
-        delta: bool = True,
-        **kwargs: Any,
-    ) -> Iterable[ResourceType]:
+        endpoint: Optional[str],
+        delta: bool,
+        filters: dict,
+    ) -> tuple[str, dict]:
         url = self._url / (endpoint or resource_class.ENDPOINT)
-        params = resource_class.handle_list_filters(**kwargs)
+        params = resource_class.handle_list_filters(**filters)
 
         if delta and not params:
             url = url / "delta"
         if delta and params:
             logger.info("Requested delta query with filter, skipping delta")
+        return url.url, params
 
-        url = url.url  # Translate furl to str
-        while url:
-            logger.debug("Listing %s", url)
-            response = self._provider.get(url, params=params)
-            self._map_http_errors(response, codes.ok)
-            data = response.json()
-            if not data:
-                return
-            url = data.get("@odata.nextLink", None)
-            params = {}
-            for element in data["value"]:
-                yield resource_class.from_dict(element, client=self)
+    @overload
+    def list(
+        self,
+        resource_class: Type[ResourceType],
+        endpoint: Optional[str] = None,
+        delta: bool = True,
+        raw: Literal[False] = False,
+        **kwargs: Any,
+    ) -> Iterable[ResourceType]:
+        ...
 
+    @overload
+    def list(
+        self,
+        resource_class: Type[ResourceType],
+        endpoint: Optional[str] = None,
+        delta: bool = True,
+        *,
+        raw: Literal[True],
+        **kwargs: Any,
+    ) -> Iterable[RawResponse]:
+        ...
+
+    def list(
+        self,
+        resource_class: Type[ResourceType],
+        endpoint: Optional[str] = None,
+        delta: bool = True,
+        raw: bool = False,
+        **kwargs: Any,
+    ) -> Iterable[Union[ResourceType, RawResponse]]:
+        """List resources of the collection, page by page.
+
+        With 'raw', pages are returned as received, without converting their
+        elements to resources, e.g. to pass them on as they are."""
+        url, params = self._list_url(resource_class, endpoint, delta, kwargs)
+        if raw:
+            yield from self._raw_pages(url, params)
+            return
+        if not self._tracer.enabled:
+            for page in self._raw_pages(url, params):
+                for element in page.items:
+                    yield resource_class.from_dict(element, client=self)
+            return
+        yield from self._traced_list(resource_class, url, params)
+
+    def iterate(
+        self,
+        resource_class: Type[ResourceType],
+        endpoint: Optional[str] = None,
+        delta: bool = True,
+        cursor: Optional[ListCursor] = None,
+        **kwargs: Any,
+    ) -> ListIterator[ResourceType]:
+        """Iterate over resources like 'list', with a cursor of the position.
+
+        The cursor of the returned iterator can be saved and passed here later
+        to continue from the same item. Filters are stored in the cursor, so
+        they are not needed when resuming."""
+        if cursor is None:
+            url, params = self._list_url(resource_class, endpoint, delta, kwargs)
+            cursor = ListCursor(url, params)
+        return ListIterator(self, resource_class, cursor)
+
+    def raw_pages(
+        self, endpoint: str, params: Optional[dict] = None
+    ) -> Iterator[RawResponse]:
+        """Iterate over pages of a collection as returned by the API, like 'list'
+        with 'raw', but with query parameters passed as they are.
+
+        'endpoint' can be also a full URL, e.g. a delta link from the last page"""
+        url = endpoint if furl(endpoint).scheme else (self._url / endpoint).url
+        return self._raw_pages(url, params)
+
+    def _get_response(self, url: str) -> Response:
+        logger.debug("Getting %s", url)
+        response = self._request("GET", url)
+        self._map_http_errors(response, codes.ok)
+        return response
+
+    @overload
     def get(
         self,
         resource_class: Type[ResourceType],
         resource_id: Optional[str] = None,
         endpoint: Optional[str] = None,
+        raw: Literal[False] = False,
     ) -> ResourceType:
+        ...
+
+    @overload
+    def get(
+        self,
+        resource_class: Type[ResourceType],
+        resource_id: Optional[str] = None,
+        endpoint: Optional[str] = None,
+        *,
+        raw: Literal[True],
+    ) -> RawResponse:
+        ...
+
+    def get(
+        self,
+        resource_class: Type[ResourceType],
+        resource_id: Optional[str] = None,
+        endpoint: Optional[str] = None,
+        raw: bool = False,
+    ) -> Union[ResourceType, RawResponse]:
+        """Get the resource, or the response as received with 'raw'"""
         if not endpoint and not resource_id:
             raise ValueError("Either endpoint or resource_id must be provided")
 
         endpoint = endpoint or f"{resource_class.ENDPOINT}/{resource_id}"
-        response = self.raw_get(endpoint)
-        return resource_class.from_dict(response, client=self)
+        url = (self._url / endpoint).url
+        response = self._get_response(url)
+        if raw:
+            return RawResponse(response.content, url)
+        return resource_class.from_dict(response.json(), client=self)
 
     def raw_get(self, endpoint: str) -> dict:
-        url = (self._url / endpoint).url
-        logger.debug("Getting %s", url)
-        response = self._provider.get(url)
-        self._map_http_errors(response, codes.ok)
+        response = self._get_response((self._url / endpoint).url)
         return response.json()  # type: ignore
 
     def delete(self, resource: Resource) -> None:
-        url = (self._url / resource.managing_endpoint).url
+        self.raw_delete(resource.managing_endpoint)
+
+    def raw_delete(self, endpoint: str) -> None:
+        url = (self._url / endpoint).url
         logger.debug("Deleting %s", url)
-        response = self._provider.delete(url)
+        response = self._request("DELETE", url)
         self._map_http_errors(response, codes.no_content)
 
     def patch(self, resource: Resource) -> dict:
-        url = (self._url / resource.managing_endpoint).url
+        return self.raw_patch(resource.managing_endpoint, resource.to_dict())
 
-        data = resource.to_dict()
-        response = self._provider.patch(url, json_data=data)
-        logger.debug("Patching %s", url, extra={"data": data})
+    def raw_patch(self, endpoint: str, data: dict) -> dict:
+        url = (self._url / endpoint).url
+        logger.debug("Patching %s", url)
+        response = self._request("PATCH", url, data=data)
         self._map_http_errors(response, codes.ok)
         return response.json()  # type: ignore
 
@@ -128,11 +447,51 @@ class ToDoClient:
         self, endpoint: str, data: dict, expected_code: int = codes.created
     ) -> dict:
         url = (self._url / endpoint).url
-        logger.debug("Posting %s", url, extra={"data": data})
-        response = self._provider.post(url, json_data=data)
+        logger.debug("Posting %s", url)
+        response = self._request("POST", url, data=data)
         self._map_http_errors(response, expected_code)
         return response.json()  # type: ignore
 
+    @property
+    def provider(self) -> AbstractProvider:
+        return self._provider
+
+    def with_provider(
+        self, provider: AbstractProvider, max_retries: int = 0
+    ) -> "ToDoClient":
+        """Copy of the client sending requests through another provider, e.g.
+        a wrapper of the current one. Hooks and listeners are shared.
+
+        Throttled requests are sent again up to 'max_retries' times, each one
+        reported to the hooks. The client doesn't wait between them, the provider
+        has to wait for the time asked by the API."""
+        client = copy.copy(self)
+        client._provider = provider
+        client._max_retries = max_retries
+        return client
+
+    @property
+    def tracer(self) -> Tracer:
+        return self._tracer
+
+    def add_hook(self, hook: RequestHook) -> None:
+        """Register a hook notified before and after every request"""
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook: RequestHook) -> None:
+        self._hooks.remove(hook)
+
+    def add_listener(self, listener: ResourceListener) -> None:
+        """Register a function called after a resource is changed through the client"""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: ResourceListener) -> None:
+        self._listeners.remove(listener)
+
+    def notify(self, event: ResourceEvent, resource: Resource) -> None:
+        for listener in self._listeners:
+            listener(event, resource)
+
     @property
     def task_lists(self) -> Iterable[TaskList]:
         return self.list(TaskList)
@@ -2,6 +2,7 @@ import inspect
 from abc import ABC
 from typing import Any, Type, TypeVar
 
+from .converters.interning import _SHARED
 from .fields import Field
 
 ConvertableType = TypeVar("ConvertableType", bound="BaseConvertableFieldsObject")
@@ -42,10 +43,14 @@ class BaseConvertableFieldsObject(ABC):
             data.update(field.to_dict(self))
         return data
 
+    def _attributes(self) -> dict:
+        # Without the mark of shared values, they are equal to their copies
+        return {name: value for name, value in self.__dict__.items() if name != _SHARED}
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, self.__class__):
             return False
-        return self.__dict__ == other.__dict__
+        return self._attributes() == other._attributes()
 
     def __repr__(self) -> str:
-        return f"{self.__class__.__name__}({self.__dict__})"
+        return f"{self.__class__.__name__}({self._attributes()})"
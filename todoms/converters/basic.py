@@ -1,3 +1,4 @@
+import sys
 from abc import ABC
 from datetime import date, datetime
 from enum import Enum
@@ -9,6 +10,7 @@ from todoms.attributes import Content, ContentType
 
 from ..convertable import ConvertableType
 from . import BaseConverter, JSONableTypes, VBasicType
+from .interning import intern_value
 
 
 class AttributeConverter(BaseConverter[VBasicType, VBasicType]):
@@ -19,6 +21,17 @@ class AttributeConverter(BaseConverter[VBasicType, VBasicType]):
         return data
 
 
+class InternedStringConverter(BaseConverter[str, str]):
+    """Strings repeated in many objects, like names of categories, are kept
+    in memory once"""
+
+    def obj_converter(self, data: Optional[str]) -> Optional[str]:
+        return sys.intern(data) if data else data
+
+    def back_converter(self, data: Optional[str]) -> Optional[str]:
+        return data
+
+
 class BooleanConverter(BaseConverter[bool, bool]):
     def obj_converter(self, data: Optional[bool]) -> bool:
         return True if data else False
@@ -48,8 +61,18 @@ class DatetimeConverter(BaseConverter[datetime, dict]):
 class ContentConverter(BaseConverter[Content, dict]):
     def obj_converter(self, data: Optional[dict]) -> Content:
         if not data:
-            return Content(None, ContentType.HTML)
-        return Content(data["content"], ContentType(data.get("contentType", "html")))
+            return intern_value(
+                (Content, None, ContentType.HTML),
+                lambda: Content(None, ContentType.HTML),
+            )
+        type_ = ContentType(data.get("contentType", "html"))
+        if not data["content"]:
+            # Only empty content is shared, as hashing bodies costs more
+            return intern_value(
+                (Content, data["content"], type_),
+                lambda: Content(data["content"], type_),
+            )
+        return Content(data["content"], type_)
 
     def back_converter(self, data: Optional[Content]) -> Optional[dict]:
         value = data.value if data else None
@@ -0,0 +1,117 @@
+import copy
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import Enum
+from typing import Any, Callable, Hashable, Iterator, NoReturn, Optional, TypeVar
+
+T = TypeVar("T")
+
+_SHARED = "_shared"
+
+_table: ContextVar[Optional[dict]] = ContextVar("shared_values", default=None)
+
+
+@contextmanager
+def shared_values() -> Iterator[None]:
+    """Share equal values between objects converted from dicts in this block.
+
+    Recurrences and empty bodies of tasks created with 'from_dict' are shared
+    by all tasks with equal values, which saves memory of large snapshots.
+    Shared values are read-only: assigning a new value to the task replaces
+    (or copies) it, but changing the shared value itself, including its lists,
+    raises AttributeError. Use 'unshared' to get a copy which can be changed."""
+    token = _table.set({})
+    try:
+        yield
+    finally:
+        _table.reset(token)
+
+
+def is_shared(value: object) -> bool:
+    attributes = getattr(value, "__dict__", None)
+    return isinstance(attributes, dict) and _SHARED in attributes
+
+
+def check_not_shared(value: object) -> None:
+    if is_shared(value):
+        raise AttributeError(
+            f"Shared {value.__class__.__name__} can't be changed, use a copy"
+        )
+
+
+class Shareable:
+    """Base of value objects which can be shared by 'shared_values'"""
+
+    def __setattr__(self, name: str, value: object) -> None:
+        check_not_shared(self)
+        super().__setattr__(name, value)
+
+
+class _SharedList(list):
+    """List in a shared value, which can't be changed either"""
+
+    def _read_only(self, *_: Any, **__: Any) -> NoReturn:
+        raise AttributeError("Shared list can't be changed, use a copy")
+
+    append = extend = insert = remove = pop = clear = _read_only
+    sort = reverse = _read_only
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+
+    def __reduce__(self) -> tuple:
+        # Copies are plain lists which can be changed
+        return list, (list(self),)
+
+
+def _seal(value: Any) -> None:
+    attributes = getattr(value, "__dict__", None)
+    if not isinstance(attributes, dict) or isinstance(value, Enum):
+        return
+    for name, item in list(attributes.items()):
+        if isinstance(item, list):
+            for element in item:
+                _seal(element)
+            attributes[name] = _SharedList(item)
+        else:
+            _seal(item)
+    attributes[_SHARED] = True
+
+
+def read_only(value: T) -> T:
+    """The value sealed as a part of a shared value, e.g. a default of its field"""
+    if isinstance(value, list):
+        for element in value:
+            _seal(element)
+        return _SharedList(value)  # type: ignore[return-value]
+    _seal(value)
+    return value
+
+
+def intern_value(key: Hashable, factory: Callable[[], T]) -> T:
+    """The shared value for the key, if values are shared, or a new one"""
+    table = _table.get()
+    if table is None:
+        return factory()
+    value: Optional[T] = table.get(key)
+    if value is None:
+        value = factory()
+        _seal(value)
+        # Other threads may intern the same value meanwhile, keep the first
+        value = table.setdefault(key, value)
+    return value
+
+
+def _unseal(value: Any) -> None:
+    attributes = getattr(value, "__dict__", None)
+    if not isinstance(attributes, dict) or isinstance(value, Enum):
+        return
+    attributes.pop(_SHARED, None)
+    for item in attributes.values():
+        for element in item if isinstance(item, list) else [item]:
+            _unseal(element)
+
+
+def unshared(value: T) -> T:
+    """A copy of the value which can be changed"""
+    copied = copy.deepcopy(value)
+    _unseal(copied)
+    return copied
@@ -1,8 +1,10 @@
+import json
 from typing import Optional
 
 from ..attributes import RecurrencePatternType, RecurrenceRangeType
 from ..recurrence import Recurrence, patterns, ranges
 from . import BaseConverter
+from .interning import intern_value
 
 
 class RecurrencePatternConverter(BaseConverter[patterns.BaseRecurrencePattern, dict]):
@@ -70,9 +72,12 @@ class RecurrenceConverter(BaseConverter[Recurrence, dict]):
         if not data:
             return None
 
-        return Recurrence(
-            self._pattern_converter.obj_converter(data.get("pattern")),
-            self._range_converter.obj_converter(data.get("range")),
+        return intern_value(
+            (Recurrence, json.dumps(data, sort_keys=True)),
+            lambda: Recurrence(
+                self._pattern_converter.obj_converter(data.get("pattern")),
+                self._range_converter.obj_converter(data.get("range")),
+            ),
         )
 
     def back_converter(self, data: Optional[Recurrence]) -> Optional[dict]:
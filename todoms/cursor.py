@@ -0,0 +1,96 @@
+from dataclasses import asdict, dataclass, field, replace
+from typing import TYPE_CHECKING, Generic, Iterator, Optional, Type, TypeVar
+
+from .resources import Resource
+
+if TYPE_CHECKING:
+    from .client import ToDoClient
+
+ResourceType = TypeVar("ResourceType", bound=Resource)
+
+
+@dataclass(frozen=True)
+class ListCursor:
+    """Position in a listed collection.
+
+    'url' is the address of the page with the next item and 'offset' is the
+    number of items of this page already returned. After the last page 'url'
+    is None and 'delta_link' is set if the API returned it, so it can be used
+    to get changes later. The cursor can be saved with 'to_dict'."""
+
+    url: Optional[str]
+    params: dict = field(default_factory=dict)
+    offset: int = 0
+    delta_link: Optional[str] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.url is None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ListCursor":
+        return cls(**data)
+
+
+class ListIterator(Generic[ResourceType], Iterator[ResourceType]):
+    """Iterator over resources of a collection, page by page, exposing the
+    cursor of its position. Only the current page is kept in memory."""
+
+    def __init__(
+        self,
+        client: "ToDoClient",
+        resource_class: Type[ResourceType],
+        cursor: ListCursor,
+    ) -> None:
+        self._client = client
+        self._resource_class = resource_class
+        self._cursor = cursor
+        self._page: Optional[dict] = None
+        self._page_number = 0
+
+    @property
+    def cursor(self) -> ListCursor:
+        """Position of the next item"""
+        return self._cursor
+
+    def _advance(self, page: dict) -> None:
+        next_link = page.get("@odata.nextLink")
+        self._page = None
+        self._cursor = ListCursor(
+            next_link,
+            delta_link=None if next_link else page.get("@odata.deltaLink"),
+        )
+
+    def _load_page(self) -> None:
+        cursor = self._cursor
+        self._page_number += 1
+        page = self._client._get_page(
+            cursor.url, cursor.params, self._page_number  # type: ignore
+        )
+        if not page:
+            self._cursor = ListCursor(None)
+        elif cursor.offset >= len(page["value"]):
+            self._advance(page)
+        else:
+            self._page = page
+
+    def __next__(self) -> ResourceType:
+        while self._page is None:
+            if self._cursor.finished:
+                raise StopIteration
+            self._load_page()
+
+        items = self._page["value"]
+        element = items[self._cursor.offset]
+        self._cursor = replace(self._cursor, offset=self._cursor.offset + 1)
+        if self._cursor.offset >= len(items):
+            # Move the cursor to the next page, so resuming from it doesn't
+            # download the finished page again
+            self._advance(self._page)
+        return self._resource_class.from_dict(element, client=self._client)
+
+    def __iter__(self) -> "ListIterator[ResourceType]":
+        return self
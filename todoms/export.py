@@ -0,0 +1,266 @@
+import gzip
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import IO, TYPE_CHECKING, BinaryIO, Iterator, Optional, Type
+
+from .resources import Resource, Subtask, Task, TaskList
+
+if TYPE_CHECKING:
+    from .client import ToDoClient
+
+logger = logging.getLogger(__name__)
+
+TASK_LIST = "taskList"
+TASK = "task"
+SUBTASK = "subtask"
+
+PARENT_COLUMN = "parentId"
+
+
+@dataclass(frozen=True)
+class _Kind:
+    resource_class: Type[Resource]
+    file_name: str
+    nested: Optional[str] = None
+
+    def schema(self) -> list[str]:
+        """Columns of the kind, named as fields in the API, nested resources
+        are exported as their own kind"""
+        names = [field.dict_name for field in self.resource_class()._fields]
+        return [PARENT_COLUMN] + sorted(name for name in names if name != self.nested)
+
+
+_KINDS = {
+    TASK_LIST: _Kind(TaskList, "task_lists"),
+    TASK: _Kind(Task, "tasks", nested="checklistItems"),
+    SUBTASK: _Kind(Subtask, "subtasks"),
+}
+
+
+class ExportCheckpointError(Exception):
+    """The export can't be resumed from the checkpoint"""
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, f"{mode}t", encoding="utf-8")  # type: ignore
+    return open(path, mode, encoding="utf-8")
+
+
+class ExportWriter(ABC):
+    """Destination of exported records.
+
+    Records passed to 'write' may be buffered, but they must be stored when
+    'flush' returns, as the export is checkpointed right after it."""
+
+    @abstractmethod
+    def write(self, kind: str, parent_id: Optional[str], data: dict) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class NDJSONWriter(ExportWriter):
+    """Writes every record as a JSON line with its 'type', 'parentId' and the
+    'data' as returned by the API. The file is compressed if the path ends
+    with '.gz'. With 'append', records are added to an existing file."""
+
+    def __init__(self, path: str, append: bool = False) -> None:
+        self._file = _open(path, "a" if append else "w")
+
+    def write(self, kind: str, parent_id: Optional[str], data: dict) -> None:
+        record = {"type": kind, PARENT_COLUMN: parent_id, "data": data}
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ColumnarWriter(ExportWriter):
+    """Writes records of every kind to a compressed file in 'directory'.
+
+    Each line of a file is a row group: a JSON object mapping names of columns
+    to lists of values of up to 'row_group_size' records. Columns are named as fields
+    in the API, fields not known to the library are not exported."""
+
+    def __init__(
+        self, directory: str, row_group_size: int = 1000, append: bool = False
+    ) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self._row_group_size = row_group_size
+        self._schemas = {kind: spec.schema() for kind, spec in _KINDS.items()}
+        self._files: dict[str, BinaryIO] = {
+            kind: open(
+                os.path.join(directory, f"{spec.file_name}.json.gz"),
+                "ab" if append else "wb",
+            )
+            for kind, spec in _KINDS.items()
+        }
+        self._groups: dict[str, dict[str, list]] = {}
+
+    def _write_group(self, kind: str) -> None:
+        group = self._groups.pop(kind, None)
+        if group:
+            # Every group is a separate gzip member, so a file with groups
+            # appended after resuming the export is still valid
+            line = json.dumps(group, separators=(",", ":")) + "\n"
+            self._files[kind].write(gzip.compress(line.encode("utf-8")))
+
+    def write(self, kind: str, parent_id: Optional[str], data: dict) -> None:
+        group = self._groups.get(kind)
+        if group is None:
+            group = self._groups[kind] = {name: [] for name in self._schemas[kind]}
+        group[PARENT_COLUMN].append(parent_id)
+        for name, values in group.items():
+            if name != PARENT_COLUMN:
+                values.append(data.get(name))
+        if len(group[PARENT_COLUMN]) >= self._row_group_size:
+            self._write_group(kind)
+
+    def flush(self) -> None:
+        for kind, file in self._files.items():
+            self._write_group(kind)
+            file.flush()
+
+    def close(self) -> None:
+        self.flush()
+        for file in self._files.values():
+            file.close()
+
+
+def read_ndjson(path: str) -> Iterator[dict]:
+    """Iterate over records of a file written by 'NDJSONWriter'"""
+    with _open(path, "r") as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def read_columnar(directory: str, kind: str) -> Iterator[dict]:
+    """Iterate over rows of the kind written by 'ColumnarWriter', as dicts"""
+    path = os.path.join(directory, f"{_KINDS[kind].file_name}.json.gz")
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            group = json.loads(line)
+            names = list(group)
+            for values in zip(*group.values()):
+                yield dict(zip(names, values))
+
+
+@dataclass
+class ExportStats:
+    task_lists: int = 0
+    tasks: int = 0
+    subtasks: int = 0
+    pages: int = 0
+
+
+class Exporter:
+    """Streams all task lists, tasks and subtasks of the mailbox to the writer.
+
+    Pages are written as they are downloaded, so memory use doesn't depend on
+    the size of the mailbox. Subtasks are downloaded with their tasks. When
+    'checkpoint' path is given, the position is saved there after every page
+    and an interrupted export started again with the same checkpoint continues
+    from the next page. The writer should append to the previous output then.
+    A page being written during the interruption can be exported twice. The
+    checkpoint is removed when the export finishes."""
+
+    def __init__(
+        self,
+        client: "ToDoClient",
+        writer: ExportWriter,
+        checkpoint: Optional[str] = None,
+    ) -> None:
+        self._client = client
+        self._writer = writer
+        self._checkpoint_path = checkpoint
+        self.stats = ExportStats()
+
+    def _load_checkpoint(self) -> dict:
+        if not self._checkpoint_path or not os.path.exists(self._checkpoint_path):
+            return {}
+        with open(self._checkpoint_path, encoding="utf-8") as file:
+            return json.load(file)  # type: ignore
+
+    def _save_checkpoint(self, state: dict) -> None:
+        if not self._checkpoint_path:
+            return
+        self._writer.flush()
+        temporary_path = f"{self._checkpoint_path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(state, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, self._checkpoint_path)
+
+    def _export_lists(self) -> list[str]:
+        ids = []
+        for page in self._client.raw_pages(TaskList.ENDPOINT):
+            self.stats.pages += 1
+            for data in page.items:
+                ids.append(data["id"])
+                self._writer.write(TASK_LIST, None, data)
+                self.stats.task_lists += 1
+        return ids
+
+    def _export_tasks(self, list_id: str, next_link: Optional[str] = None) -> None:
+        endpoint = f"{TaskList.ENDPOINT}/{list_id}/{Task.ENDPOINT}"
+        params = None if next_link else {"$expand": "checklistItems"}
+        for page in self._client.raw_pages(next_link or endpoint, params):
+            self.stats.pages += 1
+            for data in page.items:
+                subtasks = data.pop("checklistItems", None) or []
+                self._writer.write(TASK, list_id, data)
+                self.stats.tasks += 1
+                for subtask in subtasks:
+                    self._writer.write(SUBTASK, data["id"], subtask)
+                self.stats.subtasks += len(subtasks)
+            next_link = page.next_link
+            self._save_checkpoint(
+                {"lists": True, "list_id": list_id, "next_link": next_link}
+            )
+
+    def _list_ids(self, state: dict) -> list[str]:
+        if state.get("lists"):
+            pages = self._client.raw_pages(TaskList.ENDPOINT)
+            return [data["id"] for page in pages for data in page.items]
+        ids = self._export_lists()
+        self._save_checkpoint({"lists": True})
+        return ids
+
+    def run(self) -> ExportStats:
+        state = self._load_checkpoint()
+        list_ids = self._list_ids(state)
+
+        start, next_link = 0, None
+        if state.get("list_id"):
+            if state["list_id"] not in list_ids:
+                raise ExportCheckpointError(
+                    f"List {state['list_id']} from the checkpoint doesn't exist"
+                )
+            start = list_ids.index(state["list_id"])
+            next_link = state.get("next_link")
+            if not next_link:
+                start += 1
+            logger.info("Resuming export from list %s", state["list_id"])
+
+        for index, list_id in enumerate(list_ids[start:]):
+            self._export_tasks(list_id, next_link if index == 0 else None)
+
+        self._writer.flush()
+        if self._checkpoint_path and os.path.exists(self._checkpoint_path):
+            os.remove(self._checkpoint_path)
+        return self.stats
@@ -2,6 +2,7 @@ from abc import ABC
 from typing import TYPE_CHECKING, Callable, Generic, Optional, TypeVar
 
 from ..converters import BaseConverter, KSourceType
+from ..converters.interning import is_shared, read_only
 
 if TYPE_CHECKING:
     from ..convertable import BaseConvertableFieldsObject
@@ -40,6 +41,9 @@ class Field(ABC, Generic[T, KSourceType]):
 
     def _get_value(self, instance: "BaseConvertableFieldsObject") -> Optional[T]:
         if self.name not in instance.__dict__:
+            if is_shared(instance):
+                # Shared values can't be changed, also by storing the default
+                return read_only(self._default_factory())
             self._set_value(instance, self._default_factory())
         return instance.__dict__.get(self.name)
 
@@ -2,7 +2,7 @@ from datetime import date, datetime
 from enum import Enum
 from typing import Any, Callable, Generic, Optional, Type, TypeVar, Union
 
-from ..attributes import Content
+from ..attributes import Content, ContentType
 from ..convertable import BaseConvertableFieldsObject
 from ..converters import BaseConverter, JSONableTypes
 from ..converters.basic import (
@@ -15,6 +15,7 @@ from ..converters.basic import (
     IsoTimeConverter,
     ListConverter,
 )
+from ..converters.interning import is_shared
 from . import Field
 
 VBasicType = TypeVar("VBasicType", str, int, bool)
@@ -39,7 +40,10 @@ class ContentField(Field[Content, dict]):
         self, instance: BaseConvertableFieldsObject, value: Union[Content, str, None]
     ) -> None:
         if isinstance(value, str):
-            obj = self._get_value(instance) or Content(value)
+            obj = self._get_value(instance)
+            if not obj or is_shared(obj):
+                # Shared content is copied on write
+                obj = Content(value, obj.type if obj else ContentType.HTML)
             obj.value = value
             value = obj
         instance.__dict__[self.name] = value
@@ -1,64 +1,604 @@
+import dataclasses
+import inspect
+import operator
+import re
+from abc import ABC, abstractmethod
 from datetime import datetime
 from enum import Enum
-from itertools import chain
-from typing import Any, Dict, List, Union
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Optional, TypeVar, Union
 
 from dateutil import tz
 
-Comparable = Union[str, Enum, datetime, bool]
+from .fields import Field
 
+Comparable = Union[str, Enum, datetime, bool, int, None]
+FilterLike = Union["Filter", str]
+Predicate = Callable[[Any], bool]
+T = TypeVar("T")
 
-def _format_kwargs(kwargs: Dict) -> List[str]:
-    return [f"{k} {v}" for k, v in kwargs.items()]
+_FIELD_NAME_RE = re.compile(r"^[A-Za-z_]\w*(/[A-Za-z_]\w*)*$")
+
+
+class FilterError(ValueError):
+    """Filter expression is malformed"""
+
+
+def _utc(value: datetime) -> datetime:
+    # Naive datetimes are in UTC, as in the API
+    if not value.tzinfo:
+        return value.replace(tzinfo=tz.UTC)
+    return value.astimezone(tz.UTC)
 
 
 def _format_comparable(value: Comparable) -> str:
-    if isinstance(value, Enum):
-        return f"'{value.value}'"
+    if value is None:
+        return "null"
+    elif isinstance(value, Enum):
+        return _format_comparable(value.value)
     elif isinstance(value, datetime):
-        return value.astimezone(tz.UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+        return _utc(value).strftime("%Y-%m-%dT%H:%M:%SZ")
     elif value is True:
         return "true"
     elif value is False:
         return "false"
-    else:
-        return f"'{value}'"
+    elif isinstance(value, int):
+        return str(value)
+    elif isinstance(value, str):
+        escaped = value.replace("'", "''")
+        return f"'{escaped}'"
+    raise FilterError(f"Unsupported value in filter: {value!r}")
+
+
+def _validate_field_name(name: str) -> str:
+    if not _FIELD_NAME_RE.match(name):
+        raise FilterError(f"Invalid field name in filter: {name!r}")
+    return name
+
+
+@lru_cache(maxsize=1024)
+def _compile(expression: "Filter") -> str:
+    return expression._compile()
+
+
+@lru_cache(maxsize=1024)
+def _build_predicate(expression: "Filter", resource_class: type) -> Predicate:
+    return expression._predicate(resource_class)
+
+
+@lru_cache(maxsize=None)
+def _field_getter(resource_class: type, path: str) -> Callable[[Any], Any]:
+    """Return a function reading the value of the API field `path` from objects"""
+    fields: dict[str, Field] = {
+        field.dict_name: field
+        for _, field in inspect.getmembers(
+            resource_class, lambda m: isinstance(m, Field)
+        )
+    }
+    name, _, nested_path = path.partition("/")
+    if name not in fields:
+        raise FilterError(f"{resource_class.__name__} has no field {name!r}")
+    field = fields[name]
+    if not nested_path:
+        return field._get_value
+
+    def _get_nested(instance: Any) -> Any:
+        value = field._get_value(instance)
+        if isinstance(value, datetime) and nested_path == "dateTime":
+            return value
+        data = field.convert_to_dict(instance)
+        for part in nested_path.split("/"):
+            if not isinstance(data, dict):
+                return None
+            data = data.get(part)
+        return data
+
+    return _get_nested
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return _utc(value)
+    return value
+
+
+def _expected(value: Comparable) -> Any:
+    """Value of a filter as the API gets it, so with datetimes in seconds"""
+    value = _normalize(value)
+    if isinstance(value, datetime):
+        return value.replace(microsecond=0)
+    return value
+
+
+def _compare(op: Callable[[Any, Any], bool], left: Any, right: Any) -> bool:
+    if left is None or right is None:
+        return False
+    try:
+        return op(left, right)
+    except TypeError:
+        return False
+
+
+_OPERATORS: dict[str, Callable[[Any, Any], bool]] = {
+    "eq": lambda left, right: left == right,
+    "ne": lambda left, right: left != right,
+    "gt": lambda left, right: _compare(operator.gt, left, right),
+    "ge": lambda left, right: _compare(operator.ge, left, right),
+    "lt": lambda left, right: _compare(operator.lt, left, right),
+    "le": lambda left, right: _compare(operator.le, left, right),
+}
+
+_FUNCTIONS: dict[str, Callable[[str, str], bool]] = {
+    "contains": lambda text, value: value in text,
+    "startswith": lambda text, value: text.startswith(value),
+}
+
+
+class Filter(ABC):
+    """Node of a filter expression. Compiles to the OData `$filter` syntax.
+
+    Nodes are immutable and compared by their normalized content, so equal
+    expressions share one compiled string from the cache. A node is not equal
+    to the string it compiles to, use `str()` or `compile_filter` to compare
+    them."""
+
+    def compile(self) -> str:
+        return _compile(self)
+
+    @abstractmethod
+    def _compile(self) -> str:
+        pass
+
+    def predicate(self, resource_class: type) -> Predicate:
+        """Return a function checking locally if an object matches the expression.
+
+        Fields are resolved by their API names, as the server does."""
+        return _build_predicate(self, resource_class)
+
+    def _predicate(self, resource_class: type) -> Predicate:
+        raise FilterError(f"Filter {self} cannot be evaluated locally")
+
+    def _select(self, resource_class: type, items: list) -> list:
+        predicate = self.predicate(resource_class)
+        return [item for item in items if predicate(item)]
+
+    def _bind(self, field: str) -> "Filter":
+        raise FilterError(f"Filter {self} cannot be bound to the field {field!r}")
+
+    def _requires_field(self) -> bool:
+        """Whether it's a condition without a field, e.g. 'eq(...)', which can be
+        used only as a value of a keyword argument naming the field"""
+        return False
+
+    def _key(self) -> tuple:
+        return (self.__class__.__name__,) + tuple(
+            getattr(self, f.name)
+            for f in dataclasses.fields(self)  # type: ignore[arg-type]
+            if f.compare
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Filter):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __str__(self) -> str:
+        return self.compile()
+
+
+@dataclasses.dataclass(frozen=True, eq=False)
+class Raw(Filter):
+    """Expression given as an already prepared string"""
+
+    text: str
+
+    def _compile(self) -> str:
+        return self.text
+
+
+@dataclasses.dataclass(frozen=True, eq=False)
+class Comparison(Filter):
+    """Comparing a field with a value, e.g. `status eq 'completed'`"""
+
+    operator: str
+    literal: str
+    value: Comparable = dataclasses.field(compare=False)
+    field: Optional[str] = None
+
+    def _compile(self) -> str:
+        if not self.field:
+            return f"{self.operator} {self.literal}"
+        return f"{self.field} {self.operator} {self.literal}"
+
+    def _predicate(self, resource_class: type) -> Predicate:
+        if not self.field:
+            return super()._predicate(resource_class)
+        getter = _field_getter(resource_class, self.field)
+        compare = _OPERATORS[self.operator]
+        expected = _expected(self.value)
+        return lambda instance: compare(_normalize(getter(instance)), expected)
+
+    def _bind(self, field: str) -> Filter:
+        if self.field:
+            return super()._bind(field)
+        return dataclasses.replace(self, field=_validate_field_name(field))
+
+    def _requires_field(self) -> bool:
+        return not self.field
+
+
+@dataclasses.dataclass(frozen=True, eq=False)
+class FunctionCall(Filter):
+    """Calling a string function on a field, e.g. `contains(title, 'abc')`"""
+
+    function: str
+    literal: str
+    value: str = dataclasses.field(compare=False)
+    field: Optional[str] = None
+
+    def _compile(self) -> str:
+        if not self.field:
+            raise FilterError(f"Function {self.function} requires a field")
+        return f"{self.function}({self.field}, {self.literal})"
+
+    def _predicate(self, resource_class: type) -> Predicate:
+        if not self.field:
+            return super()._predicate(resource_class)
+        getter = _field_getter(resource_class, self.field)
+        function = _FUNCTIONS[self.function]
+
+        def _call(instance: Any) -> bool:
+            value = getter(instance)
+            if value is None:
+                return False
+            return function(str(value), self.value)
+
+        return _call
+
+    def _bind(self, field: str) -> Filter:
+        if self.field:
+            return super()._bind(field)
+        return dataclasses.replace(self, field=_validate_field_name(field))
+
+    def _requires_field(self) -> bool:
+        return not self.field
+
+
+@dataclasses.dataclass(frozen=True, eq=False)
+class In(Filter):
+    """Checking if a field has one of values, e.g. `status in ('a', 'b')`"""
 
+    literals: tuple[str, ...]
+    values: tuple[Comparable, ...] = dataclasses.field(compare=False)
+    field: Optional[str] = None
 
-def _generate_operator(op: str, args: tuple, kwargs: dict[str, Comparable]) -> str:
-    if len(args) + len(kwargs) == 1:
-        return "".join(chain(args, _format_kwargs(kwargs)))
-    condition = f" {op} ".join(chain(args, _format_kwargs(kwargs)))
-    return f"({condition.strip()})"
+    def _compile(self) -> str:
+        if not self.field:
+            raise FilterError("Operator in requires a field")
+        return f"{self.field} in ({', '.join(self.literals)})"
 
+    def _predicate(self, resource_class: type) -> Predicate:
+        if not self.field:
+            return super()._predicate(resource_class)
+        getter = _field_getter(resource_class, self.field)
+        expected = [_expected(value) for value in self.values]
+        return lambda instance: _normalize(getter(instance)) in expected
 
-def and_(*args: Any, **kwargs: Comparable) -> str:
+    def _bind(self, field: str) -> Filter:
+        if self.field:
+            return super()._bind(field)
+        return dataclasses.replace(self, field=_validate_field_name(field))
+
+    def _requires_field(self) -> bool:
+        return not self.field
+
+
+@dataclasses.dataclass(frozen=True, eq=False)
+class Not(Filter):
+    """Negation of an expression"""
+
+    operand: Filter
+
+    def _compile(self) -> str:
+        return f"not ({self.operand.compile()})"
+
+    def _predicate(self, resource_class: type) -> Predicate:
+        predicate = self.operand.predicate(resource_class)
+        return lambda instance: not predicate(instance)
+
+    def _select(self, resource_class: type, items: list) -> list:
+        selected = {id(item) for item in self.operand._select(resource_class, items)}
+        return [item for item in items if id(item) not in selected]
+
+    def _bind(self, field: str) -> Filter:
+        return Not(self.operand._bind(field))
+
+    def _requires_field(self) -> bool:
+        return self.operand._requires_field()
+
+
+@dataclasses.dataclass(frozen=True, eq=False)
+class BooleanOperator(Filter):
+    """Joining expressions with `and` or `or`"""
+
+    operator: str
+    operands: tuple[Filter, ...]
+
+    def _compile(self) -> str:
+        if len(self.operands) == 1:
+            return self.operands[0].compile()
+        condition = f" {self.operator} ".join(op.compile() for op in self.operands)
+        return f"({condition.strip()})"
+
+    def _predicate(self, resource_class: type) -> Predicate:
+        predicates = [operand.predicate(resource_class) for operand in self.operands]
+        join = all if self.operator == "and" else any
+        return lambda instance: join(predicate(instance) for predicate in predicates)
+
+    def _select(self, resource_class: type, items: list) -> list:
+        # Evaluate conditions one by one over the whole collection, so each next
+        # condition is checked only against objects which result is still open
+        if self.operator == "and":
+            for operand in self.operands:
+                items = operand._select(resource_class, items)
+            return items
+
+        remaining, selected = items, set[int]()
+        for operand in self.operands:
+            selected.update(id(i) for i in operand._select(resource_class, remaining))
+            remaining = [item for item in remaining if id(item) not in selected]
+        return [item for item in items if id(item) in selected]
+
+    def _requires_field(self) -> bool:
+        return any(operand._requires_field() for operand in self.operands)
+
+
+def _to_filter(expression: FilterLike) -> Filter:
+    if isinstance(expression, Filter):
+        return expression
+    if isinstance(expression, str):
+        return Raw(expression)
+    raise FilterError(f"Unsupported filter expression: {expression!r}")
+
+
+def _to_condition(expression: FilterLike) -> Filter:
+    """The filter of a whole condition, which can't miss a field"""
+    condition = _to_filter(expression)
+    if condition._requires_field():
+        raise FilterError(
+            f"Filter {condition!r} requires a field, pass it as a keyword argument"
+        )
+    return condition
+
+
+def _bind_kwarg(name: str, value: FilterLike) -> Filter:
+    if isinstance(value, str):
+        return Raw(f"{_validate_field_name(name)} {value}")
+    if isinstance(value, Filter):
+        return value._bind(name)
+    raise FilterError(f"Unsupported filter for the field {name!r}: {value!r}")
+
+
+def _generate_operator(op: str, args: tuple, kwargs: dict[str, FilterLike]) -> Filter:
+    operands = tuple(_to_condition(arg) for arg in args) + tuple(
+        _bind_kwarg(name, value) for name, value in kwargs.items()
+    )
+    if not operands:
+        raise FilterError(f"Operator {op} requires at least one condition")
+    return BooleanOperator(op, operands)
+
+
+def compile_filter(expression: FilterLike) -> str:
+    """Compile an expression into the OData `$filter` string"""
+    return _to_condition(expression).compile()
+
+
+def matches(expression: FilterLike, resource: Any) -> bool:
+    """Check locally, without any request, if the resource matches the filter"""
+    return _to_condition(expression).predicate(type(resource))(resource)
+
+
+def select(expression: FilterLike, resources: Iterable[T]) -> list[T]:
+    """Filter locally a collection of resources of the same class.
+
+    Conditions are evaluated condition by condition over the whole collection,
+    which is faster than checking objects one by one on large collections."""
+    items = list(resources)
+    if not items:
+        return items
+    return _to_condition(expression)._select(type(items[0]), items)
+
+
+def and_(*args: FilterLike, **kwargs: FilterLike) -> Filter:
     return _generate_operator("and", args, kwargs)
 
 
-def or_(*args: Any, **kwargs: Comparable) -> str:
+def or_(*args: FilterLike, **kwargs: FilterLike) -> Filter:
     return _generate_operator("or", args, kwargs)
 
 
-def eq(value: Comparable) -> str:
-    return f"eq {_format_comparable(value)}"
+def not_(expression: FilterLike) -> Filter:
+    return Not(_to_filter(expression))
+
+
+def eq(value: Comparable) -> Filter:
+    return Comparison("eq", _format_comparable(value), value)
+
+
+def ne(value: Comparable) -> Filter:
+    return Comparison("ne", _format_comparable(value), value)
+
+
+def gt(value: Comparable) -> Filter:
+    return Comparison("gt", _format_comparable(value), value)
+
+
+def ge(value: Comparable) -> Filter:
+    return Comparison("ge", _format_comparable(value), value)
+
+
+def lt(value: Comparable) -> Filter:
+    return Comparison("lt", _format_comparable(value), value)
+
+
+def le(value: Comparable) -> Filter:
+    return Comparison("le", _format_comparable(value), value)
+
+
+def contains(value: str) -> Filter:
+    return FunctionCall("contains", _format_comparable(value), value)
+
+
+def startswith(value: str) -> Filter:
+    return FunctionCall("startswith", _format_comparable(value), value)
+
+
+def in_(values: Iterable[Comparable]) -> Filter:
+    values = tuple(values)
+    if not values:
+        raise FilterError("Operator in requires at least one value")
+    return In(tuple(_format_comparable(v) for v in values), values)
+
+
+_TOKEN_RE = re.compile(
+    r"""\s*(?:
+    (?P<string>'(?:[^']|'')*')
+    |(?P<datetime>\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?Z)
+    |(?P<number>-?\d+)
+    |(?P<punctuation>[(),])
+    |(?P<word>[A-Za-z_][\w/]*)
+    )""",
+    re.VERBOSE,
+)
+_LITERALS = {"null": None, "true": True, "false": False}
+_COMPARISONS: dict[str, Callable[[Comparable], Filter]] = {
+    "eq": eq,
+    "ne": ne,
+    "gt": gt,
+    "ge": ge,
+    "lt": lt,
+    "le": le,
+}
+_CALLS: dict[str, Callable[[str], Filter]] = {
+    "contains": contains,
+    "startswith": startswith,
+}
+
+
+def _tokenize(text: str) -> list[tuple[str, str]]:
+    tokens: list[tuple[str, str]] = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKEN_RE.match(text, position)
+        if not match or not match.lastgroup:
+            raise FilterError(f"Unexpected character in filter at {position}")
+        tokens.append((match.lastgroup, match.group(match.lastgroup)))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    def __init__(self, text: str) -> None:
+        self._tokens = _tokenize(text)
+        self._position = 0
+
+    def _peek(self) -> Optional[str]:
+        if self._position < len(self._tokens):
+            return self._tokens[self._position][1]
+        return None
+
+    def _next(self) -> tuple[str, str]:
+        if self._position >= len(self._tokens):
+            raise FilterError("Unexpected end of filter")
+        token = self._tokens[self._position]
+        self._position += 1
+        return token
+
+    def _expect(self, value: str) -> None:
+        _, token = self._next()
+        if token != value:
+            raise FilterError(f"Expected {value!r} in filter, got {token!r}")
+
+    def _operand(self, op: str) -> Filter:
+        return self._boolean("and") if op == "or" else self._unary()
 
+    def _boolean(self, op: str) -> Filter:
+        operands = [self._operand(op)]
+        while self._peek() == op:
+            self._next()
+            operands.append(self._operand(op))
+        if len(operands) == 1:
+            return operands[0]
+        return BooleanOperator(op, tuple(operands))
 
-def ne(value: Comparable) -> str:
-    return f"ne {_format_comparable(value)}"
+    def parse(self) -> Filter:
+        expression = self._boolean("or")
+        if self._peek() is not None:
+            raise FilterError(f"Unexpected {self._peek()!r} in filter")
+        return expression
 
+    def _literal(self) -> Comparable:
+        kind, token = self._next()
+        if kind == "string":
+            return token[1:-1].replace("''", "'")
+        if kind == "number":
+            return int(token)
+        if kind == "datetime":
+            return datetime.strptime(
+                token.split(".")[0].rstrip("Z"), "%Y-%m-%dT%H:%M:%S"
+            ).replace(tzinfo=tz.UTC)
+        if kind == "word" and token in _LITERALS:
+            return _LITERALS[token]
+        raise FilterError(f"Expected a value in filter, got {token!r}")
 
-def gt(value: Comparable) -> str:
-    return f"gt {_format_comparable(value)}"
+    def _condition(self) -> Filter:
+        kind, name = self._next()
+        if kind != "word":
+            raise FilterError(f"Expected a field in filter, got {name!r}")
 
+        if name in _CALLS:
+            self._expect("(")
+            _, field = self._next()
+            self._expect(",")
+            value = self._literal()
+            self._expect(")")
+            if not isinstance(value, str):
+                raise FilterError(f"Function {name} requires a string")
+            return _CALLS[name](value)._bind(field)
 
-def ge(value: Comparable) -> str:
-    return f"ge {_format_comparable(value)}"
+        _, op = self._next()
+        if op == "in":
+            self._expect("(")
+            values = [self._literal()]
+            while self._peek() == ",":
+                self._next()
+                values.append(self._literal())
+            self._expect(")")
+            return in_(values)._bind(name)
+        if op not in _COMPARISONS:
+            raise FilterError(f"Unsupported operator in filter: {op!r}")
+        return _COMPARISONS[op](self._literal())._bind(name)
 
+    def _unary(self) -> Filter:
+        if self._peek() == "not":
+            self._next()
+            return Not(self._unary())
+        if self._peek() == "(":
+            self._next()
+            expression = self._boolean("or")
+            self._expect(")")
+            return expression
+        return self._condition()
 
-def lt(value: Comparable) -> str:
-    return f"lt {_format_comparable(value)}"
 
+def parse(text: str) -> Filter:
+    """Parse a `$filter` string into an expression, e.g. to evaluate it locally.
 
-def le(value: Comparable) -> str:
-    return f"le {_format_comparable(value)}"
+    Only the syntax produced by this module is supported."""
+    return _Parser(text).parse()
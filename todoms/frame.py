@@ -0,0 +1,201 @@
+import math
+import sys
+from array import array
+from collections import Counter
+from datetime import datetime, timezone
+from enum import Enum
+from itertools import compress
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Sequence, Union
+
+from furl import furl  # type: ignore
+
+from .attributes import Importance, Status
+from .converters.basic import DatetimeConverter, IsoTimeConverter
+from .resources import Task, TaskListNotSpecifiedError
+
+if TYPE_CHECKING:
+    from .client import RawResponse
+    from .resources import TaskList
+
+_STATUSES = list(Status)
+_IMPORTANCES = list(Importance)
+_STATUS_CODES = {status.value: code for code, status in enumerate(_STATUSES)}
+_IMPORTANCE_CODES = {
+    importance.value: code for code, importance in enumerate(_IMPORTANCES)
+}
+_ENUM_COLUMNS: dict[str, Sequence[Enum]] = {
+    "status": _STATUSES,
+    "importance": _IMPORTANCES,
+}
+_DATETIME_COLUMNS = ("due_datetime", "created_datetime", "last_modified_datetime")
+
+_datetime_converter = DatetimeConverter()
+_iso_time_converter = IsoTimeConverter()
+
+
+def _timestamp(value: Optional[datetime]) -> float:
+    return value.timestamp() if value else math.nan
+
+
+def _datetime(timestamp: float) -> Optional[datetime]:
+    if math.isnan(timestamp):
+        return None
+    return datetime.fromtimestamp(timestamp, timezone.utc)
+
+
+class TaskFrame:
+    """Tasks stored column by column, for analytics over many tasks.
+
+    Statuses and importances are kept as codes in byte arrays, datetimes as
+    POSIX timestamps in arrays of floats (NaN if not set) and titles as
+    interned strings, so a task takes tens of bytes instead of a 'Task'
+    object. The frame is filled from dicts of tasks as returned by the API,
+    and its rows are converted to 'Task' only on demand."""
+
+    def __init__(self, task_list: Optional["TaskList"] = None) -> None:
+        self.task_list = task_list
+        self.id: list[str] = []
+        self.title: list[str] = []
+        self.status = array("b")
+        self.importance = array("b")
+        self.due_datetime = array("d")
+        self.created_datetime = array("d")
+        self.last_modified_datetime = array("d")
+
+    @classmethod
+    def from_pages(
+        cls,
+        pages: Iterable[Union[dict, "RawResponse"]],
+        task_list: Optional["TaskList"] = None,
+    ) -> "TaskFrame":
+        """Frame of tasks in listed pages, e.g. from 'list' with 'raw'"""
+        frame = cls(task_list)
+        for page in pages:
+            frame.extend(page["value"] if isinstance(page, dict) else page.items)
+        return frame
+
+    def append(self, data: dict) -> None:
+        """Add a task given as a dict in the API format"""
+        self.id.append(data["id"])
+        self.title.append(sys.intern(data.get("title") or ""))
+        self.status.append(_STATUS_CODES[data.get("status", "notStarted")])
+        self.importance.append(_IMPORTANCE_CODES[data.get("importance", "normal")])
+        self.due_datetime.append(
+            _timestamp(_datetime_converter.obj_converter(data.get("dueDateTime")))
+        )
+        self.created_datetime.append(
+            _timestamp(_iso_time_converter.obj_converter(data.get("createdDateTime")))
+        )
+        self.last_modified_datetime.append(
+            _timestamp(
+                _iso_time_converter.obj_converter(data.get("lastModifiedDateTime"))
+            )
+        )
+
+    def extend(self, items: Iterable[dict]) -> None:
+        for data in items:
+            self.append(data)
+
+    def take(self, indexes: Iterable[int]) -> "TaskFrame":
+        """Frame of rows with given indexes"""
+        indexes = list(indexes)
+        frame = TaskFrame(self.task_list)
+        frame.id = [self.id[index] for index in indexes]
+        frame.title = [self.title[index] for index in indexes]
+        for name in ("status", "importance") + _DATETIME_COLUMNS:
+            column = getattr(self, name)
+            getattr(frame, name).extend(column[index] for index in indexes)
+        return frame
+
+    def mask(
+        self,
+        status: Optional[Status] = None,
+        importance: Optional[Importance] = None,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None,
+    ) -> list[bool]:
+        """Which rows match all given conditions. Due dates are inclusive and
+        tasks without a due date don't match them."""
+        mask = [True] * len(self)
+        if status:
+            code = _STATUSES.index(status)
+            mask = [m and value == code for m, value in zip(mask, self.status)]
+        if importance:
+            code = _IMPORTANCES.index(importance)
+            mask = [m and value == code for m, value in zip(mask, self.importance)]
+        if due_after:
+            after = due_after.timestamp()
+            mask = [m and value >= after for m, value in zip(mask, self.due_datetime)]
+        if due_before:
+            before = due_before.timestamp()
+            mask = [m and value <= before for m, value in zip(mask, self.due_datetime)]
+        return mask
+
+    def where(
+        self,
+        status: Optional[Status] = None,
+        importance: Optional[Importance] = None,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None,
+    ) -> "TaskFrame":
+        """Frame of rows matching all given conditions, see 'mask'"""
+        return self.select(self.mask(status, importance, due_after, due_before))
+
+    def select(self, mask: Sequence[bool]) -> "TaskFrame":
+        return self.take(compress(range(len(self)), mask))
+
+    def count_by(self, column: str) -> dict[Enum, int]:
+        """Number of tasks by values of 'status' or 'importance'"""
+        values = _ENUM_COLUMNS[column]
+        counts = Counter(getattr(self, column))
+        return {values[code]: count for code, count in counts.items()}
+
+    def group_by(self, column: str) -> dict[Enum, "TaskFrame"]:
+        """Frames of tasks by values of 'status' or 'importance'"""
+        values = _ENUM_COLUMNS[column]
+        groups: dict[int, list[int]] = {}
+        for index, code in enumerate(getattr(self, column)):
+            groups.setdefault(code, []).append(index)
+        return {values[code]: self.take(indexes) for code, indexes in groups.items()}
+
+    def _row(self, index: int) -> dict:
+        data: dict = {
+            "id": self.id[index],
+            "title": self.title[index],
+            "status": _STATUSES[self.status[index]].value,
+            "importance": _IMPORTANCES[self.importance[index]].value,
+        }
+        due = _datetime(self.due_datetime[index])
+        if due:
+            data["dueDateTime"] = _datetime_converter.back_converter(due)
+        for name, column in (
+            ("createdDateTime", self.created_datetime),
+            ("lastModifiedDateTime", self.last_modified_datetime),
+        ):
+            value = _datetime(column[index])
+            if value:
+                data[name] = _iso_time_converter.back_converter(value)
+        return data
+
+    def task(self, index: int) -> Task:
+        """The row as a task, with only attributes kept in the frame.
+
+        The task isn't bound to a client, as saving it would clear all other
+        attributes. Use 'fetch' to get the whole task which can be changed."""
+        return Task.from_dict(self._row(index))
+
+    def tasks(self) -> Iterator[Task]:
+        for index in range(len(self)):
+            yield self.task(index)
+
+    def fetch(self, index: int) -> Task:
+        """The whole task of the row, downloaded from the task list of the frame"""
+        if not self.task_list:
+            raise TaskListNotSpecifiedError
+        endpoint = furl(self.task_list.ENDPOINT) / self.task_list.id / Task.ENDPOINT
+        task = self.task_list.client.get(Task, endpoint=(endpoint / self.id[index]).url)
+        task.task_list = self.task_list
+        return task
+
+    def __len__(self) -> int:
+        return len(self.id)
@@ -0,0 +1,291 @@
+import copy
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator, Optional
+
+from requests import Response, codes
+
+from .bulk import BulkResult, ProgressCallback, create_task, run_bulk
+from .client import retry_after
+from .export import SUBTASK, TASK, read_ndjson
+from .provider import AbstractProvider
+from .resources import Subtask, Task, TaskList
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveLimiter:
+    """Limits the number of concurrent requests, adapting to throttling.
+
+    The limit is halved when a request is throttled and all requests wait as
+    long as the API asked for. After every successful request the limit grows
+    by 1/limit, so by one per a limit of successful requests, up to
+    'max_concurrency' (additive increase, multiplicative decrease)."""
+
+    def __init__(self, max_concurrency: int) -> None:
+        if max_concurrency < 1:
+            raise ValueError("Concurrency must be at least 1")
+        self._max = max_concurrency
+        self._limit = float(max_concurrency)
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def acquire(self) -> None:
+        with self._condition:
+            while True:
+                delay = self._paused_until - time.monotonic()
+                if delay > 0:
+                    self._condition.wait(delay)
+                elif self._in_flight < int(self._limit):
+                    break
+                else:
+                    self._condition.wait()
+            self._in_flight += 1
+
+    def release(self, throttled_for: Optional[float] = None) -> None:
+        """Release after the request, with the delay requested by the API if
+        it was throttled"""
+        with self._condition:
+            self._in_flight -= 1
+            now = time.monotonic()
+            if throttled_for is None:
+                self._limit = min(self._max, self._limit + 1 / self._limit)
+            elif now >= self._paused_until:
+                # Requests throttled together decrease the limit once
+                self._limit = max(1.0, self._limit / 2)
+                logger.info("Throttled, concurrency limited to %d", self._limit)
+            if throttled_for is not None:
+                self._paused_until = max(self._paused_until, now + throttled_for)
+            self._condition.notify_all()
+
+
+class _BackpressureProvider(AbstractProvider):
+    """Sends requests within the limit of the limiter. Throttled responses are
+    returned, the client sends them again after the limiter waits"""
+
+    def __init__(
+        self,
+        provider: AbstractProvider,
+        limiter: AdaptiveLimiter,
+        default_delay: float = 1.0,
+    ) -> None:
+        self._provider = provider
+        self._limiter = limiter
+        self._default_delay = default_delay
+        self._lock = threading.Lock()
+        self.throttled = 0
+
+    def _send(self, request: Callable[[], Response]) -> Response:
+        self._limiter.acquire()
+        delay = None
+        try:
+            response = request()
+            if response.status_code == codes.too_many_requests:
+                delay = retry_after(response)
+                if delay is None:
+                    delay = self._default_delay
+        finally:
+            self._limiter.release(delay)
+        if delay is not None:
+            with self._lock:
+                self.throttled += 1
+        return response
+
+    def get(self, url: str, params: Optional[dict] = None) -> Response:
+        return self._send(lambda: self._provider.get(url, params=params))
+
+    def delete(self, url: str) -> Response:
+        return self._send(lambda: self._provider.delete(url))
+
+    def patch(self, url: str, json_data: dict) -> Response:
+        return self._send(lambda: self._provider.patch(url, json_data=json_data))
+
+    def post(self, url: str, json_data: dict) -> Response:
+        return self._send(lambda: self._provider.post(url, json_data=json_data))
+
+
+def _read_only_names(resource_class: type) -> set[str]:
+    return {field.dict_name for field in resource_class()._fields if field._read_only}
+
+
+_TASK_READ_ONLY = _read_only_names(Task) | {"id"}
+_SUBTASK_READ_ONLY = _read_only_names(Subtask) | {"id"}
+
+
+def _creatable(data: dict, read_only: set[str]) -> dict:
+    return {
+        name: value
+        for name, value in data.items()
+        if name not in read_only and not name.startswith("@")
+    }
+
+
+def _record_key(record: dict) -> str:
+    if record.get("id"):
+        return str(record["id"])
+    encoded = json.dumps(record, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def read_task_records(path: str) -> Iterator[dict]:
+    """Read tasks from a NDJSON file, one at a time.
+
+    Lines can be tasks as returned by the API, or records written by the
+    exporter, where subtasks follow their task and are added to its
+    'checklistItems'. Other exported records are skipped."""
+    pending: Optional[dict] = None
+    for record in read_ndjson(path):
+        kind = record.get("type")
+        if kind == SUBTASK and pending:
+            if record["parentId"] == pending.get("id"):
+                pending.setdefault("checklistItems", []).append(record["data"])
+            continue
+        if pending and (kind == TASK or not kind):
+            yield pending
+            pending = None
+        if kind == TASK:
+            pending = dict(record["data"])
+        elif not kind:
+            yield record
+    if pending:
+        yield pending
+
+
+class _Journal:
+    """Keys of imported records stored in SQLite, so they aren't kept in memory"""
+
+    def __init__(self, path: str) -> None:
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS imported (key TEXT PRIMARY KEY, id TEXT)"
+            )
+
+    def add(self, key: str, task_id: Optional[str]) -> None:
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO imported VALUES (?, ?)", (key, task_id)
+            )
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT 1 FROM imported WHERE key = ?", (key,)
+            ).fetchone()
+        return row is not None
+
+
+@dataclass
+class ImportStats:
+    """Counts of imported records. Only the first errors are kept in 'errors',
+    all of them are logged."""
+
+    created: int = 0
+    skipped: int = 0
+    failed: int = 0
+    throttled: int = 0
+    errors: list[tuple[str, BaseException]] = field(default_factory=list)
+
+
+class Importer:
+    """Creates tasks from records in the API format in the task list.
+
+    Records are read lazily and created by a pool of 'concurrency' threads,
+    so memory use doesn't depend on the number of records. Requests throttled
+    by the API are retried after the requested delay and the number of
+    concurrent requests is decreased, then it grows back while requests
+    succeed. Identifiers, read-only fields and OData annotations of records
+    are not sent.
+
+    When 'journal' path is given, keys of imported records are saved in a SQLite
+    database there, and records imported before are skipped, so a restarted
+    import doesn't duplicate tasks. The key is the 'id' of the record or a hash
+    of the whole record. A task created just before a crash can still be
+    created again. Up to 'max_errors' errors are kept in the stats."""
+
+    def __init__(
+        self,
+        task_list: TaskList,
+        concurrency: int = 8,
+        journal: Optional[str] = None,
+        max_retries: int = 5,
+        max_errors: int = 100,
+    ) -> None:
+        self._concurrency = concurrency
+        self._limiter = AdaptiveLimiter(concurrency)
+        self._provider = _BackpressureProvider(task_list.client.provider, self._limiter)
+        self._task_list = copy.copy(task_list)
+        self._task_list.client = task_list.client.with_provider(
+            self._provider, max_retries
+        )
+
+        self._lock = threading.Lock()
+        self._journal = _Journal(journal) if journal else None
+        self._max_errors = max_errors
+        self.stats = ImportStats()
+
+    def _add_error(self, key: str, error: BaseException) -> None:
+        if len(self.stats.errors) < self._max_errors:
+            self.stats.errors.append((key, error))
+
+    def _import(self, item: tuple[str, dict]) -> BulkResult:
+        key, record = item
+        data = _creatable(record, _TASK_READ_ONLY)
+        data["checklistItems"] = [
+            _creatable(subtask, _SUBTASK_READ_ONLY)
+            for subtask in record.get("checklistItems") or []
+        ]
+        task = Task.from_dict(data, client=self._task_list.client)
+        result = create_task(self._task_list, task)
+        if task.id and self._journal:
+            # Also with failed subtasks, as the task itself exists now
+            self._journal.add(key, task.id)
+        with self._lock:
+            if result.error:
+                self.stats.failed += 1
+                self._add_error(key, result.error)
+            else:
+                self.stats.created += 1
+                for _, error in result.subtask_errors:
+                    self._add_error(key, error)
+        return result
+
+    def _pending(self, records: Iterable[dict]) -> Iterator[tuple[str, dict]]:
+        for record in records:
+            key = _record_key(record)
+            if self._journal and key in self._journal:
+                with self._lock:
+                    self.stats.skipped += 1
+                continue
+            yield key, record
+
+    def run(
+        self, records: Iterable[dict], progress: Optional[ProgressCallback] = None
+    ) -> ImportStats:
+        run_bulk(
+            self._pending(records),
+            self._import,
+            self._concurrency,
+            progress,
+            keep_results=False,
+        )
+        self.stats.throttled = self._provider.throttled
+        return self.stats
+
+    def close(self) -> None:
+        if self._journal:
+            self._journal.close()
@@ -0,0 +1,176 @@
+import bisect
+import threading
+from dataclasses import dataclass, field
+from typing import Optional
+
+from furl import furl  # type: ignore
+
+_COLLECTIONS = {"lists", "tasks", "checklistItems", "users", "linkedResources"}
+_KEYWORDS = {"delta", "$batch"}
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def endpoint_template(path: str) -> str:
+    """Replace identifiers in the path with '{id}', e.g. 'todo/lists/{id}/tasks'"""
+    segments = furl(path).path.segments
+    template = []
+    previous = None
+    for segment in segments:
+        if previous in _COLLECTIONS and segment not in _KEYWORDS:
+            template.append("{id}")
+        else:
+            template.append(segment)
+        previous = segment
+    return "/".join(part for part in template if part)
+
+
+@dataclass
+class RequestInfo:
+    """Description of one request made by the client.
+
+    'endpoint' is the path relative to the client URL with identifiers replaced,
+    to group requests of the same kind. 'page' is the number of the page, counted
+    from 1, when listing a collection. 'retry' counts how many times a throttled
+    request was sent again, it's 0 for the first attempt. Fields describing the
+    response are set before calling 'after_request'; 'error' is set if the
+    request failed with an exception and there is no response."""
+
+    method: str
+    url: str
+    endpoint: str
+    page: Optional[int] = None
+    retry: int = 0
+    bytes_out: int = 0
+    status: Optional[int] = None
+    latency: Optional[float] = None
+    bytes_in: Optional[int] = None
+    error: Optional[BaseException] = None
+
+
+class RequestHook:
+    """Base for hooks notified about every request made by the client"""
+
+    def before_request(self, info: RequestInfo) -> None:
+        pass
+
+    def after_request(self, info: RequestInfo) -> None:
+        pass
+
+
+@dataclass
+class Histogram:
+    """Cumulative histogram of values, as in Prometheus"""
+
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    counts: list[int] = field(default_factory=list)
+    count: int = 0
+    sum: float = 0.0
+
+    def __post_init__(self) -> None:
+        if not self.counts:
+            self.counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the quantile by interpolating inside the bucket, the same way
+        as `histogram_quantile` of Prometheus"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+
+def _labels(**labels: str) -> str:
+    escaped = {
+        name: value.replace("\\", "\\\\").replace('"', '\\"')
+        for name, value in labels.items()
+    }
+    return ",".join(f'{name}="{value}"' for name, value in escaped.items())
+
+
+class MetricsHook(RequestHook):
+    """Collects counters and latency histograms of requests per endpoint.
+
+    Metrics are labeled with the method and the endpoint template. They can be
+    read with 'snapshot' or exported in the Prometheus text format."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self._buckets = buckets
+        self._lock = threading.Lock()
+        self.requests: dict[tuple[str, str, str], int] = {}
+        self.bytes_in: dict[tuple[str, str], int] = {}
+        self.bytes_out: dict[tuple[str, str], int] = {}
+        self.latency: dict[tuple[str, str], Histogram] = {}
+
+    def after_request(self, info: RequestInfo) -> None:
+        key = (info.method, info.endpoint)
+        status = str(info.status) if info.status else "error"
+        with self._lock:
+            requests_key = key + (status,)
+            self.requests[requests_key] = self.requests.get(requests_key, 0) + 1
+            self.bytes_out[key] = self.bytes_out.get(key, 0) + info.bytes_out
+            self.bytes_in[key] = self.bytes_in.get(key, 0) + (info.bytes_in or 0)
+            if info.latency is not None:
+                histogram = self.latency.get(key)
+                if not histogram:
+                    histogram = self.latency[key] = Histogram(self._buckets)
+                histogram.observe(info.latency)
+
+    def quantile(self, method: str, endpoint: str, q: float) -> Optional[float]:
+        """Estimated latency quantile of requests to the endpoint, in seconds"""
+        with self._lock:
+            histogram = self.latency.get((method, endpoint))
+            return histogram.quantile(q) if histogram else None
+
+    def snapshot(self) -> dict:
+        """Current values of all metrics, e.g. to pass them to another exporter"""
+        with self._lock:
+            return {
+                "requests": dict(self.requests),
+                "bytes_in": dict(self.bytes_in),
+                "bytes_out": dict(self.bytes_out),
+                "latency": {
+                    key: Histogram(h.buckets, list(h.counts), h.count, h.sum)
+                    for key, h in self.latency.items()
+                },
+            }
+
+    def to_prometheus(self, prefix: str = "todoms") -> str:
+        """Export metrics in the Prometheus text format"""
+        snapshot = self.snapshot()
+        lines = [f"# TYPE {prefix}_requests_total counter"]
+        for (method, endpoint, status), value in sorted(snapshot["requests"].items()):
+            labels = _labels(method=method, endpoint=endpoint, status=status)
+            lines.append(f"{prefix}_requests_total{{{labels}}} {value}")
+        for name in ("bytes_in", "bytes_out"):
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            for (method, endpoint), value in sorted(snapshot[name].items()):
+                labels = _labels(method=method, endpoint=endpoint)
+                lines.append(f"{prefix}_{name}_total{{{labels}}} {value}")
+
+        name = f"{prefix}_request_duration_seconds"
+        lines.append(f"# TYPE {name} histogram")
+        for (method, endpoint), histogram in sorted(snapshot["latency"].items()):
+            labels = _labels(method=method, endpoint=endpoint)
+            cumulative = 0
+            bounds = [str(b) for b in histogram.buckets] + ["+Inf"]
+            for bound, count in zip(bounds, histogram.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+            lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
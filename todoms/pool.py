@@ -0,0 +1,221 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Optional, Union
+
+from requests import Response
+
+from .client import ToDoClient
+from .provider import AbstractProvider
+
+logger = logging.getLogger(__name__)
+
+ProviderFactory = Callable[[str], AbstractProvider]
+
+
+class RateLimiter:
+    """Token bucket allowing 'rate' requests per second with bursts up to 'burst'"""
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        if rate <= 0 or burst < 1:
+            raise ValueError("Rate must be positive and burst at least 1")
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self._burst, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+    @property
+    def idle(self) -> bool:
+        """Whether the bucket is full again, so the limiter acts as a new one"""
+        with self._lock:
+            self._refill()
+            return self._tokens >= self._burst
+
+    def acquire(self) -> None:
+        """Wait until the request is allowed"""
+        with self._lock:
+            self._refill()
+            # Reserve the token now, so waiting threads are served in order
+            self._tokens -= 1
+            delay = -self._tokens / self._rate if self._tokens < 0 else 0.0
+        if delay:
+            time.sleep(delay)
+
+
+class _RateLimitedProvider(AbstractProvider):
+    def __init__(self, provider: AbstractProvider, limiter: RateLimiter) -> None:
+        self._provider = provider
+        self._limiter = limiter
+
+    def get(self, url: str, params: Optional[dict] = None) -> Response:
+        self._limiter.acquire()
+        return self._provider.get(url, params=params)
+
+    def delete(self, url: str) -> Response:
+        self._limiter.acquire()
+        return self._provider.delete(url)
+
+    def patch(self, url: str, json_data: dict) -> Response:
+        self._limiter.acquire()
+        return self._provider.patch(url, json_data=json_data)
+
+    def post(self, url: str, json_data: dict) -> Response:
+        self._limiter.acquire()
+        return self._provider.post(url, json_data=json_data)
+
+
+def _close(provider: AbstractProvider) -> None:
+    close = getattr(provider, "close", None)
+    if close:
+        close()
+
+
+class ProviderPool:
+    """Providers of many identities, created by 'factory' on the first use.
+
+    At most 'max_size' providers are kept, the least recently used one is
+    evicted with its sessions and token. If the evicted provider has a 'close'
+    method, it's called. Providers of different identities are created
+    concurrently, a provider of one identity is created by one thread and
+    others wait for it. If the factory fails, they get the same error."""
+
+    def __init__(self, factory: ProviderFactory, max_size: int = 1000) -> None:
+        self._factory = factory
+        self._max_size = max_size
+        self._providers: "OrderedDict[str, AbstractProvider]" = OrderedDict()
+        self._creating: dict[str, "Future[AbstractProvider]"] = {}
+        self._lock = threading.Lock()
+
+    def _cached(self, tenant: str) -> Optional[AbstractProvider]:
+        with self._lock:
+            provider = self._providers.get(tenant)
+            if provider is not None:
+                self._providers.move_to_end(tenant)
+            return provider
+
+    def _create(self, tenant: str) -> AbstractProvider:
+        with self._lock:
+            # Another thread could create it since it was looked up
+            provider = self._providers.get(tenant)
+            if provider is not None:
+                return provider
+            creating = self._creating.get(tenant)
+            if creating is None:
+                future = self._creating[tenant] = Future()
+        if creating is not None:
+            return creating.result()
+
+        try:
+            provider = self._factory(tenant)
+        except BaseException as exc:
+            with self._lock:
+                del self._creating[tenant]
+            future.set_exception(exc)
+            raise
+        with self._lock:
+            self._providers[tenant] = provider
+            del self._creating[tenant]
+        future.set_result(provider)
+        return provider
+
+    def get(self, tenant: str) -> AbstractProvider:
+        provider = self._cached(tenant)
+        if provider is not None:
+            return provider
+        # The factory can make requests, so it isn't called under the lock
+        provider = self._create(tenant)
+        with self._lock:
+            evicted = []
+            while len(self._providers) > self._max_size:
+                evicted.append(self._providers.popitem(last=False))
+        for evicted_tenant, evicted_provider in evicted:
+            logger.debug("Evicting provider of %s", evicted_tenant)
+            _close(evicted_provider)
+        return provider
+
+    def evict(self, tenant: str) -> None:
+        with self._lock:
+            provider = self._providers.pop(tenant, None)
+        if provider is not None:
+            _close(provider)
+
+    def __contains__(self, tenant: str) -> bool:
+        return tenant in self._providers
+
+    def __len__(self) -> int:
+        return len(self._providers)
+
+
+class ClientPool:
+    """Source of clients for many mailboxes, served from one process.
+
+    'provider' can be a single provider authorized to access all mailboxes,
+    e.g. with application permissions, or a 'ProviderPool' with a provider per
+    mailbox. Every client uses the 'users/<user_id>' prefix, so creating it is
+    cheap, while the sessions and tokens are shared through the provider.
+
+    When 'rate' is given, requests of each user are limited to 'rate' per
+    second with bursts up to 'burst'. Limiters of at most 'max_users' recently
+    used users are kept, besides limiters of users still being limited."""
+
+    def __init__(
+        self,
+        provider: Union[AbstractProvider, ProviderPool],
+        api_url: str = "https://graph.microsoft.com/beta",
+        rate: Optional[float] = None,
+        burst: int = 1,
+        max_users: int = 1000,
+    ) -> None:
+        self._provider = provider
+        self._api_url = api_url
+        self._rate = rate
+        self._burst = burst
+        self._max_users = max_users
+        self._limiters: "OrderedDict[str, RateLimiter]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _evict_limiters(self, keep: str) -> None:
+        # Only full buckets are evicted, a new limiter of the user is the same
+        excess = len(self._limiters) - self._max_users
+        evicted: list[str] = []
+        for user_id, limiter in self._limiters.items():
+            if len(evicted) >= excess:
+                break
+            if user_id != keep and limiter.idle:
+                evicted.append(user_id)
+        for user_id in evicted:
+            del self._limiters[user_id]
+
+    def _limiter(self, user_id: str) -> RateLimiter:
+        with self._lock:
+            limiter = self._limiters.get(user_id)
+            if limiter is not None:
+                self._limiters.move_to_end(user_id)
+                return limiter
+            limiter = self._limiters[user_id] = RateLimiter(
+                self._rate, self._burst  # type: ignore
+            )
+            self._evict_limiters(keep=user_id)
+            return limiter
+
+    def client(self, user_id: str) -> ToDoClient:
+        """Return a client accessing resources of the given user"""
+        if isinstance(self._provider, ProviderPool):
+            provider = self._provider.get(user_id)
+        else:
+            provider = self._provider
+        if self._rate:
+            provider = _RateLimitedProvider(provider, self._limiter(user_id))
+        return ToDoClient(
+            provider, api_url=self._api_url, api_prefix=f"users/{user_id}"
+        )
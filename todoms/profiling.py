@@ -0,0 +1,157 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from .convertable import BaseConvertableFieldsObject
+from .fields import Field
+
+DECODE = "decode"
+ENCODE = "encode"
+
+
+@dataclass
+class ProfileEntry:
+    """Time spent converting one field, or the whole object when 'field' is None.
+
+    Times are cumulative, so time of a nested object, like a subtask, is counted
+    in its own entries and in the field containing it."""
+
+    resource: str
+    field: Optional[str]
+    converter: Optional[str]
+    direction: str
+    calls: int = 0
+    total_time: float = 0.0
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.calls if self.calls else 0.0
+
+
+class ConversionProfiler:
+    """Measures conversions of resources from and to dicts.
+
+    While enabled, methods of fields and convertable objects are replaced with
+    measuring ones, so disabled profiler doesn't cost anything. Only one profiler
+    can be enabled at a time::
+
+        with ConversionProfiler() as profiler:
+            tasks = list(task_list.tasks)
+        print(profiler.format_report())
+    """
+
+    _active: Optional["ConversionProfiler"] = None
+    _active_lock = threading.Lock()
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: dict[tuple, ProfileEntry] = {}
+        self._originals: dict[tuple[type, str], Callable] = {}
+
+    def _record(
+        self,
+        instance: Any,
+        field: Optional[Field],
+        direction: str,
+        elapsed: float,
+    ) -> None:
+        key = (type(instance), field, direction)
+        with self._lock:
+            entry = self._entries.get(key)
+            if not entry:
+                entry = self._entries[key] = ProfileEntry(
+                    type(instance).__name__,
+                    field.name if field else None,
+                    type(field._converter).__name__ if field else None,
+                    direction,
+                )
+            entry.calls += 1
+            entry.total_time += elapsed
+
+    def _wrap_field(self, original: Callable, direction: str) -> Callable:
+        def measured(field: Field, instance: Any, *args: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return original(field, instance, *args)
+            finally:
+                self._record(instance, field, direction, time.perf_counter() - start)
+
+        return measured
+
+    def _wrap_object(self, original: Callable, direction: str) -> Callable:
+        def measured(instance: Any, *args: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return original(instance, *args)
+            finally:
+                self._record(instance, None, direction, time.perf_counter() - start)
+
+        return measured
+
+    def _patch(self, cls: type, name: str, wrapper: Callable) -> None:
+        original = cls.__dict__[name]
+        self._originals[(cls, name)] = original
+        setattr(cls, name, wrapper(original))
+
+    def enable(self) -> None:
+        with self._active_lock:
+            if ConversionProfiler._active:
+                raise RuntimeError("Another conversion profiler is already enabled")
+            ConversionProfiler._active = self
+        self._patch(Field, "from_dict", lambda f: self._wrap_field(f, DECODE))
+        self._patch(Field, "to_dict", lambda f: self._wrap_field(f, ENCODE))
+        self._patch(
+            BaseConvertableFieldsObject,
+            "_from_dict",
+            lambda f: self._wrap_object(f, DECODE),
+        )
+        self._patch(
+            BaseConvertableFieldsObject,
+            "to_dict",
+            lambda f: self._wrap_object(f, ENCODE),
+        )
+
+    def disable(self) -> None:
+        with self._active_lock:
+            if ConversionProfiler._active is not self:
+                return
+            for (cls, name), original in self._originals.items():
+                setattr(cls, name, original)
+            self._originals.clear()
+            ConversionProfiler._active = None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def report(self, direction: Optional[str] = None) -> list[ProfileEntry]:
+        """Entries sorted from the most time consuming"""
+        with self._lock:
+            entries = [
+                ProfileEntry(**vars(entry))
+                for entry in self._entries.values()
+                if not direction or entry.direction == direction
+            ]
+        return sorted(entries, key=lambda entry: entry.total_time, reverse=True)
+
+    def format_report(self, limit: Optional[int] = 20) -> str:
+        lines = [
+            f"{'resource':<20} {'field':<24} {'converter':<28} {'dir':<6} "
+            f"{'calls':>8} {'total ms':>10} {'mean us':>10}"
+        ]
+        for entry in self.report()[:limit]:
+            lines.append(
+                f"{entry.resource:<20} {entry.field or '*':<24} "
+                f"{entry.converter or '':<28} {entry.direction:<6} "
+                f"{entry.calls:>8} {entry.total_time * 1000:>10.3f} "
+                f"{entry.mean_time * 1_000_000:>10.1f}"
+            )
+        return "\n".join(lines)
+
+    def __enter__(self) -> "ConversionProfiler":
+        self.enable()
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.disable()
@@ -1,4 +1,17 @@
 from .base import AbstractProvider
 from .browser_provider import WebBrowserProvider
+from .headless import FileTokenCache, HeadlessProvider, MemoryTokenCache, TokenCache
+from .oauth import BaseOAuth2Provider
+from .recording import RecordingProvider, ReplayProvider
 
-__all__ = ["WebBrowserProvider", "AbstractProvider"]
+__all__ = [
+    "WebBrowserProvider",
+    "AbstractProvider",
+    "BaseOAuth2Provider",
+    "HeadlessProvider",
+    "TokenCache",
+    "MemoryTokenCache",
+    "FileTokenCache",
+    "RecordingProvider",
+    "ReplayProvider",
+]
@@ -4,13 +4,14 @@ import webbrowser
 import wsgiref.simple_server
 import wsgiref.util
 from base64 import urlsafe_b64encode
-from typing import Any, Callable, Optional
+from typing import Any, Callable
 
 from furl import furl  # type: ignore
-from requests import Response
 from requests_oauthlib import OAuth2Session  # type: ignore
 
-from .base import AbstractProvider
+from .oauth import BaseOAuth2Provider, RequestBeforeAuthenticatedError
+
+__all__ = ["WebBrowserProvider", "RequestBeforeAuthenticatedError"]
 
 
 class _LocalRedirectHandlingApp(object):
@@ -26,14 +27,9 @@ class _LocalRedirectHandlingApp(object):
         return [self._message.encode("utf-8")]
 
 
-class RequestBeforeAuthenticatedError(Exception):
-    """Try to execute request before authenticate"""
-
-
-class WebBrowserProvider(AbstractProvider):
+class WebBrowserProvider(BaseOAuth2Provider):
     """An provider that can call webbrowser to open sign-in page"""
 
-    _SCOPES = "profile openid User.Read Calendars.Read Tasks.ReadWrite"
     _DEFAULT_OPEN_MESSAGE = (
         "Open following page in your webbrowser and finish singing in:"
     )
@@ -51,20 +47,14 @@ class WebBrowserProvider(AbstractProvider):
         open_message: str = _DEFAULT_OPEN_MESSAGE,
         finish_message: str = _DEFAULT_FINISH_MESSAGE,
     ):
-        self._app_id = app_id
-        self._app_secret = app_secret
-        self._open_message = open_message
-        self._finish_message = finish_message
-
         authority_url = furl(authority)
+        super().__init__(app_id, app_secret, (authority_url / token_endpoint).url)
         self._authorize_url = (authority_url / authorize_endpoint).url
-        self._token_url = (authority_url / token_endpoint).url
+        self._open_message = open_message
+        self._finish_message = finish_message
 
         self._session: OAuth2Session
 
-    def _save_token(self, token: dict) -> None:
-        self._token = token
-
     def _replace_http_into_https(self, url: str) -> str:
         """OAuthLib strictly expects HTTPS protocol, even for localhost"""
         if url.startswith("http://"):
@@ -72,15 +62,10 @@ class WebBrowserProvider(AbstractProvider):
         return url
 
     def _build_session(self, redirect_url: str) -> OAuth2Session:
-        refresh_params = {"client_id": self._app_id, "client_secret": self._app_secret}
-
         session = OAuth2Session(
             self._app_id,
             scope=self._SCOPES,
             redirect_uri=self._replace_http_into_https(redirect_url),
-            auto_refresh_url=self._token_url,
-            auto_refresh_kwargs=refresh_params,
-            token_updater=self._save_token,
         )
         # Workaround for InsecureTransportError from OAuthLib for http://localhost
         session.redirect_uri = redirect_url
@@ -127,7 +112,7 @@ class WebBrowserProvider(AbstractProvider):
             "Content-Type": "application/x-www-form-urlencoded;charset=UTF-8",
             "Origin": "http://localhost",
         }
-        self._token = self._session.fetch_token(
+        token = self._session.fetch_token(
             self._token_url,
             # client_secret=self._app_secret,
             include_client_id=True,
@@ -137,27 +122,4 @@ class WebBrowserProvider(AbstractProvider):
             code_verifier=code_verifier,
             headers=headers,
         )
-
-    def get(self, url: str, params: Optional[dict] = None) -> Response:
-        if not self._token:
-            raise RequestBeforeAuthenticatedError
-
-        return self._session.get(url=url, params=params)  # type: ignore
-
-    def delete(self, url: str) -> Response:
-        if not self._token:
-            raise RequestBeforeAuthenticatedError
-
-        return self._session.delete(url=url)  # type: ignore
-
-    def patch(self, url: str, json_data: dict) -> Response:
-        if not self._token:
-            raise RequestBeforeAuthenticatedError
-
-        return self._session.patch(url=url, json=json_data)  # type: ignore
-
-    def post(self, url: str, json_data: dict) -> Response:
-        if not self._token:
-            raise RequestBeforeAuthenticatedError
-
-        return self._session.post(url=url, json=json_data)  # type: ignore
+        self._save_token(token)
@@ -0,0 +1,194 @@
+import json
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from furl import furl  # type: ignore
+from oauthlib.oauth2 import BackendApplicationClient  # type: ignore
+from requests_oauthlib import OAuth2Session  # type: ignore
+
+from .oauth import BaseOAuth2Provider
+
+logger = logging.getLogger(__name__)
+
+
+class TokenNotAvailableError(Exception):
+    """There is no token in the cache and no way to obtain a new one"""
+
+
+class TokenCache(ABC):
+    """Storage of the token between runs of the application"""
+
+    @abstractmethod
+    def load(self) -> Optional[dict]:
+        """Return saved token or None if there is no one"""
+
+    @abstractmethod
+    def save(self, token: dict) -> None:
+        """Save token, replacing the previous one"""
+
+
+class MemoryTokenCache(TokenCache):
+    """Keeps the token only in the memory of the process"""
+
+    def __init__(self, token: Optional[dict] = None) -> None:
+        self._token = token
+
+    def load(self) -> Optional[dict]:
+        return self._token
+
+    def save(self, token: dict) -> None:
+        self._token = token
+
+
+class FileTokenCache(TokenCache):
+    """Keeps the token in a file readable only by the owner.
+
+    The token is saved as JSON. To store it encrypted or in another format,
+    override '_encode' and '_decode'."""
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+
+    def _encode(self, token: dict) -> bytes:
+        return json.dumps(token).encode("utf-8")
+
+    def _decode(self, data: bytes) -> dict:
+        return json.loads(data.decode("utf-8"))  # type: ignore
+
+    def load(self) -> Optional[dict]:
+        try:
+            with open(self._path, "rb") as file:
+                return self._decode(file.read())
+        except FileNotFoundError:
+            return None
+
+    def save(self, token: dict) -> None:
+        temporary_path = f"{self._path}.tmp"
+        descriptor = os.open(
+            temporary_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600
+        )
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(self._encode(token))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, self._path)
+
+
+class HeadlessProvider(BaseOAuth2Provider):
+    """A provider for applications without user interaction.
+
+    The token is loaded from 'token_cache' and saved there every time it's
+    changed. When the cache is empty, the token is obtained with 'refresh_token'
+    if given, or with the client credentials grant if 'client_credentials' is
+    True. The client credentials grant requires application permissions and
+    'scopes' for it defaults to the '.default' scope of Microsoft Graph.
+
+    The token is refreshed in the background 'refresh_margin' seconds before
+    it expires, so requests don't wait for the refresh. Call 'close' to stop
+    the background refreshing."""
+
+    _CLIENT_CREDENTIALS_SCOPES = "https://graph.microsoft.com/.default"
+    _RETRY_DELAY = 30.0
+
+    def __init__(
+        self,
+        app_id: str,
+        app_secret: str,
+        token_cache: Optional[TokenCache] = None,
+        refresh_token: Optional[str] = None,
+        client_credentials: bool = False,
+        scopes: Optional[str] = None,
+        authority: str = "https://login.microsoftonline.com/common/",
+        token_endpoint: str = "oauth2/v2.0/token",
+        refresh_margin: float = 300.0,
+        background_refresh: bool = True,
+    ):
+        super().__init__(app_id, app_secret, (furl(authority) / token_endpoint).url)
+        self._token_cache = token_cache or MemoryTokenCache()
+        self._bootstrap_refresh_token = refresh_token
+        self._client_credentials = client_credentials
+        if scopes:
+            self._SCOPES = scopes
+        elif client_credentials:
+            self._SCOPES = self._CLIENT_CREDENTIALS_SCOPES
+        self._refresh_margin = refresh_margin
+        self._background_refresh = background_refresh
+
+        self._closed = threading.Event()
+        self._refresher: Optional[threading.Thread] = None
+
+    def _save_token(self, token: dict) -> None:
+        with self._token_lock:
+            super()._save_token(token)
+            self._token_cache.save(token)
+
+    def _fetch_client_credentials_token(self) -> dict:
+        session = OAuth2Session(client=BackendApplicationClient(client_id=self._app_id))
+        return session.fetch_token(  # type: ignore
+            self._token_url,
+            client_id=self._app_id,
+            client_secret=self._app_secret,
+            include_client_id=True,
+            scope=self._SCOPES,
+        )
+
+    def _fetch_refreshed_token(self, token: dict) -> Optional[dict]:
+        if "refresh_token" not in token and self._client_credentials:
+            return self._fetch_client_credentials_token()
+        return super()._fetch_refreshed_token(token)
+
+    def _seconds_to_refresh(self) -> Optional[float]:
+        with self._token_lock:
+            expires_at = (self._token or {}).get("expires_at")
+        if expires_at is None:
+            return None
+        return max(float(expires_at) - self._refresh_margin - time.time(), 0.0)
+
+    def _run_refresher(self) -> None:
+        delay = self._seconds_to_refresh()
+        while not self._closed.wait(delay):
+            try:
+                if not self._refresh_token(self._token_version):
+                    logger.warning("Token can't be refreshed in the background")
+                    return
+                delay = self._seconds_to_refresh()
+            except Exception:
+                logger.warning(
+                    "Refreshing token in the background failed", exc_info=True
+                )
+                delay = self._RETRY_DELAY
+
+    def authorize(self) -> None:
+        """Load the token from the cache or obtain a new one, then start
+        refreshing it in the background"""
+        token = self._token_cache.load()
+        if token:
+            logger.debug("Token loaded from the cache")
+            with self._token_lock:
+                super()._save_token(token)
+        elif self._bootstrap_refresh_token:
+            token = self._fetch_refreshed_token(
+                {"refresh_token": self._bootstrap_refresh_token}
+            )
+            self._save_token(token)  # type: ignore
+        elif self._client_credentials:
+            self._save_token(self._fetch_client_credentials_token())
+        else:
+            raise TokenNotAvailableError
+
+        if self._background_refresh and not self._refresher:
+            self._refresher = threading.Thread(
+                target=self._run_refresher, name="todoms-token-refresh", daemon=True
+            )
+            self._refresher.start()
+
+    def close(self) -> None:
+        """Stop refreshing the token in the background"""
+        self._closed.set()
+        if self._refresher:
+            self._refresher.join()
+            self._refresher = None
@@ -0,0 +1,109 @@
+import logging
+import threading
+from typing import Any, Optional
+
+from oauthlib.oauth2 import TokenExpiredError  # type: ignore
+from requests import Response, codes
+from requests_oauthlib import OAuth2Session  # type: ignore
+
+from .base import AbstractProvider
+
+logger = logging.getLogger(__name__)
+
+
+class RequestBeforeAuthenticatedError(Exception):
+    """Try to execute request before authenticate"""
+
+
+class BaseOAuth2Provider(AbstractProvider):
+    """Base for providers authorizing requests with OAuth2 tokens.
+
+    The provider can be shared between threads. Every thread uses its own HTTP
+    session with the common token. When the token expires or is rejected, it's
+    refreshed only once, even if many threads notice it at the same time."""
+
+    _SCOPES = "profile openid User.Read Calendars.Read Tasks.ReadWrite"
+
+    def __init__(self, app_id: str, app_secret: str, token_url: str) -> None:
+        self._app_id = app_id
+        self._app_secret = app_secret
+        self._token_url = token_url
+
+        self._token: Optional[dict] = None
+        self._token_version = 0
+        self._token_lock = threading.RLock()
+        self._local = threading.local()
+
+    def _save_token(self, token: dict) -> None:
+        with self._token_lock:
+            self._token = token
+            self._token_version += 1
+
+    def _thread_session(self) -> OAuth2Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = OAuth2Session(
+                self._app_id, scope=self._SCOPES
+            )
+            self._local.token_version = None
+        if self._local.token_version != self._token_version:
+            with self._token_lock:
+                session.token = self._token
+                self._local.token_version = self._token_version
+        return session
+
+    def _fetch_refreshed_token(self, token: dict) -> Optional[dict]:
+        """Get a new token replacing the given one. Return None if not possible"""
+        if "refresh_token" not in token:
+            return None
+        session = OAuth2Session(self._app_id, token=token, scope=self._SCOPES)
+        return session.refresh_token(  # type: ignore
+            self._token_url,
+            refresh_token=token["refresh_token"],
+            client_id=self._app_id,
+            client_secret=self._app_secret,
+        )
+
+    def _refresh_token(self, seen_version: int) -> bool:
+        """Refresh the token, unless it was already refreshed since the request
+        started. Return False if the token can't be refreshed."""
+        with self._token_lock:
+            if seen_version != self._token_version:
+                return True
+            if not self._token:
+                return False
+            logger.debug("Refreshing token")
+            token = self._fetch_refreshed_token(self._token)
+            if not token:
+                return False
+            self._save_token(token)
+            return True
+
+    def _request(self, method: str, url: str, **kwargs: Any) -> Response:
+        if not self._token:
+            raise RequestBeforeAuthenticatedError
+
+        seen_version = self._token_version
+        try:
+            response = self._thread_session().request(method, url, **kwargs)
+            if response.status_code != codes.unauthorized:
+                return response  # type: ignore
+            if not self._refresh_token(seen_version):
+                return response  # type: ignore
+        except TokenExpiredError:
+            if not self._refresh_token(seen_version):
+                raise
+
+        return self._thread_session().request(method, url, **kwargs)  # type: ignore
+
+    def get(self, url: str, params: Optional[dict] = None) -> Response:
+        return self._request("GET", url, params=params)
+
+    def delete(self, url: str) -> Response:
+        return self._request("DELETE", url)
+
+    def patch(self, url: str, json_data: dict) -> Response:
+        return self._request("PATCH", url, json=json_data)
+
+    def post(self, url: str, json_data: dict) -> Response:
+        return self._request("POST", url, json=json_data)
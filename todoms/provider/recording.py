@@ -0,0 +1,175 @@
+import gzip
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from typing import IO, Any, Callable, Optional
+
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+from .base import AbstractProvider
+
+BodyMatcher = Callable[[Optional[dict]], Any]
+
+# The content is saved decoded, so headers describing its transfer don't apply
+_TRANSFER_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+class ReplayMismatchError(LookupError):
+    """There is no recorded response for the request"""
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, f"{mode}t", encoding="utf-8")  # type: ignore
+    return open(path, mode, encoding="utf-8")
+
+
+def _request_key(
+    method: str, url: str, params: Optional[dict], body: Optional[dict]
+) -> str:
+    return json.dumps([method, url, params or None, body], sort_keys=True)
+
+
+class RecordingProvider(AbstractProvider):
+    """Wraps a provider and saves all requests with responses in a file.
+
+    Every exchange is one JSON line. If 'path' ends with '.gz', the file is
+    compressed. The recording can be served back by 'ReplayProvider'."""
+
+    def __init__(self, provider: AbstractProvider, path: str) -> None:
+        self._provider = provider
+        self._file = _open(path, "w")
+        self._lock = threading.Lock()
+
+    def _record(
+        self,
+        method: str,
+        url: str,
+        response: Response,
+        params: Optional[dict] = None,
+        body: Optional[dict] = None,
+    ) -> Response:
+        entry = {
+            "method": method,
+            "url": url,
+            "params": params or None,
+            "body": body,
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {
+                name: value
+                for name, value in response.headers.items()
+                if name.lower() not in _TRANSFER_HEADERS
+            },
+            "content": response.content.decode("utf-8"),
+        }
+        with self._lock:
+            self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            self._file.flush()
+        return response
+
+    def get(self, url: str, params: Optional[dict] = None) -> Response:
+        response = self._provider.get(url, params=params)
+        return self._record("GET", url, response, params=params)
+
+    def delete(self, url: str) -> Response:
+        return self._record("DELETE", url, self._provider.delete(url))
+
+    def patch(self, url: str, json_data: dict) -> Response:
+        response = self._provider.patch(url, json_data=json_data)
+        return self._record("PATCH", url, response, body=json_data)
+
+    def post(self, url: str, json_data: dict) -> Response:
+        response = self._provider.post(url, json_data=json_data)
+        return self._record("POST", url, response, body=json_data)
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self) -> "RecordingProvider":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+
+class ReplayProvider(AbstractProvider):
+    """Serves responses recorded by 'RecordingProvider' without network.
+
+    Responses to the same request are served in the recorded order, the last
+    one is repeated when the recording is exhausted. Every response is delayed
+    by 'latency' seconds plus the time of transferring its content with
+    'bandwidth' bytes per second, when given.
+
+    Requests match recorded ones with equal bodies. 'body_matcher' can map
+    bodies to JSON values compared instead, e.g. to skip changing fields or
+    ignore bodies with 'lambda body: None'."""
+
+    def __init__(
+        self,
+        path: str,
+        latency: float = 0.0,
+        bandwidth: Optional[float] = None,
+        body_matcher: Optional[BodyMatcher] = None,
+    ) -> None:
+        self._latency = latency
+        self._bandwidth = bandwidth
+        self._body_matcher = body_matcher or (lambda body: body)
+        self._responses: defaultdict[str, deque[dict]] = defaultdict(deque)
+        self._lock = threading.Lock()
+        with _open(path, "r") as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                key = _request_key(
+                    entry["method"],
+                    entry["url"],
+                    entry["params"],
+                    self._body_matcher(entry["body"]),
+                )
+                self._responses[key].append(entry)
+
+    def _replay(
+        self,
+        method: str,
+        url: str,
+        params: Optional[dict] = None,
+        body: Optional[dict] = None,
+    ) -> Response:
+        key = _request_key(method, url, params, self._body_matcher(body))
+        with self._lock:
+            responses = self._responses.get(key)
+            if not responses:
+                raise ReplayMismatchError(f"No recorded response for {method} {url}")
+            entry = responses.popleft() if len(responses) > 1 else responses[0]
+
+        response = Response()
+        response.status_code = entry["status"]
+        response.reason = entry["reason"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.url = url
+        response.encoding = "utf-8"
+        response._content = entry["content"].encode("utf-8")
+
+        delay = self._latency
+        if self._bandwidth:
+            delay += len(response._content) / self._bandwidth
+        if delay:
+            time.sleep(delay)
+        return response
+
+    def get(self, url: str, params: Optional[dict] = None) -> Response:
+        return self._replay("GET", url, params=params)
+
+    def delete(self, url: str) -> Response:
+        return self._replay("DELETE", url)
+
+    def patch(self, url: str, json_data: dict) -> Response:
+        return self._replay("PATCH", url, body=json_data)
+
+    def post(self, url: str, json_data: dict) -> Response:
+        return self._replay("POST", url, body=json_data)
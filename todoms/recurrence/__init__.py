@@ -1,13 +1,69 @@
 from dataclasses import dataclass
+from datetime import date, datetime, tzinfo
+from functools import lru_cache
+from typing import Iterator, Optional
 
+from dateutil import rrule
+
+from ..converters.interning import Shareable
+from .ical import format_rule, parse_rule
 from .patterns import BaseRecurrencePattern
-from .ranges import BaseRecurrenceRange
+from .ranges import BaseRecurrenceRange, _as_datetime
+
+
+@lru_cache(maxsize=1024)
+def _compile(value: str, dtstart: datetime) -> rrule.rrule:
+    # Rules are immutable, so the same recurrences of many tasks share one
+    return rrule.rrulestr(value, dtstart=dtstart)  # type: ignore
 
 
 @dataclass
-class Recurrence:
+class Recurrence(Shareable):
     pattern: BaseRecurrencePattern
     range: BaseRecurrenceRange
 
     def to_dict(self) -> dict:
         return {"pattern": self.pattern.to_dict(), "range": self.range.to_dict()}
+
+    def _rrule(self, tz: Optional[tzinfo] = None) -> str:
+        options = {**self.pattern._rule_options(), **self.range._rule_options()}
+        return format_rule(options, tz)
+
+    def to_rrule(self) -> str:
+        """The recurrence as iCalendar RRULE value, e.g. 'FREQ=DAILY;INTERVAL=2'.
+
+        The start date of the range isn't a part of RRULE."""
+        return self._rrule()
+
+    @classmethod
+    def from_rrule(cls, value: str, start_date: Optional[date] = None) -> "Recurrence":
+        """Recurrence of iCalendar RRULE value, starting at 'start_date'.
+
+        Raises ValueError for rules which can't be represented by the API."""
+        pattern, range_ = parse_rule(value, start_date)
+        return cls(pattern, range_)
+
+    def rule(self, start: Optional[datetime] = None) -> rrule.rrule:
+        """The recurrence as dateutil's rule.
+
+        Occurrences start at the start date of the range, or at 'start' if the
+        range has no start date. Rules are cached, so the same recurrences
+        share one rule object."""
+        dtstart = _as_datetime(self.range.start_date) or start
+        if dtstart is None:
+            raise ValueError("Recurrence has no start date")
+        if start and start.tzinfo and not dtstart.tzinfo:
+            dtstart = dtstart.replace(tzinfo=start.tzinfo)
+        return _compile(self._rrule(dtstart.tzinfo), dtstart)
+
+    def occurrences(
+        self, start: datetime, end: Optional[datetime] = None
+    ) -> Iterator[datetime]:
+        """Due dates between 'start' and 'end', both inclusive, generated lazily.
+
+        Without 'end', occurrences are generated until the end of the range,
+        which may never come."""
+        for occurrence in self.rule(start).xafter(start, inc=True):
+            if end and occurrence > end:
+                return
+            yield occurrence
@@ -0,0 +1,158 @@
+from datetime import date, datetime, timezone, tzinfo
+from typing import Optional
+
+from dateutil import parser, rrule
+
+from ..attributes import Weekday, WeekIndex
+from .patterns import (
+    _SET_POSITIONS,
+    _WEEKDAYS,
+    BaseRecurrencePattern,
+    Daily,
+    MonthlyAbsolute,
+    MonthlyRelative,
+    Weekly,
+    YearlyAbsolute,
+    YearlyRelative,
+)
+from .ranges import BaseRecurrenceRange, EndDate, NoEnd, Numbered
+
+_FREQUENCIES = {
+    rrule.DAILY: "DAILY",
+    rrule.WEEKLY: "WEEKLY",
+    rrule.MONTHLY: "MONTHLY",
+    rrule.YEARLY: "YEARLY",
+}
+_DAY_CODES = {str(weekday): day for day, weekday in _WEEKDAYS.items()}
+_INDEXES = {str(position): index for index, position in _SET_POSITIONS.items()}
+
+
+def _format_list(value: object) -> str:
+    if isinstance(value, (list, tuple)):
+        return ",".join(str(item) for item in value)
+    return str(value)
+
+
+def _format_until(value: datetime, tz: Optional[tzinfo]) -> str:
+    if tz is None:
+        return value.strftime("%Y%m%dT%H%M%S")
+    # With a timezone-aware start, the end must be given in UTC
+    value = value.replace(tzinfo=tz).astimezone(timezone.utc)
+    return value.strftime("%Y%m%dT%H%M%SZ")
+
+
+def format_rule(options: dict, tz: Optional[tzinfo] = None) -> str:
+    """RRULE value of dateutil's rrule arguments.
+
+    The end of the recurrence is written in UTC when 'tz' of the start is given,
+    as RFC 5545 requires."""
+    parts = [f"FREQ={_FREQUENCIES[options['freq']]}"]
+    for name in ("interval", "bymonth", "bymonthday", "byweekday", "bysetpos"):
+        if name in options:
+            key = "BYDAY" if name == "byweekday" else name.upper()
+            parts.append(f"{key}={_format_list(options[name])}")
+    if "wkst" in options:
+        parts.append(f"WKST={options['wkst']}")
+    if "count" in options:
+        parts.append(f"COUNT={options['count']}")
+    if "until" in options:
+        parts.append(f"UNTIL={_format_until(options['until'], tz)}")
+    return ";".join(parts)
+
+
+def _split(value: str) -> dict[str, str]:
+    value = value.strip()
+    if value.upper().startswith("RRULE:"):
+        value = value[len("RRULE:") :]
+    parts = {}
+    for part in value.split(";"):
+        name, separator, part_value = part.partition("=")
+        if not separator:
+            raise ValueError(f"Invalid RRULE part '{part}'")
+        parts[name.strip().upper()] = part_value.strip().upper()
+    return parts
+
+
+def _day(code: str) -> Weekday:
+    if code not in _DAY_CODES:
+        raise ValueError(f"Invalid day of week '{code}'")
+    return _DAY_CODES[code]
+
+
+def _optional_int(value: Optional[str]) -> Optional[int]:
+    return int(value) if value else None
+
+
+def _parse_relative(parts: dict[str, str]) -> tuple[list[Weekday], WeekIndex]:
+    """Days of week and which of them, as 'BYDAY=MO,TU;BYSETPOS=2' or '2MO'"""
+    codes = parts.pop("BYDAY").split(",")
+    position = parts.pop("BYSETPOS", None)
+    ordinals = {code[:-2] for code in codes}
+    if ordinals != {""}:
+        if position or len(codes) > 1:
+            raise ValueError("Ordinals of many days of week are not supported")
+        position = ordinals.pop()
+    index = _INDEXES.get((position or "").lstrip("+"))
+    if not index:
+        raise ValueError(f"Unsupported position of days of week '{position}'")
+    return [_day(code[-2:]) for code in codes], index
+
+
+def _parse_pattern(parts: dict[str, str]) -> BaseRecurrencePattern:
+    """The pattern, taking only parts it uses from 'parts'"""
+    frequency = parts.pop("FREQ", None)
+    interval = int(parts.pop("INTERVAL", "1"))
+    if frequency == "DAILY":
+        return Daily(interval=interval)
+    if frequency == "WEEKLY":
+        codes = parts.pop("BYDAY", None)
+        return Weekly(
+            interval=interval,
+            days_of_week=[_day(code) for code in codes.split(",")] if codes else None,
+            week_start=_day(parts.pop("WKST", "MO")),
+        )
+    if frequency not in ("MONTHLY", "YEARLY"):
+        raise ValueError(f"Unsupported FREQ={frequency}")
+
+    month = _optional_int(parts.pop("BYMONTH", None)) if frequency == "YEARLY" else None
+    if "BYDAY" in parts:
+        days, index = _parse_relative(parts)
+        if frequency == "MONTHLY":
+            return MonthlyRelative(interval=interval, days_of_week=days, index=index)
+        return YearlyRelative(
+            interval=interval, days_of_week=days, month=month, index=index
+        )
+    day_of_month = _optional_int(parts.pop("BYMONTHDAY", None))
+    if frequency == "MONTHLY":
+        return MonthlyAbsolute(interval=interval, day_of_month=day_of_month)
+    return YearlyAbsolute(interval=interval, day_of_month=day_of_month, month=month)
+
+
+def _parse_range(
+    parts: dict[str, str], start_date: Optional[date]
+) -> BaseRecurrenceRange:
+    count = parts.pop("COUNT", None)
+    until = parts.pop("UNTIL", None)
+    if count and until:
+        raise ValueError("COUNT and UNTIL can't be used together")
+    if count:
+        return Numbered(start_date=start_date, occurrences=int(count))
+    if until:
+        return EndDate(start_date=start_date, end_date=parser.parse(until).date())
+    return NoEnd(start_date=start_date)
+
+
+def parse_rule(
+    value: str, start_date: Optional[date] = None
+) -> tuple[BaseRecurrencePattern, BaseRecurrenceRange]:
+    """Pattern and range of a RRULE value, with an optional 'RRULE:' prefix.
+
+    RRULE has no start, so it can be given as 'start_date'. Rules which
+    can't be represented by the API, including rules with parts the pattern
+    doesn't use, raise ValueError."""
+    parts = _split(value)
+    pattern = _parse_pattern(parts)
+    range_ = _parse_range(parts, start_date)
+    if parts:
+        raise ValueError(f"Unsupported RRULE parts: {', '.join(parts)}")
+    return pattern, range_
@@ -1,16 +1,53 @@
-from typing import Any
+from typing import Any, Optional
+
+from dateutil import rrule
 
 from todoms.converters.basic import EnumConverter
 
-from ..attributes import RecurrencePatternType, Weekday
+from ..attributes import RecurrencePatternType, Weekday, WeekIndex
 from ..convertable import BaseConvertableFieldsObject
+from ..converters.interning import Shareable
 from ..fields.basic import Attribute, EnumField, List
 
+_WEEKDAYS = {
+    Weekday.MONDAY: rrule.MO,
+    Weekday.TUESDAY: rrule.TU,
+    Weekday.WEDNESDAY: rrule.WE,
+    Weekday.THURSDAY: rrule.TH,
+    Weekday.FRIDAY: rrule.FR,
+    Weekday.SATURDAY: rrule.SA,
+    Weekday.SUNDAY: rrule.SU,
+}
+
+
+_SET_POSITIONS = {
+    WeekIndex.FIRST: 1,
+    WeekIndex.SECOND: 2,
+    WeekIndex.THIRD: 3,
+    WeekIndex.FOURTH: 4,
+    WeekIndex.LAST: -1,
+}
+
 
-class BaseRecurrencePattern(BaseConvertableFieldsObject):
+def _weekdays(days: Optional[list[Weekday]], index: Optional[WeekIndex] = None) -> dict:
+    if not days:
+        return {}
+    options: dict = {"byweekday": [_WEEKDAYS[day] for day in days]}
+    if index:
+        options["bysetpos"] = _SET_POSITIONS[index]
+    return options
+
+
+class BaseRecurrencePattern(Shareable, BaseConvertableFieldsObject):
     interval = Attribute[int]("interval")
     _pattern_type = EnumField("type", RecurrencePatternType)
 
+    _FREQUENCY = rrule.DAILY
+
+    def _rule_options(self) -> dict:
+        """Arguments of dateutil's rrule repeating as this pattern"""
+        return {"freq": self._FREQUENCY, "interval": self.interval or 1}
+
 
 class Daily(BaseRecurrencePattern):
     def __init__(self, *args: Any, **kwargs: Any):
@@ -21,6 +58,8 @@ class Weekly(BaseRecurrencePattern):
     week_start = EnumField("firstDayOfWeek", Weekday)
     days_of_week = List("daysOfWeek", EnumConverter(Weekday))
 
+    _FREQUENCY = rrule.WEEKLY
+
     def __init__(self, *args: Any, week_start: Weekday = Weekday.SUNDAY, **kwargs: Any):
         super().__init__(
             _pattern_type=RecurrencePatternType.WEEKLY,
@@ -29,40 +68,97 @@ class Weekly(BaseRecurrencePattern):
             **kwargs
         )
 
+    def _rule_options(self) -> dict:
+        options = super()._rule_options()
+        options.update(_weekdays(self.days_of_week))
+        if self.week_start:
+            options["wkst"] = _WEEKDAYS[self.week_start]
+        return options
+
 
 class MonthlyAbsolute(BaseRecurrencePattern):
     day_of_month = Attribute[int]("dayOfMonth")
 
+    _FREQUENCY = rrule.MONTHLY
+
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(
             _pattern_type=RecurrencePatternType.MONTHLY_ABSOLUTE, *args, **kwargs
         )
 
+    def _rule_options(self) -> dict:
+        options = super()._rule_options()
+        if self.day_of_month:
+            options["bymonthday"] = self.day_of_month
+        return options
+
 
 class MonthlyRelative(BaseRecurrencePattern):
+    """The 'index' (first, second, ..., last) of given days of week in a month"""
+
     days_of_week = List("daysOfWeek", EnumConverter(Weekday))
+    index = EnumField("index", WeekIndex)
 
-    def __init__(self, *args: Any, **kwargs: Any) -> None:
+    _FREQUENCY = rrule.MONTHLY
+
+    def __init__(
+        self, *args: Any, index: WeekIndex = WeekIndex.FIRST, **kwargs: Any
+    ) -> None:
         super().__init__(
-            _pattern_type=RecurrencePatternType.MONTHLY_RELATIVE, *args, **kwargs
+            _pattern_type=RecurrencePatternType.MONTHLY_RELATIVE,
+            *args,
+            index=index,
+            **kwargs
         )
 
+    def _rule_options(self) -> dict:
+        options = super()._rule_options()
+        options.update(_weekdays(self.days_of_week, self.index or WeekIndex.FIRST))
+        return options
+
 
 class YearlyAbsolute(BaseRecurrencePattern):
     day_of_month = Attribute[int]("dayOfMonth")
     month = Attribute[int]("month")
 
+    _FREQUENCY = rrule.YEARLY
+
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(
             _pattern_type=RecurrencePatternType.YEARLY_ABSOLUTE, *args, **kwargs
         )
 
+    def _rule_options(self) -> dict:
+        options = super()._rule_options()
+        if self.month:
+            options["bymonth"] = self.month
+        if self.day_of_month:
+            options["bymonthday"] = self.day_of_month
+        return options
+
 
 class YearlyRelative(BaseRecurrencePattern):
+    """The 'index' (first, second, ..., last) of given days of week in the month"""
+
     days_of_week = List("daysOfWeek", EnumConverter(Weekday))
     month = Attribute[int]("month")
+    index = EnumField("index", WeekIndex)
 
-    def __init__(self, *args: Any, **kwargs: Any) -> None:
+    _FREQUENCY = rrule.YEARLY
+
+    def __init__(
+        self, *args: Any, index: WeekIndex = WeekIndex.FIRST, **kwargs: Any
+    ) -> None:
         super().__init__(
-            _pattern_type=RecurrencePatternType.YEARLY_RELATIVE, *args, **kwargs
+            _pattern_type=RecurrencePatternType.YEARLY_RELATIVE,
+            *args,
+            index=index,
+            **kwargs
         )
+
+    def _rule_options(self) -> dict:
+        options = super()._rule_options()
+        if self.month:
+            options["bymonth"] = self.month
+        options.update(_weekdays(self.days_of_week, self.index or WeekIndex.FIRST))
+        return options
@@ -1,15 +1,29 @@
-from typing import Any
+from datetime import date, datetime, time
+from typing import Any, Optional, Union
 
 from todoms.fields.basic import Attribute, Date, EnumField
 
 from ..attributes import RecurrenceRangeType
 from ..convertable import BaseConvertableFieldsObject
+from ..converters.interning import Shareable
 
 
-class BaseRecurrenceRange(BaseConvertableFieldsObject):
+class BaseRecurrenceRange(Shareable, BaseConvertableFieldsObject):
     _range_type = EnumField("type", RecurrenceRangeType)
     start_date = Date("startDate", export=False)
 
+    def _rule_options(self) -> dict:
+        """Arguments of dateutil's rrule limiting it to this range"""
+        return {}
+
+
+def _as_datetime(
+    value: Union[date, datetime, None], at: time = time.min
+) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.combine(value, at)
+
 
 # TODO: Remove?
 class EndDate(BaseRecurrenceRange):
@@ -20,6 +34,11 @@ class EndDate(BaseRecurrenceRange):
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(_range_type=RecurrenceRangeType.END_DATE, *args, **kwargs)
 
+    def _rule_options(self) -> dict:
+        if not self.end_date:
+            return {}
+        return {"until": _as_datetime(self.end_date, time.max)}
+
 
 class NoEnd(BaseRecurrenceRange):
     def __init__(self, *args: Any, **kwargs: Any) -> None:
@@ -31,3 +50,8 @@ class Numbered(BaseRecurrenceRange):
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(_range_type=RecurrenceRangeType.NUMBERED, *args, **kwargs)
+
+    def _rule_options(self) -> dict:
+        if self.occurrences is None:
+            return {}
+        return {"count": self.occurrences}
@@ -0,0 +1,140 @@
+import heapq
+import itertools
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Union
+
+if TYPE_CHECKING:
+    from ..resources import Task
+
+
+def _align(value: datetime, reference: datetime) -> datetime:
+    if reference.tzinfo and not value.tzinfo:
+        return value.replace(tzinfo=reference.tzinfo)
+    if value.tzinfo and not reference.tzinfo:
+        return value.replace(tzinfo=None)
+    return value
+
+
+@dataclass(order=True)
+class _Entry:
+    due: datetime
+    order: int
+    task: "Task" = field(compare=False)
+    occurrences: Iterator[datetime] = field(compare=False)
+    removed: bool = field(default=False, compare=False)
+
+
+class DueIndex:
+    """Index of tasks ordered by their next due date.
+
+    Occurrences of recurring tasks are expanded lazily, one per task at
+    a time, so advancing the index only touches tasks which became due.
+    Tasks without recurrence are due once, at their due date. Occurrences
+    before 'now' are skipped when a task is added.
+
+    Tasks are identified by their ids, adding a task again replaces it."""
+
+    def __init__(self, now: datetime, tasks: Iterable["Task"] = ()) -> None:
+        self._now = now
+        self._heap: list[_Entry] = []
+        self._entries: dict[str, _Entry] = {}
+        self._counter = itertools.count()
+        for task in tasks:
+            self.add(task)
+
+    @property
+    def now(self) -> datetime:
+        """Time up to which the index was advanced"""
+        return self._now
+
+    def _occurrences(self, task: "Task") -> Iterator[datetime]:
+        due = task.due_datetime
+        if task.recurrence:
+            anchor = _align(due, self._now) if due else self._now
+            rule = task.recurrence.rule(anchor)
+            return iter(rule.xafter(_align(self._now, anchor), inc=True))
+        if due and _align(due, self._now) >= self._now:
+            return iter([due])
+        return iter([])
+
+    def _push(
+        self, task_id: str, task: "Task", occurrences: Iterator[datetime]
+    ) -> None:
+        due = next(occurrences, None)
+        if due is None:
+            self._entries.pop(task_id, None)
+            return
+        entry = _Entry(_align(due, self._now), next(self._counter), task, occurrences)
+        self._entries[task_id] = entry
+        heapq.heappush(self._heap, entry)
+
+    def add(self, task: "Task") -> None:
+        """Add or replace the task. Tasks without an id can't be indexed."""
+        if not task.id:
+            raise ValueError("Task must have an id to be indexed")
+        self.remove(task.id)
+        self._push(task.id, task, self._occurrences(task))
+
+    def remove(self, task: Union["Task", str]) -> None:
+        task_id = task if isinstance(task, str) else task.id
+        entry = self._entries.pop(task_id, None)  # type: ignore
+        if entry:
+            # Removed entries are dropped when they get to the top of the heap
+            entry.removed = True
+
+    def _top(self) -> Optional[_Entry]:
+        while self._heap and self._heap[0].removed:
+            heapq.heappop(self._heap)
+        return self._heap[0] if self._heap else None
+
+    def next_due(self) -> Optional[tuple[datetime, "Task"]]:
+        """The nearest occurrence, without advancing the index"""
+        entry = self._top()
+        return (entry.due, entry.task) if entry else None
+
+    def due_before(self, end: datetime) -> list[tuple[datetime, "Task"]]:
+        """Next occurrences of tasks due until 'end', without advancing the index.
+
+        Every task is returned once, with its nearest occurrence."""
+        result = []
+        # Visit the heap as a tree, from the top, only through entries due
+        # before the end
+        candidates = [(self._heap[0], 0)] if self._heap else []
+        while candidates:
+            entry, position = heapq.heappop(candidates)
+            if entry.due > end:
+                break
+            if not entry.removed:
+                result.append((entry.due, entry.task))
+            for child in (2 * position + 1, 2 * position + 2):
+                if child < len(self._heap):
+                    heapq.heappush(candidates, (self._heap[child], child))
+        return result
+
+    def due_within(self, period: timedelta) -> list[tuple[datetime, "Task"]]:
+        """Tasks due in the period from now, e.g. in the next hours"""
+        return self.due_before(self._now + period)
+
+    def advance(self, now: datetime) -> list[tuple[datetime, "Task"]]:
+        """Move the index to 'now' and return occurrences due since the last time.
+
+        A task due more than once in this time is returned for every
+        occurrence. Tasks are then moved to their next occurrence."""
+        due = []
+        while True:
+            entry = self._top()
+            if entry is None or entry.due > now:
+                break
+            heapq.heappop(self._heap)
+            due.append((entry.due, entry.task))
+            self._push(entry.task.id, entry.task, entry.occurrences)  # type: ignore
+        self._now = now
+        return due
+
+    def __contains__(self, task: Union["Task", str]) -> bool:
+        task_id = task if isinstance(task, str) else task.id
+        return task_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,363 @@
+import json
+import logging
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Iterable, Optional, Type, Union
+
+from dateutil import tz
+
+from .attributes import Importance, Status
+from .resources import Resource, Subtask, Task, TaskList
+
+if TYPE_CHECKING:
+    from .client import ToDoClient
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class _Table:
+    name: str
+    parent_column: Optional[str]
+    indexed_attributes: tuple[str, ...]
+
+    def columns(self, resource_class: Type[Resource]) -> dict[str, str]:
+        """Map names of attributes to indexed columns, named as fields in the API"""
+        return {
+            attribute: getattr(resource_class, attribute).dict_name
+            for attribute in self.indexed_attributes
+        }
+
+
+_TABLES: dict[Type[Resource], _Table] = {
+    TaskList: _Table("task_lists", None, ("name",)),
+    Task: _Table(
+        "tasks",
+        "list_id",
+        ("status", "importance", "due_datetime", "last_modified_datetime"),
+    ),
+    Subtask: _Table("subtasks", "task_id", ("is_checked",)),
+}
+
+
+def _column_value(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        if not value.tzinfo:
+            value = value.replace(tzinfo=tz.UTC)
+        return value.astimezone(tz.UTC).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+    return value
+
+
+class ReplicaSyncError(Exception):
+    """Pending changes could not be sent to the API"""
+
+
+class Replica:
+    """Persistent copy of task lists, tasks and subtasks stored in SQLite.
+
+    The replica is kept current by `sync`, which uses delta queries, so only
+    changes since the previous sync are downloaded. Reads are served locally.
+    Changes are saved locally and queued until `push` sends them through the
+    client. Resources created locally get their ids and appear in reads only
+    after they are pushed."""
+
+    def _create_schema(self) -> None:
+        with self._lock, self._db:
+            for resource_class, table in _TABLES.items():
+                columns = list(table.columns(resource_class).values())
+                if table.parent_column:
+                    columns.insert(0, table.parent_column)
+                definitions = "".join(f', "{column}"' for column in columns)
+                self._db.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table.name} "
+                    f"(id TEXT PRIMARY KEY, data TEXT NOT NULL{definitions})"
+                )
+                for column in columns:
+                    self._db.execute(
+                        f'CREATE INDEX IF NOT EXISTS "{table.name}_{column}" '
+                        f'ON {table.name} ("{column}")'
+                    )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS delta_links "
+                "(endpoint TEXT PRIMARY KEY, link TEXT NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS pending "
+                "(seq INTEGER PRIMARY KEY AUTOINCREMENT, operation TEXT NOT NULL, "
+                "kind TEXT NOT NULL, list_id TEXT, task_id TEXT, resource_id TEXT, "
+                "data TEXT)"
+            )
+
+    def __init__(self, client: "ToDoClient", path: str = ":memory:") -> None:
+        self._client = client
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._create_schema()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def _store(
+        self, resource_class: Type[Resource], data: dict, parent_id: Optional[str]
+    ) -> None:
+        table = _TABLES[resource_class]
+        resource = resource_class.from_dict(data)
+        values = {
+            column: _column_value(getattr(resource, attribute))
+            for attribute, column in table.columns(resource_class).items()
+        }
+        if table.parent_column:
+            values[table.parent_column] = parent_id
+        columns = ", ".join(f'"{column}"' for column in values)
+        placeholders = ", ".join("?" for _ in range(len(values) + 2))
+        self._db.execute(
+            f"INSERT OR REPLACE INTO {table.name} (id, data, {columns}) "
+            f"VALUES ({placeholders})",
+            (resource.id, json.dumps(data), *values.values()),
+        )
+
+    @staticmethod
+    def _tasks_endpoint(list_id: str) -> str:
+        return f"{TaskList.ENDPOINT}/{list_id}/{Task.ENDPOINT}"
+
+    def _remove(self, resource_class: Type[Resource], resource_id: str) -> None:
+        if resource_class is TaskList:
+            task_ids = self._db.execute(
+                "SELECT id FROM tasks WHERE list_id = ?", (resource_id,)
+            ).fetchall()
+            for (task_id,) in task_ids:
+                self._remove(Task, task_id)
+            self._db.execute(
+                "DELETE FROM delta_links WHERE endpoint = ?",
+                (self._tasks_endpoint(resource_id),),
+            )
+        elif resource_class is Task:
+            self._db.execute("DELETE FROM subtasks WHERE task_id = ?", (resource_id,))
+        table = _TABLES[resource_class]
+        self._db.execute(f"DELETE FROM {table.name} WHERE id = ?", (resource_id,))
+
+    def _sync_collection(
+        self,
+        resource_class: Type[Resource],
+        endpoint: str,
+        parent_id: Optional[str] = None,
+    ) -> list[str]:
+        """Apply changes from the delta query. Return ids of changed resources"""
+        row = self._db.execute(
+            "SELECT link FROM delta_links WHERE endpoint = ?", (endpoint,)
+        ).fetchone()
+        link = row[0] if row else f"{endpoint}/delta"
+
+        changed = []
+        for page in self._client.raw_pages(link):
+            with self._lock, self._db:
+                for element in page.items:
+                    if "@removed" in element:
+                        self._remove(resource_class, element["id"])
+                    else:
+                        self._store(resource_class, element, parent_id)
+                        changed.append(element["id"])
+                if page.delta_link:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO delta_links VALUES (?, ?)",
+                        (endpoint, page.delta_link),
+                    )
+        return changed
+
+    def _sync_subtasks(self, list_id: str, task_id: str) -> None:
+        endpoint = f"{self._tasks_endpoint(list_id)}/{task_id}/{Subtask.ENDPOINT}"
+        pages = list(self._client.raw_pages(endpoint))
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM subtasks WHERE task_id = ?", (task_id,))
+            for page in pages:
+                for element in page.items:
+                    self._store(Subtask, element, task_id)
+
+    def sync(self) -> None:
+        """Download changes made since the last synchronization"""
+        self._sync_collection(TaskList, TaskList.ENDPOINT)
+        for task_list in self.task_lists():
+            list_id: str = task_list.id  # type: ignore
+            endpoint = self._tasks_endpoint(list_id)
+            for task_id in self._sync_collection(Task, endpoint, list_id):
+                self._sync_subtasks(list_id, task_id)
+
+    def _reference(
+        self, resource_class: Type[Resource], resource_id: Optional[str]
+    ) -> Any:
+        """Lightweight object used only to build endpoints"""
+        reference = resource_class.from_dict({"id": resource_id}, client=self._client)
+        if isinstance(reference, Task):
+            row = self._db.execute(
+                "SELECT list_id FROM tasks WHERE id = ?", (resource_id,)
+            ).fetchone()
+            reference.task_list = self._reference(TaskList, row[0] if row else None)
+        return reference
+
+    def _load(
+        self,
+        resource_class: Type[Resource],
+        where: str = "1",
+        params: Iterable[Any] = (),
+        order_by: str = "rowid",
+    ) -> list[Any]:
+        table = _TABLES[resource_class]
+        parent = f'"{table.parent_column}"' if table.parent_column else "NULL"
+        resources = []
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT data, {parent} FROM {table.name} WHERE {where} "
+                f"ORDER BY {order_by}",
+                tuple(params),
+            ).fetchall()
+            for data, parent_id in rows:
+                resource = resource_class.from_dict(
+                    json.loads(data), client=self._client
+                )
+                if isinstance(resource, Task):
+                    resource.task_list = self._reference(TaskList, parent_id)
+                elif isinstance(resource, Subtask):
+                    resource.task = self._reference(Task, parent_id)
+                resources.append(resource)
+        return resources
+
+    def task_lists(self) -> list[TaskList]:
+        return self._load(TaskList)
+
+    def get_task_list(self, list_id: str) -> Optional[TaskList]:
+        found = self._load(TaskList, "id = ?", (list_id,))
+        return found[0] if found else None
+
+    def get_task(self, task_id: str) -> Optional[Task]:
+        found: list[Task] = self._load(Task, "id = ?", (task_id,))
+        if not found:
+            return None
+        found[0].subtasks = self.subtasks(task_id)
+        return found[0]
+
+    def subtasks(self, task: Union[Task, str]) -> list[Subtask]:
+        task_id = task if isinstance(task, str) else task.id
+        return self._load(Subtask, "task_id = ?", (task_id,))
+
+    def tasks(
+        self,
+        task_list: Optional[Union[TaskList, str]] = None,
+        status: Optional[Status] = None,
+        importance: Optional[Importance] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+        modified_after: Optional[datetime] = None,
+    ) -> list[Task]:
+        """Return tasks from the replica, sorted by due date. Filtering uses
+        indexed columns. Subtasks aren't loaded, use `subtasks` or `get_task`."""
+        columns = _TABLES[Task].columns(Task)
+        due, modified = columns["due_datetime"], columns["last_modified_datetime"]
+        conditions = {
+            "list_id = ?": task_list.id
+            if isinstance(task_list, TaskList)
+            else task_list,
+            f'"{columns["status"]}" = ?': status,
+            f'"{columns["importance"]}" = ?': importance,
+            f'"{due}" < ?': due_before,
+            f'"{due}" >= ?': due_after,
+            f'"{modified}" > ?': modified_after,
+        }
+        used = {k: _column_value(v) for k, v in conditions.items() if v is not None}
+        where = " AND ".join(used) or "1"
+        return self._load(Task, where, used.values(), f'"{due}" IS NULL, "{due}"')
+
+    def _enqueue(self, operation: str, resource: Resource) -> None:
+        list_id = task_id = None
+        if isinstance(resource, Task):
+            list_id = resource.task_list.id if resource.task_list else None
+        elif isinstance(resource, Subtask):
+            task = resource.task
+            task_id = task.id if task else None
+            list_id = task.task_list.id if task and task.task_list else None
+        self._db.execute(
+            "INSERT INTO pending "
+            "(operation, kind, list_id, task_id, resource_id, data) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                operation,
+                resource.__class__.__name__,
+                list_id,
+                task_id,
+                resource.id,
+                json.dumps(resource.to_dict()),
+            ),
+        )
+
+    def save(self, resource: Resource) -> None:
+        """Save the resource locally and queue creating or updating it in the API"""
+        with self._lock, self._db:
+            if resource.id:
+                table = _TABLES[type(resource)]
+                parent = f'"{table.parent_column}"' if table.parent_column else "NULL"
+                row = self._db.execute(
+                    f"SELECT data, {parent} FROM {table.name} WHERE id = ?",
+                    (resource.id,),
+                ).fetchone()
+                data = json.loads(row[0]) if row else {}
+                data.update(resource.to_dict())
+                self._store(type(resource), data, row[1] if row else None)
+            self._enqueue("update" if resource.id else "create", resource)
+
+    def delete(self, resource: Resource) -> None:
+        """Delete the resource locally and queue deleting it in the API"""
+        if not resource.id:
+            raise ValueError("Only created resources can be deleted")
+        with self._lock, self._db:
+            self._remove(type(resource), resource.id)
+            self._enqueue("delete", resource)
+
+    @property
+    def pending(self) -> int:
+        """Number of changes waiting to be pushed"""
+        with self._lock:
+            return int(self._db.execute("SELECT COUNT(*) FROM pending").fetchone()[0])
+
+    def push(self) -> None:
+        """Send queued changes in order. Stops on the first failed change and
+        keeps it with all following changes in the queue."""
+        classes = {cls.__name__: cls for cls in _TABLES}
+        with self._lock:
+            queued = self._db.execute(
+                "SELECT seq, operation, kind, list_id, task_id, resource_id, data "
+                "FROM pending ORDER BY seq"
+            ).fetchall()
+
+        for seq, operation, kind, list_id, task_id, resource_id, data in queued:
+            resource_class = classes[kind]
+            data = json.loads(data)
+            if resource_id:
+                data["id"] = resource_id
+            resource = resource_class.from_dict(data, client=self._client)
+            if isinstance(resource, Task):
+                resource.task_list = self._reference(TaskList, list_id)
+            elif isinstance(resource, Subtask):
+                task = self._reference(Task, task_id)
+                task.task_list = self._reference(TaskList, list_id)
+                resource.task = task
+
+            try:
+                if operation == "create":
+                    resource.create()
+                elif operation == "update":
+                    resource.update()
+                else:
+                    resource.delete()
+            except Exception as exc:
+                raise ReplicaSyncError(f"Could not {operation} {kind}") from exc
+
+            with self._lock, self._db:
+                self._db.execute("DELETE FROM pending WHERE seq = ?", (seq,))
+                if operation != "delete":
+                    parent_id = list_id if isinstance(resource, Task) else task_id
+                    data = {**data, **resource.to_dict()}
+                    self._store(resource_class, data, parent_id)
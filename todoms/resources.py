@@ -1,9 +1,10 @@
 from datetime import datetime
+from enum import Enum
 from typing import TYPE_CHECKING, Any, Iterable, Optional, Type, TypeVar, Union
 
 from furl import furl  # type: ignore
 
-from todoms.converters.basic import ResourceConverter
+from todoms.converters.basic import InternedStringConverter, ResourceConverter
 
 from .attributes import Importance, Status
 from .convertable import BaseConvertableFieldsObject, ConvertableType
@@ -17,10 +18,13 @@ from .fields.basic import (
     List,
 )
 from .fields.recurrence import DueDatetime, RecurrenceField
-from .filters import Comparable, and_, ne
+from .filters import FilterLike, and_, compile_filter, ne
+from .tracing import traced
 
 if TYPE_CHECKING:
+    from .bulk import BulkReport, ProgressCallback
     from .client import ToDoClient
+    from .frame import TaskFrame
 
 
 class ResourceAlreadyCreatedError(Exception):
@@ -42,6 +46,14 @@ class UnsupportedOperationError(Exception):
 ResourceType = TypeVar("ResourceType", bound="Resource")
 
 
+class ResourceEvent(Enum):
+    """Change of a resource made through the client"""
+
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+
+
 class Resource(BaseConvertableFieldsObject):
     """Base Resource for any other"""
 
@@ -53,6 +65,7 @@ class Resource(BaseConvertableFieldsObject):
         super().__init__(*args, **kwargs)
         self._client = client
 
+    @traced("create")
     def create(self) -> None:
         """Create object in API"""
         if self.id:
@@ -60,15 +73,20 @@ class Resource(BaseConvertableFieldsObject):
         data_dict = {k: v for k, v in self.to_dict().items() if v is not None}
         result = self.client.raw_post(self.managing_endpoint, data_dict, 201)
         self._from_dict(result)
+        self.client.notify(ResourceEvent.CREATED, self)
 
+    @traced("update")
     def update(self) -> None:
         """Update resource in API"""
         response = self.client.patch(self)
         self._from_dict(response)
+        self.client.notify(ResourceEvent.UPDATED, self)
 
+    @traced("delete")
     def delete(self) -> None:
         """Delete object in API"""
         self.client.delete(self)
+        self.client.notify(ResourceEvent.DELETED, self)
 
     @property
     def client(self) -> "ToDoClient":
@@ -96,21 +114,26 @@ class Resource(BaseConvertableFieldsObject):
     ) -> ConvertableType:
         return super().from_dict(data_dict, client=client)
 
+    def _span_attributes(self) -> dict:
+        return {"todoms.resource.id": self.id}
+
     def _clear(self) -> None:
         for field in self._fields:
             delattr(self, field.name)
 
+    @traced("refresh")
     def refresh(self) -> None:
         new_data = self.client.raw_get(endpoint=self.managing_endpoint)
         self._clear()
         self._from_dict(new_data)
+        self.client.notify(ResourceEvent.UPDATED, self)
 
     @classmethod
-    def handle_list_filters(cls, *args: str, **kwargs: Comparable) -> dict:
+    def handle_list_filters(cls, *args: FilterLike, **kwargs: FilterLike) -> dict:
         not_empty_kwargs = {k: v for k, v in kwargs.items() if v is not None}
         if len(args) + len(not_empty_kwargs) == 0:
             return {}
-        params = {"$filter": and_(*args, **not_empty_kwargs)}
+        params = {"$filter": compile_filter(and_(*args, **not_empty_kwargs))}
         return params
 
     def __eq__(self, other: object) -> bool:
@@ -121,6 +144,9 @@ class Resource(BaseConvertableFieldsObject):
         return self.id == other.id
 
 
+_NOT_COMPLETED = ne(Status.COMPLETED)
+
+
 class TaskList(Resource):
     """Represent a list of tasks"""
 
@@ -139,10 +165,19 @@ class TaskList(Resource):
             task.task_list = self
             yield task
 
+    def get_task_frame(self, **kwargs: Any) -> "TaskFrame":
+        """Tasks in the list stored column by column, for analytics over many
+        tasks. Filters are the same as in 'get_tasks'."""
+        from .frame import TaskFrame
+
+        tasks_endpoint = furl(self.ENDPOINT) / self.id / Task.ENDPOINT
+        pages = self.client.list(Task, endpoint=tasks_endpoint.url, raw=True, **kwargs)
+        return TaskFrame.from_pages(pages, task_list=self)
+
     @property
     def open_tasks(self) -> Iterable["Task"]:
         """Iterate over opened tasks"""
-        return self.get_tasks(status=ne(Status.COMPLETED))
+        return self.get_tasks(status=_NOT_COMPLETED)
 
     @property
     def tasks(self) -> Iterable["Task"]:
@@ -153,6 +188,49 @@ class TaskList(Resource):
         task.task_list = self
         task.create()
 
+    def bulk_create(
+        self,
+        tasks: Iterable["Task"],
+        concurrency: int = 4,
+        progress: Optional["ProgressCallback"] = None,
+    ) -> "BulkReport":
+        """Create many tasks in the list using 'concurrency' parallel requests.
+
+        Subtasks of a task are created in order after the task. Failures don't
+        stop the operation, they are reported per task in the returned report."""
+        from .bulk import create_task, run_bulk
+
+        return run_bulk(
+            tasks, lambda task: create_task(self, task), concurrency, progress
+        )
+
+    def update_where(
+        self,
+        expression: FilterLike,
+        concurrency: int = 4,
+        progress: Optional["ProgressCallback"] = None,
+        **changes: Any,
+    ) -> "BulkReport":
+        """Set attributes given as 'changes' in all tasks matching the filter.
+
+        Only ids of matching tasks are fetched and only changed attributes are
+        sent, subtasks are not touched. Tasks are selected before any change,
+        so changing an attribute used in the filter is safe."""
+        from .bulk import update_where
+
+        return update_where(self, expression, changes, concurrency, progress)
+
+    def delete_where(
+        self,
+        expression: FilterLike,
+        concurrency: int = 4,
+        progress: Optional["ProgressCallback"] = None,
+    ) -> "BulkReport":
+        """Delete all tasks matching the filter, fetching only their ids"""
+        from .bulk import delete_where
+
+        return delete_where(self, expression, concurrency, progress)
+
     def __repr__(self) -> str:
         return f"<TaskList '{self.name}'>"
 
@@ -193,6 +271,7 @@ class Subtask(Resource):
             )
         self._task = value
 
+    @traced("create")
     def create(self) -> None:
         if not self.task:
             raise TaskNotSpecifiedError
@@ -212,6 +291,7 @@ class Subtask(Resource):
         self.is_checked = False
         self.checked_datetime = None
 
+    @traced("delete")
     def delete(self) -> None:
         super().delete()
         if self.task.subtasks and self in self.task.subtasks:  # type: ignore
@@ -249,7 +329,7 @@ class Task(Resource):
     completed_datetime = Datetime("completedDateTime", read_only=True)
     last_modified_datetime = IsoTime("lastModifiedDateTime", read_only=True)
     reminder_datetime = Datetime("reminderDateTime")
-    categories = List("categories", Attribute)
+    categories = List("categories", InternedStringConverter())
     has_attachments = Boolean("hasAttachments", default=False, read_only=True)
     start_datetime = Datetime("startDateTime", read_only=True)
     subtasks = List(
@@ -269,6 +349,12 @@ class Task(Resource):
         super().__init__(*args, **kwargs)
         self._task_list = task_list
 
+    def _span_attributes(self) -> dict:
+        attributes = super()._span_attributes()
+        attributes["todoms.task_list.id"] = self._task_list and self._task_list.id
+        attributes["todoms.subtasks"] = len(self.subtasks or [])
+        return attributes
+
     def _update_or_create_subtasks(self, subtasks: list[Subtask]) -> None:
         for subtask in subtasks:
             subtask.task = self
@@ -278,6 +364,7 @@ class Task(Resource):
             else:
                 subtask.update()
 
+    @traced("create")
     def create(self) -> None:
         if not self._task_list:
             raise TaskListNotSpecifiedError
@@ -285,13 +372,14 @@ class Task(Resource):
         super().create()
         self._update_or_create_subtasks(subtasks=subtasks)  # type: ignore
 
+    @traced("update")
     def update(self) -> None:
         self._update_or_create_subtasks(subtasks=self.subtasks)  # type: ignore
         return super().update()
 
     @classmethod
-    def handle_list_filters(cls, *args: str, **kwargs: Any) -> dict:
-        kwargs.setdefault("status", ne(Status.COMPLETED))
+    def handle_list_filters(cls, *args: FilterLike, **kwargs: Any) -> dict:
+        kwargs.setdefault("status", _NOT_COMPLETED)
         return super().handle_list_filters(*args, **kwargs)
 
     @property
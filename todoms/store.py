@@ -0,0 +1,278 @@
+import threading
+from bisect import bisect_left, insort
+from collections import defaultdict
+from datetime import datetime
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Hashable,
+    Iterable,
+    Iterator,
+    Optional,
+    Union,
+)
+
+from dateutil import tz
+
+from .attributes import Importance, Status
+from .filters import FilterLike, select
+from .resources import Resource, ResourceEvent, Subtask, Task, TaskList
+
+if TYPE_CHECKING:
+    from .client import ToDoClient
+
+
+def _timestamp(value: Optional[datetime]) -> Optional[float]:
+    if value is None:
+        return None
+    if not value.tzinfo:
+        value = value.replace(tzinfo=tz.UTC)
+    return value.timestamp()
+
+
+class _HashIndex:
+    """Maps values of a task attribute to ids of tasks"""
+
+    def __init__(self, extract: Callable[[Task], Iterable[Hashable]]) -> None:
+        self._extract = extract
+        self._ids: defaultdict[Hashable, set[str]] = defaultdict(set)
+        self._keys: dict[str, tuple[Hashable, ...]] = {}
+
+    def add(self, task_id: str, task: Task) -> None:
+        keys = tuple(self._extract(task))
+        self._keys[task_id] = keys
+        for key in keys:
+            self._ids[key].add(task_id)
+
+    def remove(self, task_id: str) -> None:
+        for key in self._keys.pop(task_id, ()):
+            self._ids[key].discard(task_id)
+            if not self._ids[key]:
+                del self._ids[key]
+
+    def get(self, key: Hashable) -> set[str]:
+        return self._ids.get(key, set())
+
+
+class _SortedIndex:
+    """Keeps ids of tasks sorted by a datetime attribute. Empty values are skipped"""
+
+    def __init__(self, attribute: str) -> None:
+        self._attribute = attribute
+        self._entries: list[tuple[float, str]] = []
+        self._keys: dict[str, float] = {}
+
+    def add(self, task_id: str, task: Task) -> None:
+        key = _timestamp(getattr(task, self._attribute))
+        if key is None:
+            return
+        self._keys[task_id] = key
+        insort(self._entries, (key, task_id))
+
+    def remove(self, task_id: str) -> None:
+        key = self._keys.pop(task_id, None)
+        if key is None:
+            return
+        position = bisect_left(self._entries, (key, task_id))
+        del self._entries[position]
+
+    def range(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> list[str]:
+        """Ids of tasks with value in [start, end), sorted by the value"""
+        start_ts, end_ts = _timestamp(start), _timestamp(end)
+        low = 0 if start_ts is None else bisect_left(self._entries, (start_ts,))
+        high = (
+            len(self._entries)
+            if end_ts is None
+            else bisect_left(self._entries, (end_ts,))
+        )
+        return [task_id for _, task_id in self._entries[low:high]]
+
+
+class TaskStore:
+    """In-memory store of task lists, tasks and subtasks with indexes over tasks.
+
+    Tasks are indexed by status, importance, category and list, as well as sorted
+    by due, reminder and last modification time. When attached to the client,
+    the store is updated on every resource created, updated, refreshed or deleted
+    through this client."""
+
+    SORTED_ATTRIBUTES = ("due_datetime", "reminder_datetime", "last_modified_datetime")
+
+    def __init__(self, resources: Iterable[Resource] = ()) -> None:
+        self._lock = threading.RLock()
+        self._task_lists: dict[str, TaskList] = {}
+        self._tasks: dict[str, Task] = {}
+        self._subtasks: dict[str, Subtask] = {}
+
+        self._hash_indexes = {
+            "status": _HashIndex(lambda task: (task.status,)),
+            "importance": _HashIndex(lambda task: (task.importance,)),
+            "category": _HashIndex(lambda task: task.categories or ()),
+            "task_list": _HashIndex(
+                lambda task: (task.task_list.id if task.task_list else None,)
+            ),
+        }
+        self._sorted_indexes = {
+            attribute: _SortedIndex(attribute) for attribute in self.SORTED_ATTRIBUTES
+        }
+        self.extend(resources)
+
+    def _on_event(self, event: ResourceEvent, resource: Resource) -> None:
+        if event == ResourceEvent.DELETED:
+            self.remove(resource)
+        else:
+            self.add(resource)
+
+    def attach(self, client: "ToDoClient") -> None:
+        """Follow changes of resources made through the client"""
+        client.add_listener(self._on_event)
+
+    def detach(self, client: "ToDoClient") -> None:
+        client.remove_listener(self._on_event)
+
+    def _index(self, task_id: str, task: Task) -> None:
+        for hash_index in self._hash_indexes.values():
+            hash_index.add(task_id, task)
+        for sorted_index in self._sorted_indexes.values():
+            sorted_index.add(task_id, task)
+
+    def _unindex(self, task_id: str) -> None:
+        for hash_index in self._hash_indexes.values():
+            hash_index.remove(task_id)
+        for sorted_index in self._sorted_indexes.values():
+            sorted_index.remove(task_id)
+
+    def add(self, resource: Resource) -> None:
+        """Add the resource or reindex it, if already stored"""
+        if not resource.id:
+            raise ValueError("Only resources with id can be stored")
+        with self._lock:
+            if isinstance(resource, Task):
+                self._unindex(resource.id)
+                self._tasks[resource.id] = resource
+                self._index(resource.id, resource)
+                for subtask in resource.subtasks or []:
+                    if subtask.id:
+                        self._subtasks[subtask.id] = subtask
+            elif isinstance(resource, TaskList):
+                self._task_lists[resource.id] = resource
+            elif isinstance(resource, Subtask):
+                self._subtasks[resource.id] = resource
+            else:
+                raise TypeError(f"Unsupported resource: {resource!r}")
+
+    def extend(self, resources: Iterable[Resource]) -> None:
+        for resource in resources:
+            self.add(resource)
+
+    def remove(self, resource: Union[Resource, str]) -> None:
+        """Remove the resource or the resource with given id. Removing a list or a
+        task removes also their tasks or subtasks."""
+        resource_id = resource if isinstance(resource, str) else resource.id
+        if not resource_id:
+            return
+        with self._lock:
+            if resource_id in self._tasks:
+                task = self._tasks.pop(resource_id)
+                self._unindex(resource_id)
+                for subtask in task.subtasks or []:
+                    if subtask.id:
+                        self._subtasks.pop(subtask.id, None)
+            elif resource_id in self._task_lists:
+                del self._task_lists[resource_id]
+                for task_id in list(self._hash_indexes["task_list"].get(resource_id)):
+                    self.remove(task_id)
+            else:
+                self._subtasks.pop(resource_id, None)
+
+    def get(self, resource_id: str) -> Optional[Resource]:
+        return (
+            self._tasks.get(resource_id)
+            or self._task_lists.get(resource_id)
+            or self._subtasks.get(resource_id)
+        )
+
+    def _match_ids(self, criteria: dict[str, Any]) -> Optional[set[str]]:
+        ids: Optional[set[str]] = None
+        for name, value in criteria.items():
+            if value is None:
+                continue
+            if isinstance(value, TaskList):
+                value = value.id
+            if name not in self._hash_indexes:
+                raise ValueError(f"Unknown criterion {name}")
+            matching = self._hash_indexes[name].get(value)
+            ids = set(matching) if ids is None else ids & matching
+        return ids
+
+    def _load(self, ids: Iterable[str]) -> Iterator[Task]:
+        return (self._tasks[task_id] for task_id in ids)
+
+    def find(
+        self,
+        expression: Optional[FilterLike] = None,
+        status: Optional[Status] = None,
+        importance: Optional[Importance] = None,
+        category: Optional[str] = None,
+        task_list: Optional[Union[TaskList, str]] = None,
+    ) -> list[Task]:
+        """Find tasks using indexes. Optional filter expression is evaluated locally
+        on tasks already selected by indexes."""
+        criteria: dict[str, Any] = {
+            "status": status,
+            "importance": importance,
+            "category": category,
+            "task_list": task_list,
+        }
+        with self._lock:
+            ids = self._match_ids(criteria)
+            tasks = list(self._tasks.values() if ids is None else self._load(ids))
+        if expression is not None:
+            tasks = select(expression, tasks)
+        return tasks
+
+    def between(
+        self,
+        attribute: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        **criteria: Any,
+    ) -> list[Task]:
+        """Tasks with the datetime attribute in [start, end), sorted by this
+        attribute. Additional criteria are the same as in `find`."""
+        if attribute not in self._sorted_indexes:
+            raise ValueError(f"Attribute {attribute} is not indexed")
+        with self._lock:
+            ordered = self._sorted_indexes[attribute].range(start, end)
+            matching = self._match_ids(criteria)
+            if matching is not None:
+                ordered = [task_id for task_id in ordered if task_id in matching]
+            return list(self._load(ordered))
+
+    def overdue(self, now: Optional[datetime] = None, **criteria: Any) -> list[Task]:
+        """Not completed tasks with due date before now, sorted by due date"""
+        now = now or datetime.now(tz.UTC)
+        return [
+            task
+            for task in self.between("due_datetime", end=now, **criteria)
+            if task.status != Status.COMPLETED
+        ]
+
+    @property
+    def task_lists(self) -> list[TaskList]:
+        return list(self._task_lists.values())
+
+    @property
+    def tasks(self) -> list[Task]:
+        return list(self._tasks.values())
+
+    def __contains__(self, resource: object) -> bool:
+        if isinstance(resource, Resource):
+            resource = resource.id
+        return isinstance(resource, str) and self.get(resource) is not None
+
+    def __len__(self) -> int:
+        return len(self._task_lists) + len(self._tasks) + len(self._subtasks)
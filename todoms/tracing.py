@@ -0,0 +1,153 @@
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, ContextManager, Iterator, Optional, TypeVar
+
+Attributes = dict[str, Any]
+
+_FunctionType = TypeVar("_FunctionType", bound=Callable[..., Any])
+
+# Operation on a resource currently traced in this context, so overriding
+# methods calling 'super()' don't open a second span for the same operation
+_current_operation: ContextVar[Optional[tuple[int, str]]] = ContextVar(
+    "todoms_current_operation", default=None
+)
+
+
+class Span:
+    """A traced operation. The base implementation records nothing"""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def record_exception(self, exception: BaseException) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+
+@contextmanager
+def _nothing() -> Iterator[None]:
+    yield
+
+
+_NOOP_SPAN = Span()
+
+
+class Tracer:
+    """Creates spans around operations of the client.
+
+    The base implementation is a no-op, used when tracing is not configured.
+    Subclasses adapt it to a tracing library."""
+
+    enabled = False
+
+    def start_span(self, name: str, attributes: Optional[Attributes] = None) -> Span:
+        """Start a span, child of the currently active one. It has to be ended"""
+        return _NOOP_SPAN
+
+    def activate(self, span: Span) -> ContextManager[None]:
+        """Make the span the parent of spans started inside the block"""
+        return _nothing()
+
+    @contextmanager
+    def span(
+        self, name: str, attributes: Optional[Attributes] = None
+    ) -> Iterator[Span]:
+        """Start a span, active and ended with the block"""
+        span = self.start_span(name, attributes)
+        try:
+            with self.activate(span):
+                yield span
+        except BaseException as exc:
+            span.record_exception(exc)
+            raise
+        finally:
+            span.end()
+
+
+NOOP_TRACER = Tracer()
+
+
+def _clean(attributes: Optional[Attributes]) -> Attributes:
+    return {k: v for k, v in (attributes or {}).items() if v is not None}
+
+
+class _OpenTelemetrySpan(Span):
+    def __init__(self, span: Any) -> None:
+        self.span = span
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if value is not None:
+            self.span.set_attribute(key, value)
+
+    def record_exception(self, exception: BaseException) -> None:
+        from opentelemetry.trace import Status, StatusCode  # type: ignore
+
+        self.span.record_exception(exception)
+        self.span.set_status(Status(StatusCode.ERROR, str(exception)))
+
+    def end(self) -> None:
+        self.span.end()
+
+
+class OpenTelemetryTracer(Tracer):
+    """Reports spans through OpenTelemetry.
+
+    The 'opentelemetry-api' package is required only when this tracer is used.
+    Without 'tracer', one named 'todoms' is taken from the global provider."""
+
+    enabled = True
+
+    def __init__(self, tracer: Any = None) -> None:
+        try:
+            from opentelemetry import trace  # type: ignore
+        except ImportError as exc:
+            raise ImportError(
+                "OpenTelemetryTracer requires the 'opentelemetry-api' package"
+            ) from exc
+        self._trace = trace
+        self._tracer = tracer or trace.get_tracer("todoms")
+
+    def start_span(self, name: str, attributes: Optional[Attributes] = None) -> Span:
+        span = self._tracer.start_span(name, attributes=_clean(attributes))
+        return _OpenTelemetrySpan(span)
+
+    def activate(self, span: Span) -> ContextManager[None]:
+        return self._trace.use_span(  # type: ignore
+            span.span,  # type: ignore
+            end_on_exit=False,
+            record_exception=False,
+            set_status_on_exception=False,
+        )
+
+
+def traced(operation: str) -> Callable[[_FunctionType], _FunctionType]:
+    """Trace the method of a resource as the operation, e.g. 'create'.
+
+    The span gets attributes from '_span_attributes' of the resource, read after
+    the operation, so identifiers of created resources are included."""
+
+    def decorator(method: _FunctionType) -> _FunctionType:
+        @functools.wraps(method)
+        def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            client = self._client
+            tracer = client.tracer if client else NOOP_TRACER
+            key = (id(self), operation)
+            if not tracer.enabled or _current_operation.get() == key:
+                return method(self, *args, **kwargs)
+
+            name = f"todoms.{type(self).__name__}.{operation}"
+            with tracer.span(name, {"todoms.operation": operation}) as span:
+                token = _current_operation.set(key)
+                try:
+                    return method(self, *args, **kwargs)
+                finally:
+                    _current_operation.reset(token)
+                    for attribute, value in self._span_attributes().items():
+                        span.set_attribute(attribute, value)
+
+        return wrapper  # type: ignore
+
+    return decorator
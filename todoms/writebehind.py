@@ -0,0 +1,269 @@
+import json
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import Context, copy_context
+from dataclasses import dataclass, field
+from functools import partial
+from typing import TYPE_CHECKING, Any, Optional, TextIO
+
+from .resources import Resource, ResourceEvent
+
+if TYPE_CHECKING:
+    from .client import ToDoClient
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindClosedError(Exception):
+    """The queue is closed and doesn't accept new changes"""
+
+
+@dataclass
+class _PendingWrite:
+    endpoint: str
+    data: dict
+    resource: Optional[Resource] = None
+    sequences: list[int] = field(default_factory=list)
+    futures: list["Future[None]"] = field(default_factory=list)
+    context: Context = field(default_factory=copy_context)
+
+
+def _recover_journal(path: str) -> dict[int, dict]:
+    """Read changes not confirmed yet and keep only them in the journal"""
+    if not os.path.exists(path):
+        return {}
+    entries: dict[int, dict] = {}
+    with open(path, encoding="utf-8") as journal:
+        for line in journal:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if "ack" in entry:
+                entries.pop(entry["ack"], None)
+            else:
+                entries[entry["seq"]] = entry
+
+    with open(path, "w", encoding="utf-8") as journal:
+        for _, entry in sorted(entries.items()):
+            journal.write(json.dumps(entry) + "\n")
+    return entries
+
+
+class WriteBehindQueue:
+    """Queue sending updates of resources in the background.
+
+    Updates of the same resource waiting in the queue are coalesced, so only the
+    last state is sent in one PATCH request. The queue is flushed every
+    'flush_interval' seconds or when 'max_pending' resources are waiting, using
+    a pool of 'workers' threads. Only the resource itself is updated, subtasks
+    of a task have to be queued separately. The resource is updated with the
+    response only when it wasn't changed again in the meantime, in the context
+    of its last update, so e.g. values are shared as in its 'shared_values' block.
+
+    When 'journal' path is given, every change is saved there before it's
+    accepted. Changes not confirmed by the API, e.g. because of a crash or an
+    error response, are sent again when the queue is created with the same
+    journal."""
+
+    def _add(
+        self,
+        endpoint: str,
+        data: dict,
+        sequence: int,
+        resource: Optional[Resource] = None,
+    ) -> _PendingWrite:
+        write = self._pending.get(endpoint)
+        if write:
+            write.data = data
+            write.resource = resource or write.resource
+            write.context = copy_context()
+        else:
+            write = self._pending[endpoint] = _PendingWrite(endpoint, data, resource)
+        write.sequences.append(sequence)
+        self._unconfirmed.add(sequence)
+        return write
+
+    def _run_timer(self) -> None:
+        while not self._closed.wait(self._flush_interval):
+            self.flush()
+
+    def __init__(
+        self,
+        client: "ToDoClient",
+        flush_interval: float = 1.0,
+        max_pending: int = 50,
+        workers: int = 4,
+        journal: Optional[str] = None,
+    ) -> None:
+        self._client = client
+        self._flush_interval = flush_interval
+        self._max_pending = max_pending
+
+        self._lock = threading.RLock()
+        self._idle = threading.Condition(self._lock)
+        self._pending: dict[str, _PendingWrite] = {}
+        self._in_flight: set[str] = set()
+        self._unconfirmed: set[int] = set()
+        self._sequence = 0
+        self._closed = threading.Event()
+        self._stopped = False
+
+        self._journal_path = journal
+        self._journal: Optional[TextIO] = None
+        if journal:
+            recovered = _recover_journal(journal)
+            for sequence, entry in sorted(recovered.items()):
+                self._add(entry["endpoint"], entry["data"], sequence)
+                self._sequence = sequence
+            if recovered:
+                logger.info("Recovered %d not confirmed changes", len(recovered))
+            self._journal = open(journal, "a", encoding="utf-8")
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="todoms-write-behind"
+        )
+        self._timer = threading.Thread(
+            target=self._run_timer, name="todoms-write-behind-timer", daemon=True
+        )
+        self._timer.start()
+
+    def _write_journal(self, entry: dict) -> None:
+        if not self._journal:
+            return
+        self._journal.write(json.dumps(entry) + "\n")
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+
+    def update(self, resource: Resource) -> "Future[None]":
+        """Queue updating the resource in the API with its current state.
+
+        The returned future is completed when the update is sent."""
+        future: "Future[None]" = Future()
+        endpoint, data = resource.managing_endpoint, resource.to_dict()
+        with self._lock:
+            if self._closed.is_set():
+                raise WriteBehindClosedError
+            self._sequence += 1
+            self._write_journal(
+                {"seq": self._sequence, "endpoint": endpoint, "data": data}
+            )
+            write = self._add(endpoint, data, self._sequence, resource)
+            write.futures.append(future)
+            should_flush = len(self._pending) >= self._max_pending
+
+        if should_flush:
+            self.flush()
+        return future
+
+    def _close_journal_if_stopped(self) -> None:
+        if not self._stopped or self._in_flight or not self._journal:
+            return
+        self._journal.close()
+        self._journal = None
+        if not self._unconfirmed:
+            # All changes are confirmed, nothing to recover
+            open(self._journal_path, "w").close()  # type: ignore
+
+    def _apply_response(
+        self, resource: Resource, write: _PendingWrite, response: dict
+    ) -> None:
+        """Update the resource with the state returned by the API, unless it was
+        changed since it was queued, so newer local changes aren't overwritten"""
+        with self._lock:
+            if write.endpoint in self._pending or resource.to_dict() != write.data:
+                logger.debug("Not applying stale response of %s", write.endpoint)
+                return
+            resource._from_dict(response)
+        self._client.notify(ResourceEvent.UPDATED, resource)
+
+    def _send(self, write: _PendingWrite) -> None:
+        error: Optional[BaseException] = None
+        try:
+            response = self._client.raw_patch(write.endpoint, write.data)
+            if write.resource:
+                self._apply_response(write.resource, write, response)
+        except Exception as exc:
+            logger.warning("Sending update of %s failed", write.endpoint, exc_info=True)
+            error = exc
+
+        with self._lock:
+            self._in_flight.discard(write.endpoint)
+            if not error:
+                for sequence in write.sequences:
+                    self._write_journal({"ack": sequence})
+                self._unconfirmed.difference_update(write.sequences)
+            self._idle.notify_all()
+            self._close_journal_if_stopped()
+
+        for future in write.futures:
+            if error:
+                future.set_exception(error)
+            else:
+                future.set_result(None)
+
+    def _cancel_if_not_sent(self, write: _PendingWrite, task: "Future[None]") -> None:
+        """Give up the write if sending was cancelled, it's kept in the journal"""
+        if not task.cancelled():
+            return
+        for future in write.futures:
+            future.cancel()
+        with self._lock:
+            self._in_flight.discard(write.endpoint)
+            self._idle.notify_all()
+            self._close_journal_if_stopped()
+
+    def flush(self) -> None:
+        """Start sending all waiting changes. Changes of resources which previous
+        update is still being sent wait for the next flush to keep the order."""
+        with self._lock:
+            if self._stopped:
+                return
+            ready = [
+                endpoint
+                for endpoint in self._pending
+                if endpoint not in self._in_flight
+            ]
+            for endpoint in ready:
+                write = self._pending.pop(endpoint)
+                self._in_flight.add(endpoint)
+                task = self._executor.submit(write.context.run, self._send, write)
+                task.add_done_callback(partial(self._cancel_if_not_sent, write))
+
+    @property
+    def pending(self) -> int:
+        """Number of resources waiting to be sent"""
+        with self._lock:
+            return len(self._pending)
+
+    def close(self, wait: bool = True) -> None:
+        """Stop accepting changes. Send all waiting changes, unless 'wait' is False.
+
+        Without waiting, futures of changes not sent yet are cancelled and
+        updates being sent are completed in the background. The journal is
+        closed when the last of them is done."""
+        with self._lock:
+            self._closed.set()
+            if wait:
+                while self._pending or self._in_flight:
+                    self.flush()
+                    self._idle.wait_for(lambda: not self._in_flight)
+            cancelled = list(self._pending.values())
+            self._pending.clear()
+        self._timer.join()
+        for write in cancelled:
+            for future in write.futures:
+                future.cancel()
+
+        with self._lock:
+            self._stopped = True
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        with self._lock:
+            self._close_journal_if_stopped()
+
+    def __enter__(self) -> "WriteBehindQueue":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()